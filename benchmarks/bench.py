@@ -0,0 +1,192 @@
+"""Throughput benchmarks for pictokit, with a regression gate.
+
+Run from the repository root:
+
+    python benchmarks/bench.py                      # print results
+    python benchmarks/bench.py --save               # store them as the baseline
+    python benchmarks/bench.py --compare            # fail on regressions
+    python benchmarks/bench.py --threads 8          # split large images in bands
+
+Baselines are machine dependent: regenerate ``baseline.json`` with ``--save``
+on the machine that runs the comparison, with the same ``--threads``.
+``--compare`` also fails if ``import pictokit`` takes longer than
+``--import-budget``.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+
+import cv2
+
+from pictokit import Image
+from pictokit.common import validate_imgarray
+from pictokit.controls import calculate_histogram, load_image
+from pictokit.parallel import set_threads
+from pictokit.utils import gerar_imagem_aleatoria
+
+BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+SIZES = {'256': (256, 256), '2k': (1080, 2048), '8k': (4320, 7680)}
+CHANNELS = {'gray': 1, 'color': 3}
+MIN_SAMPLE = 0.02
+IMPORT_BUDGET_MS = 500
+
+
+def _image_ops(img: Image) -> dict[str, Callable[[], object]]:
+    return {
+        'contrast_expansion': lambda: img.contrast_expansion(30, 220, reset=True),
+        'thresholding': lambda: img.thresholding(127, 255, reset=True),
+        'digital_negative': lambda: img.digital_negative(reset=True),
+    }
+
+
+def _time(func: Callable[[], object], repeat: int) -> float:
+    """Median time per call, looping fast calls so each sample lasts >= MIN_SAMPLE."""
+    func()  # warm-up: caches, lazy imports, page faults
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        if time.perf_counter() - start >= MIN_SAMPLE:
+            break
+        loops *= 10
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        samples.append((time.perf_counter() - start) / loops)
+    return statistics.median(samples)
+
+
+def run(sizes: list[str], repeat: int) -> dict[str, float]:
+    """Time every operation and return its throughput in MP/s, keyed by case."""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            height, width = _parse_size(size)
+            megapixels = height * width / 1e6
+            for kind, channels in CHANNELS.items():
+                arr = gerar_imagem_aleatoria(height, width, channels, seed=0)
+                path = os.path.join(tmp, f'{size}_{kind}.png')
+                cv2.imwrite(path, arr)
+                img = Image(img_arr=arr)
+
+                ops = {
+                    'load_image': lambda path=path: load_image(path=path),
+                    'calculate_histogram': lambda a=arr: calculate_histogram(a),
+                    'validate_imgarray': lambda a=arr: validate_imgarray(a),
+                    **_image_ops(img),
+                }
+                for name, func in ops.items():
+                    seconds = _time(func, repeat)
+                    results[f'{name}/{kind}/{size}'] = megapixels / seconds
+    return results
+
+
+def import_time(repeat: int) -> float:
+    """Median time, in ms, to import pictokit in a fresh interpreter."""
+    samples = []
+    for _ in range(repeat + 1):  # the first run writes bytecode caches
+        run = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', 'import pictokit'],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        line = next(ln for ln in run.stderr.splitlines() if ln.endswith('| pictokit'))
+        samples.append(int(line.split('|')[1]) / 1000)
+    return statistics.median(samples[1:])
+
+
+def compare(
+    results: dict[str, float], baseline: dict[str, float], threshold: float
+) -> list[str]:
+    """Return a message for every case slower than the baseline by `threshold`."""
+    regressions = []
+    for case, throughput in results.items():
+        reference = baseline.get(case)
+        if reference is not None and throughput < reference * (1 - threshold):
+            regressions.append(
+                f'{case}: {throughput:.1f} MP/s, baseline {reference:.1f} MP/s '
+                f'({throughput / reference - 1:+.0%})'
+            )
+    return regressions
+
+
+def _parse_size(size: str) -> tuple[int, int]:
+    if size in SIZES:
+        return SIZES[size]
+    height, width = size.split('x')
+    return int(height), int(width)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--sizes',
+        nargs='+',
+        default=['256', '2k'],
+        help=f'{", ".join(SIZES)} or HxW (default: 256 2k)',
+    )
+    parser.add_argument('--repeat', type=int, default=5, help='samples per case')
+    parser.add_argument(
+        '--rounds', type=int, default=3, help='full runs, the median is kept'
+    )
+    parser.add_argument(
+        '--threads', type=int, default=1, help='threads per image (default: 1)'
+    )
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--save', action='store_true', help='store as baseline')
+    parser.add_argument('--compare', action='store_true', help='gate on baseline')
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=0.3,
+        help='allowed throughput loss, as a fraction (default: 0.3)',
+    )
+    parser.add_argument(
+        '--import-budget',
+        type=float,
+        default=IMPORT_BUDGET_MS,
+        help=f'maximum import time in ms (default: {IMPORT_BUDGET_MS})',
+    )
+    args = parser.parse_args(argv)
+    set_threads(args.threads)
+
+    rounds = [run(args.sizes, args.repeat) for _ in range(args.rounds)]
+    results = {case: statistics.median(r[case] for r in rounds) for case in rounds[0]}
+    for case, throughput in results.items():
+        print(f'{case:<45} {throughput:>12.1f} MP/s')
+    import_ms = import_time(args.repeat)
+    print(f'{"import pictokit":<45} {import_ms:>12.1f} ms')
+
+    if args.save:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write('\n')
+
+    if args.compare:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if import_ms > args.import_budget:
+            regressions.append(
+                f'import pictokit: {import_ms:.1f} ms, budget {args.import_budget:g} ms'
+            )
+        if regressions:
+            print('\nRegressions:', *regressions, sep='\n  ', file=sys.stderr)
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,13 +1,37 @@
+from collections.abc import Sequence
+from functools import partial
 from typing import Callable, Literal
 
-import matplotlib.pyplot as plt
 import numpy as np
 from beartype import beartype
 
 import pictokit.element_wise as elw
+import pictokit.visualization as viz
+from pictokit import metrics
 from pictokit.__about__ import __version__
-from pictokit.constants import Mode
-from pictokit.controls import calculate_histogram, load_image
+from pictokit.common import ImageLayout, as_contiguous, describe_layout
+from pictokit.constants import (
+    DEFAULT_HISTORY_BYTES,
+    GREY_SCALE_DIM,
+    PIXEL_MAX,
+    RGB_DIM,
+    Layout,
+    LumaSpace,
+    Mode,
+    Scale,
+    ValidationLevel,
+)
+from pictokit.controls import (
+    auto_contrast,
+    auto_contrast_lut,
+    calculate_histogram,
+    equalization_lut,
+    equalize_adaptive,
+    equalize_histogram,
+    load_image,
+    save_image,
+)
+from pictokit.history import State, TransformHistory
 
 __all__ = [
     '__version__',
@@ -25,6 +49,12 @@ class Image:
         path: str | None = None,
         img_arr: np.ndarray | None = None,
         mode: Mode = 'any',
+        lazy: bool = False,
+        history_bytes: int = DEFAULT_HISTORY_BYTES,
+        data: bytes | bytearray | memoryview | None = None,
+        shape: tuple[int, ...] | None = None,
+        layout: Layout = 'any',
+        threads: int | None = None,
     ) -> None:
         """
         Initializes a new image instance.
@@ -42,44 +72,380 @@ class Image:
                 - `'any'`: Accept input as-is (no forced conversion).
                 - `'gray'`: Ensure grayscale; color inputs are converted.
                 - `'color'`: Ensure 3-channel color; grayscale inputs are converted.
+            lazy (bool): If True, point operations are only recorded and composed
+                into a single lookup table. The pixels are transformed once, when
+                `transform` is read or `compute` is called. Defaults to False.
+            history_bytes (int): Byte budget for the full-image snapshots kept by
+                the undo history. Point operations are stored as lookup tables
+                and do not count. Defaults to `DEFAULT_HISTORY_BYTES`.
+            data (bytes | bytearray | memoryview | None): Encoded image file held
+                in memory, decoded without an intermediate copy, or raw pixels
+                when `shape` is given. See `load_image`.
+            shape (tuple[int, ...] | None): Shape of raw ``uint8`` pixels in
+                `data`, which are then used without copying. Defaults to None.
+            layout (Layout): Memory layout the image must have, so that no
+                operation copies it implicitly: ``"rows"``, ``"contiguous"`` or
+                ``"any"``. See `validate_imgarray`. Defaults to ``"any"``.
+            threads (int | None): Threads that apply lookup tables and count
+                histograms on large images, in row bands. Images below the
+                pixel threshold of `parallel.set_threads` stay single-threaded.
+                Defaults to None, which uses `parallel.set_threads`.
 
         Raises:
             FileNotFoundError: If `path` is provided and the file does not exist.
-            ValueError: If neither `path` nor `img_arr` is provided, if `mode` is
-                invalid, or if `img_arr` has an unsupported shape/dtype.
+            ValueError: If not exactly one of `path`, `img_arr` and `data` is
+                provided, if `mode` is invalid, if `img_arr` has an unsupported
+                shape/dtype, if `data` cannot be decoded, or if the image does
+                not have the required `layout`.
         """
-        img = load_image(path, img_arr, mode)
+        img = load_image(path, img_arr, mode, data=data, shape=shape, layout=layout)
 
         self.img = img
-        self.transform = np.array([])
+        self.path = path
+        self.lazy = lazy
+        self.threads = threads
+        self._transform = np.array([])
+        self._pending_src: np.ndarray | None = None
+        self._pending_lut: np.ndarray | None = None
+        self._pending_out: np.ndarray | None = None
+        self._histograms: dict[str, np.ndarray] = {}
+        self.history = TransformHistory(max_bytes=history_bytes)
+        self._state = State()
 
     def __repr__(self) -> str:
-        plt.imshow(self.img)
-        plt.show()
         return f'<Image: shape={self.img.shape}, dtype={self.img.dtype}>'
 
+    def show(self, type: Literal['o', 't'] = 'o') -> None:
+        """
+        Displays the image.
+
+        Args:
+            type (Literal["o", "t"], optional): Selects which image to display.
+                - "o": The original image.
+                - "t": The transformed image.
+                Defaults to "o".
+
+        Returns:
+            None
+        """
+        viz.show_image(self.img if type == 'o' else self.transform)
+
+    @beartype
+    def save(
+        self,
+        path: str,
+        type: Literal['o', 't'] = 't',
+        quality: int | None = None,
+        compression: int | None = None,
+    ) -> None:
+        """
+        Writes the image to a file, in the format given by the extension.
+
+        Args:
+            path (str): Destination path, e.g. ``"out.jpg"``.
+            type (Literal["o", "t"], optional): Selects which image to write.
+                - "o": The original image.
+                - "t": The transformed image.
+                Defaults to "t".
+            quality (int | None, optional): JPEG or WebP quality, from 0 to 100.
+                Defaults to None, the encoder default.
+            compression (int | None, optional): PNG compression level, from 0 to
+                9. Defaults to None, the encoder default.
+
+        Raises:
+            ValueError: If there is no transformed image yet, or if the format or
+                the options are invalid.
+            OSError: If the file cannot be written.
+        """
+        img = self.img if type == 'o' else self.transform
+        if img.size == 0:
+            raise ValueError('There is no transformed image to save.')
+        save_image(path, img, quality=quality, compression=compression)
+
+    @beartype
+    def preview(self, scale: Scale = 4) -> np.ndarray:
+        """
+        Returns a reduced-resolution copy of the original image.
+
+        Images loaded from a file are decoded again directly at the reduced size,
+        which for JPEG is several times faster than a full decode and never holds
+        a second full-size copy. Images given as arrays are resized instead.
+        Previews are cheap inputs for thumbnails and approximate histograms.
+
+        Args:
+            scale (Scale, optional): Downscaling factor: 1, 2, 4 or 8.
+                Defaults to 4.
+
+        Returns:
+            np.ndarray: The reduced image.
+        """
+        if self.path is None:
+            return load_image(img_arr=self.img, scale=scale)
+        # The loaded image tells which layout to decode, even in mode "any"
+        mode = 'gray' if self.img.ndim == GREY_SCALE_DIM else 'color'
+        return load_image(path=self.path, mode=mode, scale=scale)
+
+    @property
+    def layout(self) -> ImageLayout:
+        """Memory layout of the original image, see `describe_layout`."""
+        return describe_layout(self.img)
+
     @property
     def img1d(self):
-        return np.reshape(self.img, -1)
+        # A view when possible; otherwise the copy is made, and counted, here
+        return np.reshape(as_contiguous(self.img), -1)
 
     @property
     def transform1d(self):
-        return np.reshape(self.transform, -1)
+        return np.reshape(as_contiguous(self.transform), -1)
+
+    @property
+    def transform(self) -> np.ndarray:
+        """The image resulting from the transformations applied to the instance.
+
+        In lazy mode, reading it applies the pending lookup table first.
+        """
+        if self._pending_lut is None:
+            return self._transform
+        return self.compute()
+
+    @transform.setter
+    def transform(self, value: np.ndarray) -> None:
+        # An arbitrary array cannot be rebuilt, so it starts a new history
+        self.history.clear()
+        self._state = State(base=self.history.snapshot(value.view()))
+        self.__store(self._state.base.pixels)
+
+    def __store(self, value: np.ndarray) -> None:
+        self._transform = value
+        self._histograms.pop('t', None)
+        self._pending_src = None
+        self._pending_lut = None
+        self._pending_out = None
+
+    @metrics.instrument_method('Image.compute')
+    def compute(self) -> np.ndarray:
+        """
+        Applies the pending point operations recorded in lazy mode.
+
+        All recorded operations are already composed into a single lookup table,
+        so the pixels are read and written only once. Does nothing when there
+        are no pending operations.
+
+        Returns:
+            np.ndarray: The transformed image.
+        """
+        if self._pending_lut is not None:
+            self.__store(
+                elw._apply_lut(
+                    img=self._pending_src,
+                    lut=self._pending_lut,
+                    out=self._pending_out,
+                    threads=self.threads,
+                )
+            )
+        return self._transform
+
+    @beartype
+    def __pixel_transform(
+        self,
+        func: Callable,
+        args: dict,
+        reset: bool = False,
+        out: np.ndarray | None = None,
+        inplace: bool = False,
+        validation: ValidationLevel | None = None,
+        luma: bool | LumaSpace = False,
+    ):
+        n_channels = self.img.shape[2] if self.img.ndim == RGB_DIM else None
+        lut = elw.channel_lut(
+            func=func, args=args, n_channels=n_channels, validation=validation
+        )
+        if not luma:
+            self.__lut_transform(lut=lut, reset=reset, out=out, inplace=inplace)
+            return
+        if lut.ndim > 1:
+            raise ValueError('Per-channel parameters cannot be combined with luma.')
+        space = elw._luma_space(luma)
+        self.__luma_transform(
+            partial(elw.apply_luma_lut, lut=lut, space=space), reset, out, inplace
+        )
+
+    def __luma_transform(
+        self,
+        func: Callable[[np.ndarray], np.ndarray],
+        reset: bool,
+        out: np.ndarray | None,
+        inplace: bool,
+    ) -> None:
+        # The result is not a lookup table of the BGR values, so it is computed
+        # at once and kept as a history snapshot, like adaptive_equalize.
+        if out is not None or inplace:
+            raise ValueError('out and inplace cannot be combined with luma.')
+        self.__snapshot_transform(func, reset)
+
+    def __snapshot_transform(
+        self, func: Callable[[np.ndarray], np.ndarray], reset: bool
+    ) -> None:
+        source = State() if reset else self._state
+
+        def rebuild() -> np.ndarray:
+            return func(self.__state_pixels(source))
+
+        src = self.img if reset or self.transform.size == 0 else self.transform
+        result = func(src)
+
+        self.history.push(self._state)
+        self._state = State(base=self.history.snapshot(result, rebuild))
+        self.__store(result)
+
+    def __lut_transform(
+        self,
+        lut: np.ndarray,
+        reset: bool = False,
+        out: np.ndarray | None = None,
+        inplace: bool = False,
+    ) -> None:
+        if out is not None and np.may_share_memory(out, self.img):
+            raise ValueError('out must not share memory with the original image.')
+
+        if self._pending_lut is not None and not reset:
+            self._pending_lut = elw.compose_luts(self._pending_lut, lut)
+        else:
+            reset = reset or self._transform.size == 0
+            self._pending_src = self.img if reset else self._transform
+            self._pending_lut = lut
+
+        if (
+            out is None
+            and inplace
+            and self._transform.shape == self.img.shape
+            and self._transform.flags.writeable
+            and not np.may_share_memory(self._transform, self.img)
+        ):
+            out = self._transform
+        if out is not None:
+            self._pending_out = out
+
+        if not self.lazy:
+            self.compute()
+
+        previous = self._state
+        if reset or previous.is_initial:
+            self._state = State(lut=lut)
+        elif previous.lut is None:
+            self._state = State(base=previous.base, lut=lut)
+        else:
+            lut = elw.compose_luts(previous.lut, lut)
+            self._state = State(base=previous.base, lut=lut)
+        self.history.push(previous)
+
+    @metrics.instrument_method('Image.undo')
+    @beartype
+    def undo(self) -> bool:
+        """
+        Returns to the transform before the last operation.
+
+        Point operations are restored with a single lookup table pass over the
+        original image or over a kept snapshot, without replaying the chain.
+
+        Returns:
+            bool: False if there was nothing to undo.
+        """
+        state = self.history.undo(self._state)
+        if state is not None:
+            self.__restore(state)
+        return state is not None
+
+    @metrics.instrument_method('Image.redo')
+    @beartype
+    def redo(self) -> bool:
+        """
+        Applies again the last undone operation.
+
+        Returns:
+            bool: False if there was nothing to redo.
+        """
+        state = self.history.redo(self._state)
+        if state is not None:
+            self.__restore(state)
+        return state is not None
+
+    def __restore(self, state: State) -> None:
+        self._state = state
+        if state.is_initial:
+            self.__store(np.array([]))
+            return
+
+        base = self.__state_base(state)
+        if state.lut is None:
+            self.__store(base)
+            return
+
+        self._pending_src = base
+        self._pending_lut = state.lut
+        self._pending_out = None
+        if not self.lazy:
+            self.compute()
+
+    def __state_base(self, state: State) -> np.ndarray:
+        return self.img if state.base is None else self.history.pixels(state.base)
+
+    def __state_pixels(self, state: State) -> np.ndarray:
+        base = self.__state_base(state)
+        if state.lut is None:
+            return base
+        return elw.apply_lut(base, state.lut, threads=self.threads)
 
     @beartype
-    def __pixel_transform(self, func: Callable, args: dict, reset: bool = False):
-        img1d = self.img1d if reset or self.transform.size == 0 else self.transform1d
+    def histogram_data(
+        self, type: Literal['o', 't'] = 'o', channels: bool = False
+    ) -> np.ndarray:
+        """
+        Returns the histogram of the image.
+
+        Histograms are computed once and cached. The histogram of the transformed
+        image is discarded whenever an operation replaces `transform`; arrays
+        modified directly by the caller are not tracked.
+
+        Args:
+            type (Literal["o", "t"], optional): Selects which image to use.
+                - "o": Histogram of the original image.
+                - "t": Histogram of the transformed image.
+                Defaults to "o".
+            channels (bool, optional): If True, returns one histogram per channel
+                of a color image. Defaults to False.
 
-        aux_arr = []
-        for pixel in img1d:
-            args['pixel'] = pixel
-            new_pixel = int(func(**args))
-            aux_arr.append(new_pixel)
-        img_transform = np.array(aux_arr)
-        self.transform = np.reshape(img_transform, self.img.shape)
+        Returns:
+            np.ndarray: Read-only ``int64`` histogram with shape ``(256,)``, or
+                ``(3, 256)`` with `channels`.
+
+        Raises:
+            ValueError: If `channels` is requested for a grayscale image.
+        """
+        img = self.img if type == 'o' else self.transform
+        if channels and img.ndim != RGB_DIM:
+            raise ValueError(
+                f'Per-channel histograms require an (H, W, C) image, got {img.shape}.'
+            )
+
+        values = self._histograms.get(type)
+        metrics.note_cache(hit=values is not None)
+        if values is None:
+            # Color histograms are kept per channel; the total is their sum
+            values = calculate_histogram(
+                img=img, channels=img.ndim == RGB_DIM, threads=self.threads
+            )
+            values.flags.writeable = False
+            self._histograms[type] = values
+
+        if values.ndim > 1 and not channels:
+            values = values.sum(axis=0)
+            values.flags.writeable = False
+        return values
 
     @beartype
-    def histogram(self, type: Literal['o', 't'] = 'o') -> None:
+    def histogram(self, type: Literal['o', 't'] = 'o', channels: bool = False) -> None:
         """
         Plots the histogram of the image.
 
@@ -88,56 +454,133 @@ class Image:
                 - "o": Plot histogram of the original image.
                 - "t": Plot histogram of the transformed image.
                 Defaults to "o".
+            channels (bool, optional): If True, plots one histogram per channel of
+                a color image (B, G and R). Defaults to False.
 
         Raises:
-            ValueError: If `type` is not "o" or "t".
+            ValueError: If `type` is not "o" or "t", or if `channels` is requested
+                for a grayscale image.
         """
-        img = self.img if type == 'o' else self.transform
-
-        values = calculate_histogram(img=img)
-        bars = len(values)
-        plt.figure(figsize=(8, 6))
-        plt.bar(range(bars), values)
-        plt.show()
+        viz.plot_histogram(self.histogram_data(type=type, channels=channels))
 
+    @metrics.instrument_method('Image.contrast_expansion')
     @beartype
     def contrast_expansion(
         self,
-        low_limit: np.uint8 | int,
-        high_limit: np.uint8 | int,
+        low_limit: np.uint8 | int | Sequence[int] | None = None,
+        high_limit: np.uint8 | int | Sequence[int] | None = None,
         hist: bool = False,
         reset: bool = False,
+        out: np.ndarray | None = None,
+        inplace: bool = False,
+        validation: ValidationLevel | None = None,
+        percentiles: tuple[int | float, int | float] = (1.0, 99.0),
+        channels: bool = False,
+        luma: bool | LumaSpace = False,
     ) -> None:
         """
         Expands the contrast of the image by stretching pixel intensity values
         between the specified limits.
 
+        Without limits, they are found automatically at `percentiles` of the
+        image histogram, which is computed once (or, in lazy mode, derived from
+        the source histogram) instead of scanning the pixels again.
+
+        A limit given as a sequence has one value per channel of a color image;
+        the channels are still mapped in a single lookup table pass.
+
         Args:
-            low_limit (int): Lower bound of the pixel intensity range.
-            high_limit (int): Upper bound of the pixel intensity range.
+            low_limit (int | Sequence[int] | None): Lower bound of the pixel
+                intensity range, or one per channel. Defaults to None
+                (automatic).
+            high_limit (int | Sequence[int] | None): Upper bound of the pixel
+                intensity range, or one per channel. Defaults to None
+                (automatic).
             hist (bool, optional): If True, displays the histogram of the transformed
                 image.
                 Defaults to False.
+            reset (bool, optional): If True, apply the transformation to the original
+                image instead of the current `transform`. Defaults to False.
+            out (np.ndarray | None, optional): Preallocated ``uint8`` array with the
+                shape of the image that receives the result, which then becomes
+                `transform`. Defaults to None.
+            inplace (bool, optional): If True, the result is written into the
+                current `transform` array instead of a new one. Defaults to False.
+            validation (ValidationLevel | None, optional): Validation level of this
+                call: ``"full"``, ``"boundary"`` or ``"off"``. Defaults to None,
+                which uses the level set by `set_validation_level`.
+            percentiles (tuple[float, float], optional): Low and high histogram
+                percentiles used as limits in automatic mode. Defaults to
+                ``(1.0, 99.0)``.
+            channels (bool, optional): In automatic mode, find separate limits
+                for each channel of a color image. Defaults to False.
+            luma (bool | LumaSpace, optional): If set, transform only the
+                brightness of a color image: it is converted once to
+                ``"ycrcb"`` (True) or ``"lab"``, the luma plane is mapped and the
+                image is converted back. Cannot be combined with per-channel
+                parameters, `out` or `inplace`. Defaults to False.
 
         Attributes:
             transform (np.ndarray): The image resulting from a transformation applied
                 to the instance.
 
+        Raises:
+            ValueError: If only one of the limits is given, if the limits or
+                the percentiles are invalid, if per-channel limits do not match
+                the channels of the image, if `luma` is used with a grayscale
+                image, or if `channels` is used with `luma` or a grayscale
+                image in automatic mode.
+
         Returns:
             None
         """
-        args = {'low_limit': low_limit, 'high_limit': high_limit}
-        self.__pixel_transform(func=elw.pixel_expansion, args=args, reset=reset)
+        if (low_limit is None) != (high_limit is None):
+            raise ValueError('Provide both low_limit and high_limit, or neither.')
+        if low_limit is None and channels:
+            # Same checks as controls.auto_contrast
+            if luma:
+                raise ValueError('channels and luma cannot be combined.')
+            if self.img.ndim != RGB_DIM:
+                raise ValueError(
+                    'Per-channel histograms require an (H, W, C) image, '
+                    f'got {self.img.shape}.'
+                )
+
+        if low_limit is None and luma:
+            func = partial(auto_contrast, percentiles=percentiles, luma=luma)
+            self.__luma_transform(func, reset, out, inplace)
+        elif low_limit is None:
+            values = self.__source_histogram(reset)
+            if not channels and values.ndim > 1:
+                values = values.sum(axis=0)
+            lut = auto_contrast_lut(values, percentiles)
+            self.__lut_transform(lut=lut, reset=reset, out=out, inplace=inplace)
+        else:
+            args = {'low_limit': low_limit, 'high_limit': high_limit}
+            self.__pixel_transform(
+                func=elw.pixel_expansion,
+                args=args,
+                reset=reset,
+                out=out,
+                inplace=inplace,
+                validation=validation,
+                luma=luma,
+            )
 
         if hist:
             self.histogram(type='t')
 
+    @metrics.instrument_method('Image.thresholding')
     def thresholding(
         self,
-        T: np.uint8 | int,
-        A: np.uint8 | int,
+        T: np.uint8 | int | Sequence[int],
+        A: np.uint8 | int | Sequence[int],
         hist: bool = False,
         reset: bool = False,
+        out: np.ndarray | None = None,
+        inplace: bool = False,
+        validation: ValidationLevel | None = None,
+        luma: bool | LumaSpace = False,
     ) -> None:
         """Apply binary thresholding to the image.
 
@@ -147,26 +590,57 @@ class Image:
         its original state before applying the transformation.
 
         Args:
-            T (np.uint8 | int): Threshold value. Pixels greater than or equal to T are
-                set to A, otherwise set to 0.
-            A (np.uint8 | int): Intensity value assigned to multiply pixels above the
-                threshold.
+            T (np.uint8 | int | Sequence[int]): Threshold value, or one per channel
+                of a color image. Pixels greater than or equal to T are set to A,
+                otherwise set to 0.
+            A (np.uint8 | int | Sequence[int]): Intensity value assigned to multiply
+                pixels above the threshold, or one per channel.
             hist (bool, optional): If True, display the histogram of the resulting
                 image. Defaults to False.
             reset (bool, optional): If True, reset the image transformed to its
                 original state before applying the thresholding. If False, apply
                 thresholding on the current state of the image. Defaults to True.
+            out (np.ndarray | None, optional): Preallocated ``uint8`` array with the
+                shape of the image that receives the result, which then becomes
+                `transform`. Defaults to None.
+            inplace (bool, optional): If True, the result is written into the
+                current `transform` array instead of a new one. Defaults to False.
+            validation (ValidationLevel | None, optional): Validation level of this
+                call: ``"full"``, ``"boundary"`` or ``"off"``. Defaults to None,
+                which uses the level set by `set_validation_level`.
+            luma (bool | LumaSpace, optional): If set, transform only the
+                brightness of a color image: it is converted once to
+                ``"ycrcb"`` (True) or ``"lab"``, the luma plane is mapped and the
+                image is converted back. Cannot be combined with per-channel
+                parameters, `out` or `inplace`. Defaults to False.
 
         Returns:
             None
         """
         args = {'T': T, 'A': A}
-        self.__pixel_transform(func=elw.pixel_thresholding, args=args, reset=reset)
+        self.__pixel_transform(
+            func=elw.pixel_thresholding,
+            args=args,
+            reset=reset,
+            out=out,
+            inplace=inplace,
+            validation=validation,
+            luma=luma,
+        )
 
         if hist:
             self.histogram(type='t')
 
-    def digital_negative(self, hist: bool = False, reset: bool = False):
+    @metrics.instrument_method('Image.digital_negative')
+    def digital_negative(
+        self,
+        hist: bool = False,
+        reset: bool = False,
+        out: np.ndarray | None = None,
+        inplace: bool = False,
+        validation: ValidationLevel | None = None,
+        luma: bool | LumaSpace = False,
+    ):
         """
         Apply the digital negative transformation to the image.
 
@@ -181,16 +655,145 @@ class Image:
             reset (bool, optional): If True, overwrite the original image with
                 the transformed version. If False, keep both available.
                 Defaults to False.
+            out (np.ndarray | None, optional): Preallocated ``uint8`` array with the
+                shape of the image that receives the result, which then becomes
+                `transform`. Defaults to None.
+            inplace (bool, optional): If True, the result is written into the
+                current `transform` array instead of a new one. Defaults to False.
+            validation (ValidationLevel | None, optional): Validation level of this
+                call: ``"full"``, ``"boundary"`` or ``"off"``. Defaults to None,
+                which uses the level set by `set_validation_level`.
+            luma (bool | LumaSpace, optional): If set, transform only the
+                brightness of a color image: it is converted once to
+                ``"ycrcb"`` (True) or ``"lab"``, the luma plane is mapped and the
+                image is converted back. Cannot be combined with per-channel
+                parameters, `out` or `inplace`. Defaults to False.
 
         Returns:
             None: The transformation is applied in-place.
         """
-        args = {'pixel': self}
-        self.__pixel_transform(args=args, func=elw.pixel_digital_negative, reset=reset)
+        self.__pixel_transform(
+            args={},
+            func=elw.pixel_digital_negative,
+            reset=reset,
+            out=out,
+            inplace=inplace,
+            validation=validation,
+            luma=luma,
+        )
+
+        if hist:
+            self.histogram(type='t')
+
+    @metrics.instrument_method('Image.equalize')
+    @beartype
+    def equalize(
+        self,
+        hist: bool = False,
+        reset: bool = False,
+        out: np.ndarray | None = None,
+        inplace: bool = False,
+        luma: bool | LumaSpace = False,
+    ) -> None:
+        """
+        Equalize the histogram of the image.
+
+        The equalization lookup table is built from the histogram of the current
+        image, so this is a point operation like the others: in lazy mode it is
+        composed with the pending operations, and the histogram of the pending
+        result is derived from the source histogram without touching the pixels.
+        Color images are equalized channel by channel.
+
+        Args:
+            hist (bool, optional): If True, display the histogram of the
+                transformed image. Defaults to False.
+            reset (bool, optional): If True, apply the transformation to the original
+                image instead of the current `transform`. Defaults to False.
+            out (np.ndarray | None, optional): Preallocated ``uint8`` array with the
+                shape of the image that receives the result, which then becomes
+                `transform`. Defaults to None.
+            inplace (bool, optional): If True, the result is written into the
+                current `transform` array instead of a new one. Defaults to False.
+            luma (bool | LumaSpace, optional): If set, transform only the
+                brightness of a color image: it is converted once to
+                ``"ycrcb"`` (True) or ``"lab"``, the luma plane is mapped and the
+                image is converted back. Cannot be combined with per-channel
+                parameters, `out` or `inplace`. Defaults to False.
+
+        Returns:
+            None
+        """
+        if luma:
+            func = partial(equalize_histogram, luma=luma)
+            self.__luma_transform(func, reset, out, inplace)
+        else:
+            lut = equalization_lut(self.__source_histogram(reset))
+            self.__lut_transform(lut=lut, reset=reset, out=out, inplace=inplace)
+
+        if hist:
+            self.histogram(type='t')
+
+    @metrics.instrument_method('Image.adaptive_equalize')
+    @beartype
+    def adaptive_equalize(
+        self,
+        tiles: tuple[int, int] = (8, 8),
+        clip_limit: float | None = 2.0,
+        hist: bool = False,
+        reset: bool = False,
+    ) -> None:
+        """
+        Apply contrast limited adaptive histogram equalization (CLAHE).
+
+        Unlike the point operations, each pixel depends on its neighborhood, so
+        pending lazy operations are applied first and the result is computed
+        immediately. The result is read-only: it is also the snapshot kept by
+        the undo history.
+
+        Args:
+            tiles (tuple[int, int], optional): Number of tiles along the rows and
+                the columns. Defaults to ``(8, 8)``.
+            clip_limit (float | None, optional): Contrast limit, relative to the
+                mean bin count of a tile. None disables clipping. Defaults to 2.0.
+            hist (bool, optional): If True, display the histogram of the
+                transformed image. Defaults to False.
+            reset (bool, optional): If True, apply the transformation to the original
+                image instead of the current `transform`. Defaults to False.
+
+        Returns:
+            None
+        """
+        self.__snapshot_transform(
+            partial(equalize_adaptive, tiles=tiles, clip_limit=clip_limit), reset
+        )
 
         if hist:
             self.histogram(type='t')
 
+    def __source_histogram(self, reset: bool) -> np.ndarray:
+        """Histogram of the image the next point operation will read."""
+        channels = self.img.ndim == RGB_DIM
+        if reset or (self._transform.size == 0 and self._pending_lut is None):
+            return self.histogram_data('o', channels=channels)
+        if self._pending_lut is None:
+            return self.histogram_data('t', channels=channels)
+
+        src, lut = self._pending_src, self._pending_lut
+        if src is self.img:
+            values = self.histogram_data('o', channels=channels)
+        elif src is self._transform and 't' in self._histograms:
+            values = self._histograms['t']
+        else:
+            values = calculate_histogram(src, channels=channels, threads=self.threads)
+
+        # Each source bin moves, whole, to the bin its value is mapped to
+        luts = lut.T if lut.ndim > 1 else [lut] * len(np.atleast_2d(values))
+        remapped = [
+            np.bincount(channel_lut, weights=channel_values, minlength=PIXEL_MAX + 1)
+            for channel_lut, channel_values in zip(luts, np.atleast_2d(values))
+        ]
+        return np.reshape(remapped, values.shape).astype(np.int64)
+
     def compare_images(self) -> None:
         """
         Displays the original image and the transformed image side by side
@@ -203,14 +806,4 @@ class Image:
         Returns:
             None
         """
-        _, axs = plt.subplots(1, 2, figsize=(10, 5))
-
-        axs[0].imshow(self.img, cmap='gray')
-        axs[0].set_title('Original')
-        axs[0].axis('off')
-
-        axs[1].imshow(self.transform, cmap='gray')
-        axs[1].set_title('Transform')
-        axs[1].axis('off')
-
-        plt.show()
+        viz.compare_images(self.img, self.transform)
@@ -0,0 +1,259 @@
+import asyncio
+import os
+from collections import deque
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from contextlib import suppress
+from functools import partial
+from typing import Any, TypeVar
+
+import numpy as np
+from beartype import beartype
+
+from pictokit import controls
+from pictokit.cache import ImageCache
+from pictokit.constants import START_POLL_SECONDS, Mode, Scale
+from pictokit.runner import Transform, _claim_name, _process_one
+
+T = TypeVar('T')
+
+
+@beartype
+async def run_in_executor(
+    func: Callable[..., T],
+    *args: Any,
+    executor: Executor | None = None,
+    timeout: float | None = None,
+    **kwargs: Any,
+) -> T:
+    """Run a blocking function in an executor without blocking the event loop.
+
+    OpenCV and NumPy release the GIL while decoding and transforming, so the
+    default thread pool of the loop runs them in parallel.
+
+    The timeout counts from the moment a worker starts the call, so time
+    spent queued behind other work of the executor does not count against
+    it. On timeout or cancellation the awaiting coroutine stops waiting at
+    once. A call that has not started yet is dropped; one already running in
+    a thread finishes in the background, as threads cannot be interrupted.
+
+    Args:
+        func (Callable[..., T]): Blocking function.
+        *args (Any): Positional arguments of `func`.
+        executor (Executor | None): Executor to use. Defaults to None, the
+            default executor of the running loop.
+        timeout (float | None): Seconds allowed once the call has started.
+            Defaults to None (no limit).
+        **kwargs (Any): Keyword arguments of `func`.
+
+    Returns:
+        T: The result of `func`.
+
+    Raises:
+        asyncio.TimeoutError: If the result is not ready within `timeout` of
+            the start of the call.
+    """
+    loop = asyncio.get_running_loop()
+    call = partial(func, *args, **kwargs)
+    if timeout is None:
+        return await loop.run_in_executor(executor, call)
+
+    if isinstance(executor, ProcessPoolExecutor):
+        # The call runs in another process, which cannot signal the loop. Its
+        # future is marked running once the pool queues it for the workers,
+        # at most one call per worker ahead of its actual start.
+        submitted = executor.submit(call)
+        future = asyncio.wrap_future(submitted)
+        started = asyncio.ensure_future(_running(submitted))
+    else:
+        event = asyncio.Event()
+        future = loop.run_in_executor(executor, partial(_notify, loop, event, call))
+        started = asyncio.ensure_future(event.wait())
+    try:
+        await asyncio.wait([future, started], return_when=asyncio.FIRST_COMPLETED)
+        return await asyncio.wait_for(future, timeout)
+    finally:
+        started.cancel()
+        future.cancel()
+
+
+def _notify(
+    loop: asyncio.AbstractEventLoop, event: asyncio.Event, call: Callable[[], T]
+) -> T:
+    """Set `event` on the loop, then run `call`; runs in an executor thread."""
+    with suppress(RuntimeError):  # the loop may be closed by now
+        loop.call_soon_threadsafe(event.set)
+    return call()
+
+
+async def _running(future: Future) -> None:
+    while not (future.running() or future.done()):
+        await asyncio.sleep(START_POLL_SECONDS)
+
+
+@beartype
+async def load_image(
+    path: str | None = None,
+    img_arr: np.ndarray | None = None,
+    mode: Mode = 'any',
+    auto_convert: bool = True,
+    cache: bool | ImageCache = False,
+    scale: Scale = 1,
+    executor: Executor | None = None,
+    timeout: float | None = None,
+    data: bytes | bytearray | memoryview | None = None,
+    shape: tuple[int, ...] | None = None,
+) -> np.ndarray:
+    """Asynchronous `controls.load_image`, decoded in an executor.
+
+    Args:
+        path (str | None): Path to the image file.
+        img_arr (np.ndarray | None): Image array to validate.
+        mode (Mode): Expected image type. Defaults to ``"any"``.
+        auto_convert (bool): Convert grayscale to BGR in mode ``"color"``.
+            Defaults to True.
+        cache (bool | ImageCache): Decoded-image cache. Defaults to False.
+        scale (Scale): Downscaling factor. Defaults to 1.
+        executor (Executor | None): Executor that decodes the image. Defaults
+            to the default executor of the running loop.
+        timeout (float | None): Seconds to wait for the image. Defaults to
+            None (no limit).
+        data (bytes | bytearray | memoryview | None): Encoded image held in
+            memory, such as a message payload.
+        shape (tuple[int, ...] | None): Shape of raw pixels in `data`.
+            Defaults to None (decode `data`).
+
+    Returns:
+        np.ndarray: The loaded image.
+
+    Raises:
+        asyncio.TimeoutError: If the image is not ready within `timeout`.
+        FileNotFoundError: If the file at `path` cannot be read.
+    """
+    return await run_in_executor(
+        controls.load_image,
+        path=path,
+        img_arr=img_arr,
+        mode=mode,
+        auto_convert=auto_convert,
+        cache=cache,
+        scale=scale,
+        data=data,
+        shape=shape,
+        executor=executor,
+        timeout=timeout,
+    )
+
+
+@beartype
+async def process_images(
+    paths: Iterable[str] | AsyncIterable[str],
+    transforms: Iterable[Transform] = (),
+    output_dir: str | None = None,
+    mode: Mode = 'any',
+    max_in_flight: int | None = None,
+    timeout: float | None = None,
+    ordered: bool = True,
+    return_exceptions: bool = False,
+    executor: Executor | None = None,
+) -> AsyncIterator[tuple[str, np.ndarray | BaseException]]:
+    """Asynchronous counterpart of `runner.process_images`.
+
+    Every image is loaded, passed through `transforms` and optionally written
+    to `output_dir` in an executor. Paths are read lazily, from a regular or
+    an asynchronous iterable, and at most `max_in_flight` images are pending
+    at any time: a slow consumer stops the intake instead of piling up
+    decoded images. Closing the generator, or cancelling the task iterating
+    it, cancels the images still pending.
+
+    Args:
+        paths (Iterable[str] | AsyncIterable[str]): Image paths.
+        transforms (Iterable[Transform]): Functions that take and return an
+            image array, applied in order. Defaults to no transformation.
+        output_dir (str | None): Directory where results are written under
+            their file name. It is created if needed. Defaults to None
+            (nothing is written).
+        mode (Mode): Mode passed to `load_image`. Defaults to ``"any"``.
+        max_in_flight (int | None): Maximum number of pending images. Defaults
+            to twice `os.cpu_count()`.
+        timeout (float | None): Seconds allowed for each image, from when a
+            worker starts on it. Defaults to None (no limit).
+        ordered (bool): If True, results are yielded in input order; otherwise
+            in completion order. Defaults to True.
+        return_exceptions (bool): If True, a failed image yields its exception
+            in place of the array and processing continues. Defaults to False.
+        executor (Executor | None): Executor that does the work. Defaults to
+            the default executor of the running loop.
+
+    Yields:
+        tuple[str, np.ndarray | BaseException]: The input path and the
+            transformed image, or the error raised for it.
+
+    Raises:
+        ValueError: If `max_in_flight` is not positive, or if a path has the
+            same file name as an earlier one and `output_dir` is given. Paths
+            are checked as they are read, so earlier images may already be
+            written.
+        asyncio.TimeoutError: If an image takes longer than `timeout`, unless
+            `return_exceptions` is set.
+    """
+    if max_in_flight is None:
+        max_in_flight = 2 * (os.cpu_count() or 1)
+    if max_in_flight < 1:
+        raise ValueError(f'max_in_flight must be greater than 0, got {max_in_flight}.')
+
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+
+    job = (tuple(transforms), output_dir, mode, True)
+    path_iter = _aiter(paths)
+    pending: deque[tuple[str, asyncio.Task]] = deque()
+    names: dict[str, str] = {}
+
+    async def submit() -> bool:
+        try:
+            path = await path_iter.__anext__()
+        except StopAsyncIteration:
+            return False
+        if output_dir is not None:
+            _claim_name(names, path)
+        work = run_in_executor(
+            _process_one, path, *job, executor=executor, timeout=timeout
+        )
+        pending.append((path, asyncio.ensure_future(work)))
+        return True
+
+    try:
+        while len(pending) < max_in_flight and await submit():
+            pass
+
+        while pending:
+            if ordered:
+                path, task = pending[0]
+                await asyncio.wait([task])
+                pending.popleft()
+            else:
+                await asyncio.wait(
+                    [t for _, t in pending], return_when=asyncio.FIRST_COMPLETED
+                )
+                path, task = next((p, t) for p, t in pending if t.done())
+                pending.remove((path, task))
+
+            error = task.exception()
+            if error is not None and not return_exceptions:
+                raise error
+            await submit()
+            yield path, error if error is not None else task.result()
+    finally:
+        for _, task in pending:
+            task.cancel()
+        await asyncio.gather(*(t for _, t in pending), return_exceptions=True)
+
+
+async def _aiter(items: Iterable[T] | AsyncIterable[T]) -> AsyncIterator[T]:
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
@@ -0,0 +1,137 @@
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+
+import numpy as np
+from beartype import beartype
+
+from pictokit import metrics
+from pictokit.constants import DEFAULT_IMAGE_CACHE_BYTES
+
+CacheKey = tuple[str, int, int, str, bool, int]
+
+
+class ImageCache:
+    """Least recently used cache of decoded images, limited in bytes.
+
+    Entries are keyed by the absolute path, modification time and size of the
+    file, plus the decoding options, so a file changed on disk is decoded
+    again. Cached arrays are read-only: every caller shares the same pixels.
+    The cache is safe to use from several threads.
+
+    Args:
+        max_bytes (int): Maximum total size of the cached arrays. Images larger
+            than this are returned but not cached. Defaults to
+            `DEFAULT_IMAGE_CACHE_BYTES`.
+
+    Attributes:
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups that decoded the file.
+        nbytes (int): Total size of the cached arrays.
+
+    Raises:
+        ValueError: If `max_bytes` is negative.
+    """
+
+    @beartype
+    def __init__(self, max_bytes: int = DEFAULT_IMAGE_CACHE_BYTES) -> None:
+        if max_bytes < 0:
+            raise ValueError(f'max_bytes must be non-negative, got {max_bytes}.')
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._entries: OrderedDict[CacheKey, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(
+        self,
+        path: str,
+        mode: str,
+        auto_convert: bool,
+        load: Callable[[], np.ndarray],
+        scale: int = 1,
+    ) -> np.ndarray:
+        """Return the cached image for these options, or decode it with `load`.
+
+        Args:
+            path (str): Path of the image file.
+            mode (str): Mode the image is loaded with.
+            auto_convert (bool): Conversion option the image is loaded with.
+            load (Callable[[], np.ndarray]): Decodes the image on a miss.
+            scale (int): Downscaling factor the image is loaded with.
+                Defaults to 1.
+
+        Returns:
+            np.ndarray: Read-only decoded image.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return load()  # Let the loader report the missing file
+        key = (
+            os.path.abspath(path),
+            stat.st_mtime_ns,
+            stat.st_size,
+            mode,
+            auto_convert,
+            scale,
+        )
+
+        with self._lock:
+            img = self._entries.get(key)
+            if img is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                metrics.note_cache(hit=True)
+                return img
+            self.misses += 1
+        metrics.note_cache(hit=False)
+
+        # Decoded outside the lock so other files can be served meanwhile
+        img = load()
+        img.flags.writeable = False
+        with self._lock:
+            self._insert(key, img)
+        return img
+
+    @beartype
+    def invalidate(self, path: str | None = None) -> int:
+        """Drop the cached entries of a file, or every entry.
+
+        Args:
+            path (str | None): File whose entries are dropped, for every mode.
+                Defaults to None, which empties the cache.
+
+        Returns:
+            int: Number of entries dropped.
+        """
+        with self._lock:
+            if path is None:
+                keys = list(self._entries)
+            else:
+                path = os.path.abspath(path)
+                keys = [key for key in self._entries if key[0] == path]
+            for key in keys:
+                self.nbytes -= self._entries.pop(key).nbytes
+            return len(keys)
+
+    def _insert(self, key: CacheKey, img: np.ndarray) -> None:
+        # Entries for older versions of the file can no longer be hit
+        for other in [k for k in self._entries if k[0] == key[0] and k[3:] == key[3:]]:
+            self.nbytes -= self._entries.pop(other).nbytes
+
+        if img.nbytes > self.max_bytes:
+            return
+        self._entries[key] = img
+        self.nbytes += img.nbytes
+        while self.nbytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+
+
+default_cache = ImageCache()
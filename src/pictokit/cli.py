@@ -0,0 +1,294 @@
+"""Batch processing of image files from the command line.
+
+Applies a chain of point operations to files and directories and writes the
+results to an output directory:
+
+    pictokit photos/ scan.png -o out/ --contrast 30 220 --negative --jobs 8
+    pictokit archive/ -o out/ --equalize --skip-existing --quiet
+
+Operations run in the order they are given; consecutive point operations are
+composed into a single lookup table. Never imports matplotlib, so it runs on
+headless servers and from cron.
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import cv2
+import numpy as np
+
+import pictokit.element_wise as elw
+from pictokit.__about__ import __version__
+from pictokit.constants import IMAGE_EXTENSIONS, Mode
+from pictokit.controls import (
+    auto_contrast,
+    equalize_histogram,
+    load_image,
+    save_image,
+)
+from pictokit.runner import Transform, _run
+
+# Point operations: element-wise function and parameter names
+_POINT_OPS = {
+    'contrast': (elw.pixel_expansion, ('low_limit', 'high_limit')),
+    'threshold': (elw.pixel_thresholding, ('T', 'A')),
+    'negative': (elw.pixel_digital_negative, ()),
+}
+_HISTOGRAM_OPS = {
+    'auto_contrast': auto_contrast,
+    'equalize': equalize_histogram,
+}
+
+
+class _AppendOp(argparse.Action):
+    """Collect every operation option, in command line order, into ``ops``."""
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        namespace.ops = [*namespace.ops, (self.dest, tuple(values or ()))]
+
+
+def build_transforms(ops: Sequence[tuple[str, tuple[int, ...]]]) -> list[Transform]:
+    """Turn operations parsed from the command line into a transform chain.
+
+    Runs of point operations become one `apply_lut` call with the composed
+    lookup table; histogram operations are applied as they are.
+
+    Args:
+        ops (Sequence[tuple[str, tuple[int, ...]]]): Operation names, such as
+            ``"contrast"`` or ``"equalize"``, with their integer parameters.
+
+    Returns:
+        list[Transform]: Picklable functions that take and return an image.
+
+    Raises:
+        ValueError: If the parameters of an operation are invalid.
+    """
+    transforms: list[Transform] = []
+    lut = None
+    for name, values in ops:
+        if name in _POINT_OPS:
+            func, params = _POINT_OPS[name]
+            args = dict(zip(params, values))
+            step = elw.point_lut(func, args, validation='boundary')
+            lut = step if lut is None else elw.compose_luts(lut, step)
+            continue
+        if lut is not None:
+            transforms.append(partial(elw.apply_lut, lut=lut))
+            lut = None
+        transforms.append(_HISTOGRAM_OPS[name])
+    if lut is not None:
+        transforms.append(partial(elw.apply_lut, lut=lut))
+    return transforms
+
+
+def find_images(inputs: Sequence[str], output_dir: str) -> Iterator[tuple[str, str]]:
+    """Yield the source and destination path of every input image.
+
+    Directories are searched recursively for files with an image extension,
+    and their layout is kept under `output_dir`. Files are written directly
+    under `output_dir`. When `output_dir` is inside an input directory, it is
+    not searched, so the results of an earlier run are not processed again.
+
+    Args:
+        inputs (Sequence[str]): Image files and directories.
+        output_dir (str): Directory that receives the results.
+
+    Yields:
+        tuple[str, str]: Source path and destination path.
+
+    Raises:
+        FileNotFoundError: If an input does not exist.
+    """
+    out_real = os.path.realpath(output_dir)
+    for src in inputs:
+        if os.path.isfile(src):
+            yield src, os.path.join(output_dir, os.path.basename(src))
+        elif os.path.isdir(src):
+            # Results are inputs only if the whole directory is inside them
+            skip_output = not _is_within(src, out_real)
+            for root, dirs, files in os.walk(src):
+                dirs[:] = sorted(
+                    d
+                    for d in dirs
+                    if os.path.realpath(os.path.join(root, d)) != out_real
+                )
+                for name in sorted(files):
+                    path = os.path.join(root, name)
+                    if os.path.splitext(name)[1].lower() not in IMAGE_EXTENSIONS:
+                        continue
+                    # Links to earlier results
+                    if skip_output and _is_within(path, out_real):
+                        continue
+                    rel = os.path.relpath(path, src)
+                    yield path, os.path.join(output_dir, rel)
+        else:
+            raise FileNotFoundError(f'No such file or directory: {src}')
+
+
+def _is_within(path: str, directory: str) -> bool:
+    path = os.path.realpath(path)
+    return path == directory or path.startswith(os.path.join(directory, ''))
+
+
+def _convert(
+    task: tuple[str, str],
+    transforms: tuple[Transform, ...],
+    mode: Mode,
+    quality: int | None,
+    compression: int | None,
+) -> Exception | None:
+    src, dst = task
+    try:
+        img: np.ndarray = load_image(path=src, mode=mode)
+        for transform in transforms:
+            img = transform(img)
+        os.makedirs(os.path.dirname(dst) or '.', exist_ok=True)
+        save_image(dst, img, quality=quality, compression=compression)
+    except (OSError, ValueError, TypeError, cv2.error) as error:
+        return error
+    return None
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='pictokit',
+        description='Apply point operations to image files in parallel.',
+        epilog='Operations are applied in the order given.',
+    )
+    parser.add_argument('inputs', nargs='+', help='image files or directories')
+    parser.add_argument(
+        '-o', '--output-dir', required=True, help='directory for the results'
+    )
+    parser.set_defaults(ops=[])
+
+    ops = parser.add_argument_group('operations')
+    ops.add_argument(
+        '--contrast',
+        nargs=2,
+        type=int,
+        metavar=('LOW', 'HIGH'),
+        action=_AppendOp,
+        help='contrast expansion between LOW and HIGH',
+    )
+    ops.add_argument(
+        '--auto-contrast',
+        nargs=0,
+        action=_AppendOp,
+        help='contrast expansion between the 1st and 99th percentiles',
+    )
+    ops.add_argument(
+        '--threshold',
+        nargs=2,
+        type=int,
+        metavar=('T', 'A'),
+        action=_AppendOp,
+        help='set pixels above T to A and leave the others unchanged',
+    )
+    ops.add_argument('--negative', nargs=0, action=_AppendOp, help='digital negative')
+    ops.add_argument(
+        '--equalize', nargs=0, action=_AppendOp, help='histogram equalization'
+    )
+
+    parser.add_argument(
+        '-j',
+        '--jobs',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='images processed in parallel (default: number of CPUs)',
+    )
+    parser.add_argument(
+        '--skip-existing',
+        action='store_true',
+        help='leave images whose output file already exists',
+    )
+    parser.add_argument(
+        '--mode',
+        choices=['any', 'gray', 'color'],
+        default='any',
+        help='load images as they are, or convert them (default: any)',
+    )
+    parser.add_argument('--quality', type=int, help='JPEG or WebP quality, 0-100')
+    parser.add_argument('--compression', type=int, help='PNG compression, 0-9')
+    parser.add_argument('-q', '--quiet', action='store_true', help='only report errors')
+    parser.add_argument('--version', action='version', version=__version__)
+    return parser
+
+
+def main_cli(argv: Sequence[str] | None = None) -> int:
+    """Entry point of the ``pictokit`` command.
+
+    Args:
+        argv (Sequence[str] | None): Command line arguments. Defaults to None,
+            which reads `sys.argv`.
+
+    Returns:
+        int: Exit status: 0 on success, 1 if any image failed, 2 on invalid
+            arguments, including inputs that would be written to the same
+            output file.
+    """
+    parser = _parser()
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error(f'--jobs must be greater than 0, got {args.jobs}')
+    missing = [path for path in args.inputs if not os.path.exists(path)]
+    if missing:
+        parser.error(f'No such file or directory: {", ".join(missing)}')
+    try:
+        transforms = tuple(build_transforms(args.ops))
+    except ValueError as error:
+        parser.error(str(error))
+
+    # Collected up front: two inputs written to the same file would race and
+    # one result would be lost. An input listed twice is processed once.
+    pairs: dict[str, tuple[str, str]] = {}
+    for src, dst in find_images(args.inputs, args.output_dir):
+        other, _ = pairs.setdefault(os.path.normpath(dst), (src, dst))
+        if os.path.realpath(other) != os.path.realpath(src):
+            parser.error(f'{other} and {src} would both be written to {dst}')
+
+    counts = {'done': 0, 'skipped': 0, 'failed': 0}
+
+    def tasks() -> Iterator[tuple[str, str]]:
+        for src, dst in pairs.values():
+            if args.skip_existing and os.path.exists(dst):
+                counts['skipped'] += 1
+                continue
+            yield src, dst
+
+    job = partial(
+        _convert,
+        transforms=transforms,
+        mode=args.mode,
+        quality=args.quality,
+        compression=args.compression,
+    )
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        results = _run(pool, tasks(), job, 2 * args.jobs, ordered=False)
+        for (src, dst), error in results:
+            if error is None:
+                counts['done'] += 1
+                if not args.quiet:
+                    print(f'{src} -> {dst}', file=sys.stderr, flush=True)
+            else:
+                counts['failed'] += 1
+                print(f'error: {src}: {error}', file=sys.stderr, flush=True)
+
+    seconds = time.perf_counter() - start
+    if not args.quiet:
+        rate = counts['done'] / seconds if seconds else 0.0
+        print(
+            f'{counts["done"]} written, {counts["skipped"]} skipped, '
+            f'{counts["failed"]} failed in {seconds:.1f}s ({rate:.1f} images/s)',
+            file=sys.stderr,
+        )
+    return 1 if counts['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main_cli())
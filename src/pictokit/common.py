@@ -1,11 +1,154 @@
+import threading
+from collections.abc import Sequence
+from dataclasses import dataclass
+
 import numpy as np
 from beartype import beartype
 
-from pictokit.constants import GREY_SCALE_DIM, RGB_CHANNELS, RGB_DIM, Mode
+from pictokit import metrics
+from pictokit.constants import (
+    GREY_SCALE_DIM,
+    RGB_CHANNELS,
+    RGB_DIM,
+    Layout,
+    Mode,
+    ValidationLevel,
+)
+
+_validation_level: ValidationLevel = 'full'
+_copy_stats = {'copies': 0, 'bytes': 0}
+_copy_lock = threading.Lock()
+
+
+@beartype
+def set_validation_level(level: ValidationLevel) -> None:
+    """Set the default validation level of the point operations.
+
+    The levels are:
+    - ``"full"``: every scalar kernel call is type- and range-checked.
+    - ``"boundary"``: the parameters are checked once per operation, then the
+      kernels run unchecked.
+    - ``"off"``: no checks at all. Invalid parameters give undefined results.
+
+    Args:
+        level (ValidationLevel): New default level.
+
+    Returns:
+        None
+    """
+    global _validation_level  # noqa: PLW0603
+    _validation_level = level
+
+
+def get_validation_level() -> ValidationLevel:
+    """Return the default validation level set by `set_validation_level`.
+
+    Returns:
+        ValidationLevel: The current default, initially ``"full"``.
+    """
+    return _validation_level
+
+
+@dataclass(frozen=True)
+class ImageLayout:
+    """Memory layout of an array, as reported by `describe_layout`.
+
+    Attributes:
+        contiguous (bool): The whole array is one C-contiguous block, so it can
+            be flattened or reshaped without a copy.
+        rows (bool): Every row is contiguous, as in a crop of a larger image.
+            OpenCV takes such arrays without a copy.
+        owns_data (bool): The array owns its memory instead of viewing another
+            array or buffer.
+        writeable (bool): The array can be written.
+        strides (tuple[int, ...]): Bytes between consecutive entries of each axis.
+    """
+
+    contiguous: bool
+    rows: bool
+    owns_data: bool
+    writeable: bool
+    strides: tuple[int, ...]
+
+
+@beartype
+def describe_layout(img_arr: np.ndarray) -> ImageLayout:
+    """Report the memory layout of an array.
+
+    Crops keep contiguous rows; channel slices such as ``img[..., 0]``,
+    transposes and flips do not, and OpenCV or `np.reshape` copy them.
+
+    Args:
+        img_arr (np.ndarray): Array to inspect.
+
+    Returns:
+        ImageLayout: Contiguity, ownership and strides of the array.
+    """
+    return ImageLayout(
+        contiguous=_has_layout(img_arr, 'contiguous'),
+        rows=_has_layout(img_arr, 'rows'),
+        owns_data=img_arr.flags.owndata,
+        writeable=img_arr.flags.writeable,
+        strides=img_arr.strides,
+    )
+
+
+@beartype
+def as_contiguous(img_arr: np.ndarray, layout: Layout = 'contiguous') -> np.ndarray:
+    """Return an array with the requested layout, copying only if needed.
+
+    This is the explicit conversion step for arrays that would otherwise be
+    copied implicitly by OpenCV or NumPy. Every copy is counted; read the
+    counters with `get_copy_stats` to find the copies a pipeline makes.
+
+    Args:
+        img_arr (np.ndarray): Array to convert.
+        layout (Layout, optional): ``"contiguous"`` for a single C-contiguous
+            block, ``"rows"`` for contiguous rows or ``"any"``. Defaults to
+            ``"contiguous"``.
+
+    Returns:
+        np.ndarray: `img_arr` itself if it has the layout, otherwise a
+            C-contiguous copy.
+    """
+    if _has_layout(img_arr, layout):
+        return img_arr
+    with _copy_lock:
+        _copy_stats['copies'] += 1
+        _copy_stats['bytes'] += img_arr.nbytes
+    return np.ascontiguousarray(img_arr)
+
+
+def get_copy_stats() -> dict[str, int]:
+    """Return the number of copies made by `as_contiguous` and their total bytes.
+
+    Returns:
+        dict[str, int]: ``{"copies": ..., "bytes": ...}`` since the last reset.
+    """
+    with _copy_lock:
+        return dict(_copy_stats)
 
 
+def reset_copy_stats() -> None:
+    """Set the counters of `get_copy_stats` back to zero."""
+    with _copy_lock:
+        _copy_stats.update(copies=0, bytes=0)
+
+
+def _has_layout(arr: np.ndarray, layout: Layout) -> bool:
+    if layout == 'any' or arr.size == 0 or arr.flags.c_contiguous:
+        return True
+    if layout == 'contiguous' or arr.ndim < GREY_SCALE_DIM:
+        return False
+    row = arr[0]
+    return row.flags.c_contiguous and arr.strides[0] >= row.nbytes
+
+
+@metrics.instrument('validate_imgarray')
 @beartype
-def validate_imgarray(img_arr: np.ndarray, mode: Mode = 'any') -> np.ndarray:
+def validate_imgarray(
+    img_arr: np.ndarray, mode: Mode = 'any', layout: Layout = 'any'
+) -> np.ndarray:
     """Validate whether an image array is valid according to type and shape.
 
     Returns the array itself if valid; otherwise, raises a clear exception.
@@ -13,21 +156,32 @@ def validate_imgarray(img_arr: np.ndarray, mode: Mode = 'any') -> np.ndarray:
     - dtype: must be ``uint8``
     - shape: ``(H, W)`` for grayscale or ``(H, W, 3)`` for color
     - mode: enforces ``"gray"``, ``"color"``, or accepts both (``"any"``)
+    - layout: optionally requires a layout that is processed without copies
 
     Args:
         img_arr (np.ndarray): Image array to be validated.
         mode (Mode, optional): Validation mode. Can be ``"gray"``, ``"color"``,
             or ``"any"``. Defaults to ``"any"``.
+        layout (Layout, optional): Required memory layout: ``"rows"`` for
+            contiguous rows (zero-copy for OpenCV), ``"contiguous"`` for a
+            single C-contiguous block, or ``"any"``. Defaults to ``"any"``.
 
     Returns:
         np.ndarray: The same array if it is valid.
 
     Raises:
         TypeError: If the array dtype is not ``uint8``.
-        ValueError: If the array shape does not match the specified mode.
+        ValueError: If the array shape does not match the specified mode, or if
+            its layout would require a copy.
     """
     if img_arr.dtype != np.uint8:
         raise TypeError(f'img_arr must have dtype uint8, got {img_arr.dtype}.')
+    if not _has_layout(img_arr, layout):
+        raise ValueError(
+            f'img_arr does not have the {layout!r} layout (strides '
+            f'{img_arr.strides}) and would be copied. Use as_contiguous to copy '
+            'it explicitly.'
+        )
 
     if img_arr.ndim == GREY_SCALE_DIM:
         if mode in {'gray', 'any'}:
@@ -47,3 +201,57 @@ def validate_imgarray(img_arr: np.ndarray, mode: Mode = 'any') -> np.ndarray:
         f'Invalid image shape {img_arr.shape}. '
         'Expected (H, W) for grayscale or (H, W, 3) for color.'
     )
+
+
+@beartype
+def validate_imgbatch(
+    batch: np.ndarray | Sequence[np.ndarray], mode: Mode = 'any'
+) -> np.ndarray:
+    """Validate a stack of images once, instead of image by image.
+
+    A stack is a single array with one image per entry of its first axis. A
+    sequence of same-shaped images is stacked into one array (a copy).
+    The validation rules are:
+    - dtype: must be ``uint8``
+    - shape: ``(N, H, W)`` for grayscale or ``(N, H, W, 3)`` for color
+    - mode: enforces ``"gray"``, ``"color"``, or accepts both (``"any"``)
+
+    Note that a single ``(H, W, 3)`` color image has the shape of a grayscale
+    stack and is validated as such.
+
+    Args:
+        batch (np.ndarray | Sequence[np.ndarray]): Image stack, or sequence of
+            images with identical shape and dtype.
+        mode (Mode, optional): Validation mode. Can be ``"gray"``, ``"color"``,
+            or ``"any"``. Defaults to ``"any"``.
+
+    Returns:
+        np.ndarray: The stack itself if it is a valid array, otherwise a new
+            array stacking the images of the sequence.
+
+    Raises:
+        TypeError: If the dtype is not ``uint8``.
+        ValueError: If the sequence is empty, if its images differ in shape, or
+            if the stack shape does not match the specified mode.
+    """
+    if not isinstance(batch, np.ndarray):
+        if not batch:
+            raise ValueError('Expected at least one image in the batch.')
+        shapes = {img.shape for img in batch}
+        if len(shapes) > 1:
+            raise ValueError(
+                f'Expected images with the same shape, got {sorted(shapes)}.'
+            )
+        validate_imgarray(batch[0], mode=mode)
+        batch = np.stack(batch)
+
+    if batch.ndim < GREY_SCALE_DIM + 1:
+        raise ValueError(
+            f'Invalid batch shape {batch.shape}. '
+            'Expected (N, H, W) for grayscale or (N, H, W, 3) for color.'
+        )
+    if not len(batch):
+        raise ValueError('Expected at least one image in the batch.')
+
+    validate_imgarray(batch[0], mode=mode)
+    return batch
@@ -7,6 +7,30 @@ RGB_CHANNELS: Final[int] = 3
 RGB_DIM: Final[int] = 3
 GREY_SCALE_DIM: Final[int] = 2
 GREY_SCALE_CHANNEL_DIM: Final[int] = 1
+# cv2.calcHist counts in float32, which is exact only up to 2**24
+HIST_BAND_PIXELS: Final[int] = 1 << 23
+DEFAULT_TILE_BYTES: Final[int] = 64 << 20
+DEFAULT_HISTORY_BYTES: Final[int] = 256 << 20
+DEFAULT_HISTORY_STEPS: Final[int] = 1000
+DEFAULT_IMAGE_CACHE_BYTES: Final[int] = 512 << 20
+# Below this many pixels, splitting an image across threads costs more than it saves
+DEFAULT_PARALLEL_PIXELS: Final[int] = 1 << 21
+# How often aio checks whether a process pool has started a call
+START_POLL_SECONDS: Final[float] = 0.01
+# File extensions that OpenCV decodes, searched for in directories by the CLI
+IMAGE_EXTENSIONS: Final[frozenset[str]] = frozenset({
+    '.bmp',
+    '.jpeg',
+    '.jpg',
+    '.png',
+    '.tif',
+    '.tiff',
+    '.webp',
+})
 
 # Types
 Mode = Literal['gray', 'color', 'any']
+ValidationLevel = Literal['full', 'boundary', 'off']
+Scale = Literal[1, 2, 4, 8]
+Layout = Literal['any', 'rows', 'contiguous']
+LumaSpace = Literal['ycrcb', 'lab']
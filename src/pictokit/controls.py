@@ -1,25 +1,47 @@
+import os
 from typing import Literal
 
 import cv2
 import numpy as np
 from beartype import beartype
 
-from pictokit.common import validate_imgarray
-from pictokit.constants import GREY_SCALE_DIM, PIXEL_MAX
+import pictokit.element_wise as elw
+from pictokit import metrics
+from pictokit.cache import ImageCache, default_cache
+from pictokit.common import as_contiguous, validate_imgarray
+from pictokit.constants import (
+    GREY_SCALE_DIM,
+    HIST_BAND_PIXELS,
+    PIXEL_MAX,
+    RGB_DIM,
+    Layout,
+    LumaSpace,
+    Mode,
+    Scale,
+)
+from pictokit.parallel import band_count, run_bands
 
 
+@metrics.instrument('load_image')
 @beartype
 def load_image(
     path: str | None = None,
     img_arr: np.ndarray | None = None,
     mode: Literal['gray', 'color', 'any'] = 'any',
     auto_convert: bool = True,
+    cache: bool | ImageCache = False,
+    scale: Scale = 1,
+    data: bytes | bytearray | memoryview | None = None,
+    shape: tuple[int, ...] | None = None,
+    layout: Layout = 'any',
 ) -> np.ndarray:
-    """Load and validate an image from either a file path or a NumPy array.
+    """Load and validate an image from a file path, a NumPy array or a buffer.
 
-    Exactly one of `path` or `img_arr` must be provided.
+    Exactly one of `path`, `img_arr` or `data` must be provided.
     If `path` is given, the image will be read with OpenCV (`cv2.imread`).
     If `img_arr` is given, it will be validated directly.
+    If `data` is given, it is decoded in place with `cv2.imdecode` or, with
+    `shape`, wrapped as raw pixels without copying.
 
     Args:
         path (str | None): Path to the image file. Mutually exclusive with `img_arr`.
@@ -32,6 +54,26 @@ def load_image(
             Defaults to "any".
         auto_convert (bool): If True, automatically converts grayscale to BGR when
             `mode="color"`. Defaults to True.
+        cache (bool | ImageCache): Decoded-image cache used with `path`. True
+            uses the shared `pictokit.cache.default_cache`. Cached images are
+            returned read-only. Defaults to False (always decode).
+        scale (Scale): Downscaling factor: 1, 2, 4 or 8. With `path` and mode
+            "gray" or "color", the file is decoded directly at the reduced size
+            (`cv2.IMREAD_REDUCED_*`), which is much cheaper for JPEG. Otherwise
+            the full image is resized with area interpolation. The reduced size
+            is about ``1 / scale`` of the original, rounded as the codec does.
+            Defaults to 1.
+        data (bytes | bytearray | memoryview | None): Encoded image file (JPEG,
+            PNG, ...) held in memory. Any other buffer-protocol object can be
+            passed as a `memoryview`. Mutually exclusive with `path` and
+            `img_arr`.
+        shape (tuple[int, ...] | None): With `data`, the shape of raw ``uint8``
+            pixels: `data` is then wrapped as an array of that shape without
+            copying, instead of being decoded. Defaults to None.
+        layout (Layout): Memory layout an `img_arr` or raw `data` must have, so
+            that no later step copies it: ``"rows"``, ``"contiguous"`` or
+            ``"any"``. Decoded images are always contiguous. Defaults to
+            ``"any"``.
 
     Returns:
         np.ndarray: A valid NumPy array (dtype `uint8`).
@@ -39,33 +81,47 @@ def load_image(
             - For color: `(H, W, 3)` (BGR format, OpenCV standard).
 
     Raises:
-        ValueError: If neither or both `path` and `img_arr` are provided.
+        ValueError: If not exactly one of `path`, `img_arr` and `data` is
+            provided, if `data` cannot be decoded, or if its size does not
+            match `shape`.
         FileNotFoundError: If the file at `path` cannot be read.
         TypeError: If `img_arr` is not a NumPy array or has invalid dtype.
         ValueError: If the image shape does not match the expected mode.
 
     """
-    if (path is None) == (img_arr is None):
-        raise ValueError("Provide exactly one of 'path' or 'img_arr'.")
+    if sum(source is not None for source in (path, img_arr, data)) != 1:
+        raise ValueError("Provide exactly one of 'path', 'img_arr' or 'data'.")
+    if shape is not None and data is None:
+        raise ValueError("'shape' is only used with 'data'.")
 
     if path is not None:
-        if mode == 'gray':
-            flag = cv2.IMREAD_GRAYSCALE
-        elif mode == 'color':
-            flag = cv2.IMREAD_COLOR
-        else:
-            flag = cv2.IMREAD_UNCHANGED
-
-        img = cv2.imread(path, flag)
-        if img is None:
-            raise FileNotFoundError(f'Could not read image from path: {path}')
-
-        if mode == 'color' and img.ndim == GREY_SCALE_DIM and auto_convert:
-            img = cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
+        if cache is False:
+            return _read_image(path, mode, auto_convert, scale)
+        if cache is True:
+            cache = default_cache
+        return cache.get(
+            path,
+            mode,
+            auto_convert,
+            lambda: _read_image(path, mode, auto_convert, scale),
+            scale=scale,
+        )
 
-        return validate_imgarray(img, mode=mode)
+    if data is not None:
+        # A read-only view of the caller's memory, not a copy
+        buffer = np.frombuffer(data, dtype=np.uint8)
+        if shape is None:
+            return _read_image(buffer, mode, auto_convert, scale)
+        if buffer.size != np.prod(shape):
+            raise ValueError(
+                f'data holds {buffer.size} bytes, but shape {shape} needs '
+                f'{np.prod(shape)}.'
+            )
+        img_arr = buffer.reshape(shape)
 
-    img = validate_imgarray(img_arr, mode='any')  # aceita tanto gray quanto color
+    img = validate_imgarray(
+        img_arr, mode='any', layout=layout
+    )  # aceita tanto gray quanto color
 
     if mode == 'color':
         if img.ndim == GREY_SCALE_DIM and auto_convert:
@@ -76,13 +132,540 @@ def load_image(
     elif mode == 'gray':
         img = validate_imgarray(img, mode='gray')
 
-    return img
+    return _downscale(img, scale)
+
+
+_REDUCED_FLAGS = {
+    ('gray', 2): cv2.IMREAD_REDUCED_GRAYSCALE_2,
+    ('gray', 4): cv2.IMREAD_REDUCED_GRAYSCALE_4,
+    ('gray', 8): cv2.IMREAD_REDUCED_GRAYSCALE_8,
+    ('color', 2): cv2.IMREAD_REDUCED_COLOR_2,
+    ('color', 4): cv2.IMREAD_REDUCED_COLOR_4,
+    ('color', 8): cv2.IMREAD_REDUCED_COLOR_8,
+}
+
+
+def _read_image(
+    source: str | np.ndarray, mode: Mode, auto_convert: bool, scale: int
+) -> np.ndarray:
+    """Decode a file, or an encoded buffer, with the flags for `mode` and `scale`."""
+    if (mode, scale) in _REDUCED_FLAGS:
+        flag = _REDUCED_FLAGS[mode, scale]
+        scale = 1
+    elif mode == 'gray':
+        flag = cv2.IMREAD_GRAYSCALE
+    elif mode == 'color':
+        flag = cv2.IMREAD_COLOR
+    else:
+        # The reduced flags force a channel layout, so "any" decodes in full
+        flag = cv2.IMREAD_UNCHANGED
+
+    if isinstance(source, str):
+        img = cv2.imread(source, flag)
+        if img is None:
+            raise FileNotFoundError(f'Could not read image from path: {source}')
+    else:
+        img = cv2.imdecode(source, flag) if source.size else None
+        if img is None:
+            raise ValueError('Could not decode image data.')
+
+    if mode == 'color' and img.ndim == GREY_SCALE_DIM and auto_convert:
+        img = cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
+
+    return _downscale(validate_imgarray(img, mode=mode), scale)
+
+
+def _downscale(img: np.ndarray, scale: int) -> np.ndarray:
+    if scale == 1:
+        return img
+    height, width = img.shape[:2]
+    size = (-(-width // scale), -(-height // scale))
+    return cv2.resize(img, size, interpolation=cv2.INTER_AREA)
+
+
+@beartype
+def save_image(
+    path: str,
+    img: np.ndarray,
+    quality: int | None = None,
+    compression: int | None = None,
+) -> None:
+    """Encode an image and write it to a file.
+
+    The format is chosen from the file extension.
+
+    Args:
+        path (str): Destination path, e.g. ``"out.jpg"`` or ``"out.png"``.
+        img (np.ndarray): Image with shape ``(H, W)`` or ``(H, W, 3)``.
+        quality (int | None): JPEG or WebP quality, from 0 (smallest) to 100
+            (best). Defaults to None, the encoder default.
+        compression (int | None): PNG compression level, from 0 (fastest) to 9
+            (smallest). Defaults to None, the encoder default.
+
+    Returns:
+        None
+
+    Raises:
+        TypeError: If `img` does not have dtype ``uint8``.
+        ValueError: If `img` has an invalid shape, if the extension has no
+            encoder, or if an option is out of range or does not apply to it.
+        OSError: If the file cannot be written.
+    """
+    img = validate_imgarray(img)
+    params = _encode_params(os.path.splitext(path)[1], quality, compression)
+    try:
+        written = cv2.imwrite(path, img, params)
+    except cv2.error as e:
+        raise ValueError(f'Cannot encode an image as {path!r}: {e}') from e
+    if not written:
+        raise OSError(f'Could not write image to path: {path}')
 
 
 @beartype
-def calculate_histogram(img: np.ndarray, bins: int = PIXEL_MAX + 1) -> np.ndarray:
-    h = np.zeros(bins, dtype=int)
-    for px in range(bins):
-        h[px] = len(img[img == px])
+def encode_image(
+    img: np.ndarray,
+    ext: str = '.png',
+    quality: int | None = None,
+    compression: int | None = None,
+) -> bytes:
+    """Encode an image in memory.
+
+    Args:
+        img (np.ndarray): Image with shape ``(H, W)`` or ``(H, W, 3)``.
+        ext (str): Format extension, e.g. ``".jpg"``. Defaults to ``".png"``.
+        quality (int | None): JPEG or WebP quality, from 0 to 100. Defaults to
+            None, the encoder default.
+        compression (int | None): PNG compression level, from 0 to 9. Defaults
+            to None, the encoder default.
+
+    Returns:
+        bytes: The encoded file contents.
+
+    Raises:
+        TypeError: If `img` does not have dtype ``uint8``.
+        ValueError: If `img` has an invalid shape, if the extension has no
+            encoder, or if an option is out of range or does not apply to it.
+    """
+    img = validate_imgarray(img)
+    params = _encode_params(ext, quality, compression)
+    try:
+        ok, buffer = cv2.imencode(ext, img, params)
+    except cv2.error as e:
+        raise ValueError(f'Cannot encode an image as {ext!r}: {e}') from e
+    if not ok:
+        raise ValueError(f'Could not encode image as {ext!r}.')
+    return buffer.tobytes()
+
+
+_QUALITY_FLAGS = {
+    '.jpg': cv2.IMWRITE_JPEG_QUALITY,
+    '.jpeg': cv2.IMWRITE_JPEG_QUALITY,
+    '.webp': cv2.IMWRITE_WEBP_QUALITY,
+}
+
+
+def _encode_params(ext: str, quality: int | None, compression: int | None) -> list[int]:
+    ext = ext.lower()
+    params = []
+    if quality is not None:
+        if ext not in _QUALITY_FLAGS:
+            raise ValueError(f'quality applies to JPEG and WebP, not {ext!r}.')
+        if not (0 <= quality <= 100):  # noqa: PLR2004
+            raise ValueError(f'quality must be in the range [0, 100], got {quality}.')
+        params += [_QUALITY_FLAGS[ext], quality]
+    if compression is not None:
+        if ext != '.png':
+            raise ValueError(f'compression applies to PNG, not {ext!r}.')
+        if not (0 <= compression <= 9):  # noqa: PLR2004
+            raise ValueError(
+                f'compression must be in the range [0, 9], got {compression}.'
+            )
+        params += [cv2.IMWRITE_PNG_COMPRESSION, compression]
+    return params
+
+
+@metrics.instrument('calculate_histogram')
+@beartype
+def calculate_histogram(
+    img: np.ndarray,
+    bins: int = PIXEL_MAX + 1,
+    channels: bool = False,
+    mask: np.ndarray | None = None,
+    out: np.ndarray | None = None,
+    accumulate: bool = False,
+    threads: int | None = None,
+) -> np.ndarray:
+    """Count the occurrences of each intensity value of an image in one pass.
+
+    ``uint8`` images are counted with `cv2.calcHist`, in row bands small enough
+    to keep the counts exact. Other dtypes fall back to `np.bincount`. Values
+    outside ``[0, bins)`` are ignored.
+
+    Args:
+        img (np.ndarray): Image array. Expected shapes are ``(H, W)`` or
+            ``(H, W, C)``; flat arrays are also accepted.
+        bins (int): Number of intensity values to count, starting at 0.
+            Defaults to 256.
+        channels (bool): If True, returns one histogram per channel of an
+            ``(H, W, C)`` image instead of a single combined histogram.
+            Defaults to False.
+        mask (np.ndarray | None): Optional array with the spatial shape of `img`
+            (``(H, W)``). Only pixels where the mask is non-zero are counted.
+        out (np.ndarray | None): Optional integer array that receives the
+            result. It must have the shape of the returned histogram.
+        accumulate (bool): If True, counts are added to the values already in
+            `out` instead of overwriting them. Requires `out`. Defaults to False.
+        threads (int | None): Count an image with at least the pixel threshold
+            of `parallel.set_threads` in this many row bands on a thread pool,
+            then add up their histograms. Defaults to None, which uses
+            `parallel.set_threads`.
+
+    Returns:
+        np.ndarray: Histogram with dtype ``int64``, shape ``(bins,)``, or
+            ``(C, bins)`` when `channels` is True. When `out` is given, it is
+            the returned array.
+
+    Raises:
+        ValueError: If `bins` is not positive, if `channels` is requested for an
+            image without a channel axis, if `mask` or `out` have the wrong
+            shape, or if `accumulate` is used without `out`.
+    """
+    if bins < 1:
+        raise ValueError(f'bins must be greater than 0, got {bins}.')
+
+    if channels and img.ndim != RGB_DIM:
+        raise ValueError(
+            f'Per-channel histograms require an (H, W, C) image, got {img.shape}.'
+        )
+
+    spatial_shape = img.shape[:GREY_SCALE_DIM]
+    if mask is not None and mask.shape != spatial_shape:
+        raise ValueError(f'mask must have shape {spatial_shape}, got {mask.shape}.')
+
+    n_channels = img.shape[2] if img.ndim == RGB_DIM else 1
+    shape = (n_channels, bins) if channels else (bins,)
+    if out is None:
+        if accumulate:
+            raise ValueError("accumulate=True requires an 'out' array.")
+        out = np.zeros(shape, dtype=np.int64)
+    elif out.shape != shape:
+        raise ValueError(f'out must have shape {shape}, got {out.shape}.')
+    elif not accumulate:
+        out.fill(0)
+
+    if img.dtype == np.uint8:
+        # Converted once here rather than copied by OpenCV for every channel
+        img = as_contiguous(img, 'rows' if img.ndim > 1 else 'contiguous')
+
+    height = img.shape[0] if img.ndim else 1
+    bands = band_count(height, img.size // n_channels, threads) if img.ndim > 1 else 1
+    if bands == 1:
+        _count_channels(img, mask, out, channels)
+        return out
+
+    def count(rows: slice) -> np.ndarray:
+        hist = np.zeros_like(out)
+        _count_channels(img[rows], None if mask is None else mask[rows], hist, channels)
+        return hist
+
+    for hist in run_bands(count, height, bands):
+        out += hist
+    return out
+
+
+def _count_channels(
+    img: np.ndarray, mask: np.ndarray | None, out: np.ndarray, channels: bool
+) -> None:
+    bins = out.shape[-1]
+    if img.ndim == RGB_DIM and not channels and mask is None:
+        # Channels counted together: one pass over (H, W * C) rows, a view of
+        # images with contiguous rows
+        height, width, n_channels = img.shape
+        flat = img.reshape(height, width * n_channels)
+        out += _channel_histogram(flat, 0, bins, None)
+        return
+    n_channels = img.shape[2] if img.ndim == RGB_DIM else 1
+    for channel in range(n_channels):
+        target = out[channel] if channels else out
+        target += _channel_histogram(img, channel, bins, mask)
+
+
+def _channel_histogram(
+    img: np.ndarray, channel: int, bins: int, mask: np.ndarray | None
+) -> np.ndarray:
+    if img.dtype == np.uint8 and bins <= PIXEL_MAX + 1 and img.size:
+        if img.ndim < GREY_SCALE_DIM:
+            img = img.reshape(1, -1)
+            mask = None if mask is None else mask.reshape(1, -1)
+        if mask is not None and mask.dtype != np.uint8:
+            mask = (mask != 0).view(np.uint8)
+
+        hist = np.zeros(bins, dtype=np.int64)
+        rows = max(1, HIST_BAND_PIXELS // img.shape[1])
+        for start in range(0, img.shape[0], rows):
+            band_mask = None if mask is None else mask[start : start + rows]
+            hist += (
+                cv2.calcHist(
+                    [img[start : start + rows]], [channel], band_mask, [bins], [0, bins]
+                )
+                .astype(np.int64)
+                .ravel()
+            )
+        return hist
+
+    values = img[..., channel] if img.ndim == RGB_DIM else img
+    if mask is not None:
+        values = values[mask.astype(bool)]
+    values = values.ravel()
+    valid = (values >= 0) & (values < bins)
+    if not np.issubdtype(values.dtype, np.integer):
+        valid &= values == np.trunc(values)
+    return np.bincount(values[valid].astype(np.intp), minlength=bins)[:bins]
+
+
+@beartype
+def equalization_lut(hist: np.ndarray) -> np.ndarray:
+    """Build the histogram equalization lookup table from a histogram.
+
+    Uses the same cumulative distribution mapping as `cv2.equalizeHist`:
+    intensities are spread so that the cumulative histogram becomes linear.
+    Only the 256-entry histogram is read, so the cost does not depend on the
+    image size.
+
+    Args:
+        hist (np.ndarray): Histogram from `calculate_histogram`, with shape
+            ``(256,)`` or ``(C, 256)`` for per-channel histograms.
+
+    Returns:
+        np.ndarray: ``uint8`` lookup table with shape ``(256,)``, or
+            ``(256, C)`` for a per-channel histogram.
+
+    Raises:
+        ValueError: If `hist` does not have 256 bins.
+    """
+    if hist.shape[-1] != PIXEL_MAX + 1:
+        raise ValueError(f'hist must have {PIXEL_MAX + 1} bins, got {hist.shape}.')
+
+    hists = np.reshape(hist, (-1, PIXEL_MAX + 1))
+    cdf = np.cumsum(hists, axis=1)
+    first = np.argmax(hists > 0, axis=1)[:, np.newaxis]
+    cdf_min = np.take_along_axis(cdf, first, axis=1)
+    span = cdf[:, -1:] - cdf_min
+
+    scale = np.float32(PIXEL_MAX) / np.maximum(span, 1).astype(np.float32)
+    lut = np.rint((cdf - cdf_min).astype(np.float32) * scale)
+    # Images with a single intensity are left unchanged, as in OpenCV
+    lut = np.where(span > 0, lut, np.arange(PIXEL_MAX + 1))
+    lut = np.clip(lut, 0, PIXEL_MAX).astype(np.uint8)
+
+    return lut[0] if hist.ndim == 1 else lut.T.copy()
+
+
+@beartype
+def equalize_histogram(img: np.ndarray, luma: bool | LumaSpace = False) -> np.ndarray:
+    """Equalize the histogram of an image.
+
+    Color images are equalized channel by channel, with one ``(256, 3)``
+    lookup table applied in a single pass. With `luma`, only the brightness
+    is equalized, which keeps the hues.
+
+    Args:
+        img (np.ndarray): Image with shape ``(H, W)`` or ``(H, W, 3)``.
+        luma (bool | LumaSpace): Equalize only the luma plane of a color image,
+            in ``"ycrcb"`` (True) or ``"lab"``. Defaults to False.
+
+    Returns:
+        np.ndarray: New equalized ``uint8`` image.
+
+    Raises:
+        TypeError: If `img` does not have dtype ``uint8``.
+        ValueError: If `img` has an invalid shape, or if `luma` is used with a
+            grayscale image.
+    """
+    img = validate_imgarray(img)
+    if luma:
+        return elw._luma_transform(
+            img,
+            lambda converted: equalization_lut(_luma_histogram(converted)),
+            elw._luma_space(luma),
+        )
+    hist = calculate_histogram(img, channels=img.ndim == RGB_DIM)
+    return elw.apply_lut(img, equalization_lut(hist))
+
+
+@beartype
+def percentile_limits(
+    hist: np.ndarray, percentiles: tuple[int | float, int | float] = (1.0, 99.0)
+) -> np.ndarray:
+    """Find the intensities at two percentiles of a histogram.
+
+    Reads only the cumulative histogram, so finding contrast limits costs
+    O(bins) once the histogram is known instead of another pass over the
+    pixels. The low limit is the first intensity with more than `low`
+    percent of the pixels at or below it, the high limit the first with at
+    least `high` percent: ``(0, 100)`` gives the minimum and the maximum.
+
+    Args:
+        hist (np.ndarray): Histogram with shape ``(bins,)`` or ``(C, bins)``.
+        percentiles (tuple[float, float]): Low and high percentiles, in
+            [0, 100]. Defaults to ``(1.0, 99.0)``.
+
+    Returns:
+        np.ndarray: ``int64`` array with the low and high intensities, with
+            shape ``(2,)``, or ``(C, 2)`` for a per-channel histogram.
+
+    Raises:
+        ValueError: If the percentiles are not ordered values in [0, 100], or
+            if the histogram is empty.
+    """
+    low, high = percentiles
+    if not (0 <= low <= high <= 100):  # noqa: PLR2004
+        raise ValueError(
+            f'percentiles must satisfy 0 <= low <= high <= 100, got {percentiles}.'
+        )
+
+    cdf = np.cumsum(np.atleast_2d(hist), axis=1)
+    total = cdf[:, -1]
+    if not total.all():
+        raise ValueError('Cannot find percentiles of an empty histogram.')
+
+    limits = np.array([
+        [
+            np.searchsorted(channel, low / 100 * n, side='right'),
+            np.searchsorted(channel, high / 100 * n, side='left'),
+        ]
+        for channel, n in zip(cdf, total)
+    ])
+    limits = np.minimum(limits, cdf.shape[1] - 1)
+    return limits[0] if hist.ndim == 1 else limits
+
+
+@beartype
+def auto_contrast_lut(
+    hist: np.ndarray, percentiles: tuple[int | float, int | float] = (1.0, 99.0)
+) -> np.ndarray:
+    """Build a contrast expansion lookup table with limits from a histogram.
+
+    The limits are found with `percentile_limits`. A channel whose limits
+    coincide, such as a constant image, is left unchanged.
+
+    Args:
+        hist (np.ndarray): Histogram from `calculate_histogram`, with shape
+            ``(256,)`` or ``(C, 256)`` for per-channel histograms.
+        percentiles (tuple[float, float]): Low and high percentiles used as
+            limits. Defaults to ``(1.0, 99.0)``.
+
+    Returns:
+        np.ndarray: ``uint8`` lookup table with shape ``(256,)``, or
+            ``(256, C)`` for a per-channel histogram.
+
+    Raises:
+        ValueError: If the percentiles are invalid or the histogram is empty.
+    """
+    limits = np.atleast_2d(percentile_limits(hist, percentiles))
+    luts = [
+        elw.point_lut(
+            elw.pixel_expansion, {'low_limit': int(low), 'high_limit': int(high)}
+        )
+        if low < high
+        else np.arange(PIXEL_MAX + 1, dtype=np.uint8)
+        for low, high in limits
+    ]
+    return luts[0] if hist.ndim == 1 else np.stack(luts, axis=1)
+
+
+@beartype
+def auto_contrast(
+    img: np.ndarray,
+    percentiles: tuple[int | float, int | float] = (1.0, 99.0),
+    channels: bool = False,
+    luma: bool | LumaSpace = False,
+) -> np.ndarray:
+    """Expand the contrast of an image between two percentiles of its histogram.
+
+    The image is read once for the histogram and once for the lookup table.
+    With `luma`, the limits come from and apply to the brightness only.
+
+    Args:
+        img (np.ndarray): Image with shape ``(H, W)`` or ``(H, W, 3)``.
+        percentiles (tuple[float, float]): Low and high percentiles used as
+            limits. Defaults to ``(1.0, 99.0)``.
+        channels (bool): If True, each channel of a color image gets its own
+            limits. Otherwise the limits come from all channels together.
+            Defaults to False.
+        luma (bool | LumaSpace): Expand only the luma plane of a color image,
+            in ``"ycrcb"`` (True) or ``"lab"``. Defaults to False.
+
+    Returns:
+        np.ndarray: New contrast expanded ``uint8`` image.
+
+    Raises:
+        TypeError: If `img` does not have dtype ``uint8``.
+        ValueError: If `img` has an invalid shape, if `channels` is requested
+            for a grayscale image or together with `luma`, or if the
+            percentiles are invalid.
+    """
+    img = validate_imgarray(img)
+    if luma:
+        if channels:
+            raise ValueError('channels and luma cannot be combined.')
+        return elw._luma_transform(
+            img,
+            lambda converted: auto_contrast_lut(
+                _luma_histogram(converted), percentiles
+            ),
+            elw._luma_space(luma),
+        )
+    hist = calculate_histogram(img, channels=channels)
+    return elw.apply_lut(img, auto_contrast_lut(hist, percentiles))
+
+
+def _luma_histogram(converted: np.ndarray) -> np.ndarray:
+    return _channel_histogram(converted, 0, PIXEL_MAX + 1, None)
+
+
+@beartype
+def equalize_adaptive(
+    img: np.ndarray,
+    tiles: tuple[int, int] = (8, 8),
+    clip_limit: float | None = 2.0,
+) -> np.ndarray:
+    """Contrast Limited Adaptive Histogram Equalization (CLAHE).
+
+    The image is divided into a grid of tiles and each tile gets its own
+    equalization lookup table. Each pixel is mapped through the tables of
+    the four nearest tile centers and the results are blended bilinearly,
+    which avoids visible seams. This is `cv2.createCLAHE`, applied to each
+    channel of color images.
+
+    Args:
+        img (np.ndarray): Image with shape ``(H, W)`` or ``(H, W, 3)``.
+        tiles (tuple[int, int]): Number of tiles along the rows and the
+            columns. Defaults to ``(8, 8)``.
+        clip_limit (float | None): Contrast limit. Tile histogram bins above
+            ``clip_limit * tile_pixels / 256`` are clipped and the excess is
+            spread over all bins. None disables clipping. Defaults to 2.0.
+
+    Returns:
+        np.ndarray: New equalized ``uint8`` image.
+
+    Raises:
+        TypeError: If `img` does not have dtype ``uint8``.
+        ValueError: If `img` has an invalid shape, if `tiles` does not fit in
+            the image, or if `clip_limit` is not positive.
+    """
+    img = validate_imgarray(img)
+    height, width = img.shape[:2]
+    tiles_y, tiles_x = tiles
+    if not (0 < tiles_y <= height and 0 < tiles_x <= width):
+        raise ValueError(
+            f'tiles must be positive and fit in the image {img.shape}, got {tiles}.'
+        )
+    if clip_limit is not None and clip_limit <= 0:
+        raise ValueError(f'clip_limit must be greater than 0, got {clip_limit}.')
 
-    return h
+    # OpenCV takes the grid as (columns, rows) and disables clipping with 0
+    clahe = cv2.createCLAHE(clipLimit=clip_limit or 0, tileGridSize=(tiles_x, tiles_y))
+    if img.ndim == GREY_SCALE_DIM:
+        return clahe.apply(img)
+    return cv2.merge([clahe.apply(plane) for plane in cv2.split(img)])
@@ -0,0 +1,289 @@
+import glob
+import itertools
+import os
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from functools import partial
+from typing import Literal
+
+import numpy as np
+from beartype import beartype
+
+from pictokit.constants import PIXEL_MAX, RGB_DIM, Mode
+from pictokit.controls import calculate_histogram, load_image
+from pictokit.runner import _pool, _run
+
+Source = str | np.ndarray
+
+
+@dataclass(frozen=True, eq=False)
+class DatasetHistogram:
+    """Intensity histogram of a whole dataset, merged image by image.
+
+    Attributes:
+        hist (np.ndarray): ``int64`` counts with shape ``(C, 256)``: one row per
+            channel, a single row for grayscale images.
+        images (int): Number of images counted.
+        skipped (int): Number of sources that could not be read.
+    """
+
+    hist: np.ndarray
+    images: int = 0
+    skipped: int = 0
+
+    @property
+    def consumed(self) -> int:
+        """Number of sources read so far, counted or skipped."""
+        return self.images + self.skipped
+
+    @property
+    def pixels(self) -> int:
+        """Number of pixels counted, per channel."""
+        return int(self.hist[0].sum())
+
+    def histogram(self, channels: bool = False) -> np.ndarray:
+        """Return the histogram of all channels together, or one per channel.
+
+        Args:
+            channels (bool): If True, return the ``(C, 256)`` histogram.
+                Defaults to False.
+
+        Returns:
+            np.ndarray: ``int64`` histogram with shape ``(256,)`` or ``(C, 256)``.
+        """
+        return self.hist.copy() if channels else self.hist.sum(axis=0)
+
+    def mean(self, channels: bool = False) -> float | np.ndarray:
+        """Mean intensity, computed from the histogram.
+
+        Args:
+            channels (bool): If True, return one mean per channel. Defaults to
+                False.
+
+        Returns:
+            float | np.ndarray: The mean, or a ``(C,)`` array of means.
+
+        Raises:
+            ValueError: If no pixel was counted.
+        """
+        hist = self.histogram(channels)
+        total = hist.sum(axis=-1)
+        if not np.all(total):
+            raise ValueError('Cannot compute statistics of an empty histogram.')
+        means = hist @ np.arange(PIXEL_MAX + 1) / total
+        return means if channels else float(means)
+
+    def percentile(
+        self, q: int | float | Iterable[int | float], channels: bool = False
+    ) -> np.ndarray:
+        """Intensities at percentiles of the histogram.
+
+        The intensity at percentile ``q`` is the smallest one with at least
+        ``q`` percent of the pixels at or below it, as the ``"inverted_cdf"``
+        method of `np.percentile` on the pixels themselves.
+
+        Args:
+            q (int | float | Iterable[int | float]): Percentiles in [0, 100].
+            channels (bool): If True, find them for each channel. Defaults to
+                False.
+
+        Returns:
+            np.ndarray: ``int64`` intensities with the shape of `q`, with a
+                leading channel axis if `channels` is True.
+
+        Raises:
+            ValueError: If a percentile is outside [0, 100] or no pixel was
+                counted.
+        """
+        q = np.asarray(list(q) if isinstance(q, Iterable) else q, dtype=float)
+        if np.any((q < 0) | (q > 100)):  # noqa: PLR2004
+            raise ValueError(f'Percentiles must be in [0, 100], got {q}.')
+        cdf = np.cumsum(np.atleast_2d(self.histogram(channels)), axis=1)
+        if not cdf[:, -1].all():
+            raise ValueError('Cannot compute statistics of an empty histogram.')
+
+        # At least one pixel, so q == 0 gives the minimum as in NumPy
+        values = np.array([
+            np.searchsorted(c, np.maximum(q / 100 * c[-1], 1), side='left') for c in cdf
+        ])
+        return values if channels else values[0]
+
+    def merge(self, other: 'DatasetHistogram') -> 'DatasetHistogram':
+        """Combine with the histogram of another part of the dataset.
+
+        Args:
+            other (DatasetHistogram): Histogram with the same channels.
+
+        Returns:
+            DatasetHistogram: Counts of both.
+
+        Raises:
+            ValueError: If the channels differ.
+        """
+        if other.hist.shape != self.hist.shape:
+            raise ValueError(
+                f'Cannot merge histograms with shapes {self.hist.shape} and '
+                f'{other.hist.shape}.'
+            )
+        return DatasetHistogram(
+            self.hist + other.hist,
+            self.images + other.images,
+            self.skipped + other.skipped,
+        )
+
+    def save(self, path: str) -> None:
+        """Write the histogram to a ``.npz`` file, atomically.
+
+        A crash while saving leaves the previous file intact.
+
+        Args:
+            path (str): Destination path.
+        """
+        tmp = f'{path}.tmp'
+        with open(tmp, 'wb') as f:
+            np.savez(f, hist=self.hist, counts=[self.images, self.skipped])
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'DatasetHistogram':
+        """Read a histogram written by `save`.
+
+        Args:
+            path (str): Path of the file.
+
+        Returns:
+            DatasetHistogram: The stored histogram.
+        """
+        with np.load(path) as data:
+            images, skipped = (int(n) for n in data['counts'])
+            return cls(data['hist'], images, skipped)
+
+
+@beartype
+def aggregate_histograms(
+    sources: str | Iterable[str] | Iterable[np.ndarray],
+    mode: Mode = 'any',
+    workers: int | None = None,
+    executor: Literal['thread', 'process'] | None = None,
+    checkpoint: str | None = None,
+    checkpoint_every: int = 1000,
+    skip_errors: bool = False,
+) -> DatasetHistogram:
+    """Merge the intensity histograms of every image of a dataset.
+
+    Images are decoded and counted in a pool of workers, which send back only
+    their ``(C, 256)`` histograms; these are added up as they arrive. Sources
+    are read lazily and at most twice `workers` images are pending, so memory
+    does not grow with the dataset.
+
+    With `checkpoint`, the merged histogram and the number of sources read
+    are saved every `checkpoint_every` images and at the end. A later call
+    with the same checkpoint and the same sources, in the same order, skips
+    the sources already counted and resumes from there.
+
+    Args:
+        sources (str | Iterable[str] | Iterable[np.ndarray]): Glob pattern
+            (``**`` is supported), image paths or image arrays.
+        mode (Mode): Mode passed to `load_image`. Every image must end up
+            with the same number of channels; use ``"gray"`` or ``"color"``
+            for datasets that mix both. Defaults to ``"any"``.
+        workers (int | None): Number of workers. Defaults to `os.cpu_count()`.
+        executor (Literal["thread", "process"] | None): Kind of worker pool.
+            Defaults to None: processes for paths, threads for arrays, which
+            would otherwise be copied to the workers.
+        checkpoint (str | None): ``.npz`` file used to save and resume
+            progress. Defaults to None.
+        checkpoint_every (int): Images between checkpoints. Defaults to 1000.
+        skip_errors (bool): If True, sources that cannot be read are counted
+            in `DatasetHistogram.skipped` instead of stopping the run. Defaults
+            to False.
+
+    Returns:
+        DatasetHistogram: Merged histogram and counts, including those of a
+            resumed checkpoint.
+
+    Raises:
+        ValueError: If `workers` or `checkpoint_every` are not positive, if
+            the images do not all have the same number of channels, or if an
+            array is not a valid image.
+        FileNotFoundError: If an image cannot be read and `skip_errors` is
+            False.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1 or checkpoint_every < 1:
+        raise ValueError(
+            'workers and checkpoint_every must be greater than 0, '
+            f'got workers={workers}, checkpoint_every={checkpoint_every}.'
+        )
+    if isinstance(sources, str):
+        sources = sorted(glob.glob(sources, recursive=True))
+
+    hist, images, skipped = _resume(checkpoint)
+    # Sources counted before the checkpoint are skipped without being read
+    items: Iterator[Source] = itertools.islice(sources, images + skipped, None)
+
+    def snapshot() -> DatasetHistogram:
+        counts = np.zeros((1, PIXEL_MAX + 1), np.int64) if hist is None else hist
+        return DatasetHistogram(counts.copy(), images, skipped)
+
+    first = next(items, None)
+    if executor is None:
+        executor = 'process' if isinstance(first, str) else 'thread'
+    if first is not None:
+        items = itertools.chain([first], items)
+
+    job = partial(_image_histogram, mode=mode)
+    pool = _pool(executor, workers)
+    results = _run(pool, items, job, 2 * workers, ordered=True)
+    try:
+        for n, (_, part) in enumerate(results, 1):
+            if isinstance(part, Exception):
+                if not skip_errors:
+                    raise part
+                skipped += 1
+            else:
+                hist = _add(hist, part)
+                images += 1
+
+            if checkpoint is not None and n % checkpoint_every == 0:
+                snapshot().save(checkpoint)
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+        # Results arrive in input order, so the counts always describe a
+        # prefix of the sources, even after an error or an interruption
+        if checkpoint is not None:
+            snapshot().save(checkpoint)
+    return snapshot()
+
+
+def _resume(checkpoint: str | None) -> tuple[np.ndarray | None, int, int]:
+    if checkpoint is None or not os.path.exists(checkpoint):
+        return None, 0, 0
+    resumed = DatasetHistogram.load(checkpoint)
+    return resumed.hist if resumed.images else None, resumed.images, resumed.skipped
+
+
+def _add(hist: np.ndarray | None, part: np.ndarray) -> np.ndarray:
+    if hist is None:
+        return part
+    if part.shape != hist.shape:
+        raise ValueError(
+            f'Image with {len(part)} channel(s) in a dataset with {len(hist)}; '
+            "use mode='gray' or mode='color'."
+        )
+    hist += part
+    return hist
+
+
+def _image_histogram(source: Source, mode: Mode) -> np.ndarray | Exception:
+    """Per-channel histogram of one image, or the error that prevented it."""
+    try:
+        if isinstance(source, str):
+            img = load_image(path=source, mode=mode)
+        else:
+            img = load_image(img_arr=source, mode=mode)
+    except (OSError, ValueError, TypeError) as error:
+        return error
+    hist = calculate_histogram(img, channels=img.ndim == RGB_DIM, threads=1)
+    return np.reshape(hist, (-1, PIXEL_MAX + 1))
@@ -1,7 +1,28 @@
+from collections.abc import Sequence
+from functools import lru_cache
+from typing import Callable
+
+import cv2
 import numpy as np
 from beartype import beartype
 
-from pictokit.constants import PIXEL_MAX, PIXEL_MIN
+from pictokit.common import _has_layout, as_contiguous, get_validation_level
+from pictokit.constants import (
+    GREY_SCALE_DIM,
+    PIXEL_MAX,
+    PIXEL_MIN,
+    RGB_CHANNELS,
+    RGB_DIM,
+    LumaSpace,
+    ValidationLevel,
+)
+from pictokit.parallel import band_count, run_bands
+
+# Forward and inverse conversions; the luma plane is channel 0 in both spaces
+_LUMA_CONVERSIONS = {
+    'ycrcb': (cv2.COLOR_BGR2YCrCb, cv2.COLOR_YCrCb2BGR),
+    'lab': (cv2.COLOR_BGR2Lab, cv2.COLOR_Lab2BGR),
+}
 
 
 @beartype
@@ -105,3 +126,404 @@ def pixel_digital_negative(pixel: np.uint8 | int) -> np.uint8:
         raise ValueError(f'pixel must be in the range [0, 255], got {pixel}.')
 
     return np.uint8(PIXEL_MAX - pixel)
+
+
+@beartype
+def build_lut(func: Callable, args: dict) -> np.ndarray:
+    """Build a lookup table by evaluating a point operation over every intensity.
+
+    All operations in this module are pure ``uint8 -> uint8`` functions, so
+    evaluating them once for each of the 256 possible intensities fully
+    describes the transformation.
+
+    Args:
+        func (Callable): Scalar point operation, such as `pixel_expansion`. It
+            must accept the pixel value through the ``pixel`` keyword.
+        args (dict): Extra keyword arguments forwarded to `func`. A ``pixel``
+            entry, if present, is ignored.
+
+    Returns:
+        np.ndarray: Lookup table with shape ``(256,)`` and dtype ``uint8``.
+
+    Raises:
+        ValueError: If `func` rejects the given arguments.
+    """
+    params = {name: value for name, value in args.items() if name != 'pixel'}
+    return np.array(
+        [func(pixel=pixel, **params) for pixel in range(PIXEL_MAX + 1)],
+        dtype=np.uint8,
+    )
+
+
+@beartype
+def cached_lut(func: Callable, args: dict) -> np.ndarray:
+    """Return the lookup table of `build_lut`, memoized per function and arguments.
+
+    Repeated calls with the same parameters, as in a worker processing many
+    frames, reuse the same table instead of evaluating `func` 256 times again.
+
+    Args:
+        func (Callable): Scalar point operation, as in `build_lut`.
+        args (dict): Keyword arguments of `func`, as in `build_lut`. Values must
+            be hashable.
+
+    Returns:
+        np.ndarray: Read-only lookup table with shape ``(256,)``.
+
+    Raises:
+        ValueError: If `func` rejects the given arguments.
+    """
+    items = tuple(sorted((k, v) for k, v in args.items() if k != 'pixel'))
+    return _cached_lut(func, items)
+
+
+@lru_cache(maxsize=1024)
+def _cached_lut(func: Callable, items: tuple) -> np.ndarray:
+    lut = build_lut(func=func, args=dict(items))
+    lut.setflags(write=False)
+    return lut
+
+
+@beartype
+def apply_lut(
+    img: np.ndarray,
+    lut: np.ndarray,
+    out: np.ndarray | None = None,
+    threads: int | None = None,
+) -> np.ndarray:
+    """Apply a lookup table to every pixel of an image in a single pass.
+
+    The mapping runs in `cv2.LUT`. Arrays that OpenCV cannot take as an image,
+    such as stacks of images, are flattened first.
+
+    Args:
+        img (np.ndarray): Image array with dtype ``uint8``.
+        lut (np.ndarray): Lookup table with dtype ``uint8``, either ``(256,)``
+            for all channels or ``(256, C)`` with one column per channel of an
+            image whose last axis has C entries.
+        out (np.ndarray | None): Optional preallocated ``uint8`` array with the
+            shape of `img` that receives the result, so no new array is
+            allocated. It may be `img` itself. Defaults to None.
+        threads (int | None): Split an image with at least the pixel threshold
+            of `parallel.set_threads` into this many row bands, mapped on a
+            thread pool. Defaults to None, which uses `parallel.set_threads`.
+
+    Returns:
+        np.ndarray: Array with the same shape as `img` and dtype ``uint8``;
+            `out` when it is given.
+
+    Raises:
+        ValueError: If `out` does not have the shape of `img`, or if a
+            per-channel `lut` does not match the channels of `img`.
+        TypeError: If `out` does not have dtype ``uint8``.
+    """
+    return _apply_lut(img, lut, out, threads)
+
+
+def _apply_lut(
+    img: np.ndarray,
+    lut: np.ndarray,
+    out: np.ndarray | None = None,
+    threads: int | None = None,
+) -> np.ndarray:
+    if out is not None:
+        if out.shape != img.shape:
+            raise ValueError(f'out must have shape {img.shape}, got {out.shape}.')
+        if out.dtype != np.uint8:
+            raise TypeError(f'out must have dtype uint8, got {out.dtype}.')
+
+    if img.ndim in {GREY_SCALE_DIM, RGB_DIM}:
+        height, width = img.shape[:2]
+        bands = band_count(height, height * width, threads)
+        if bands > 1:
+            if out is None:
+                out = np.empty_like(img)
+            run_bands(
+                lambda rows: _apply_lut(img[rows], lut, out[rows], threads=1),
+                height,
+                bands,
+            )
+            return out
+
+    if lut.ndim > 1:
+        n_channels = lut.shape[1]
+        if img.ndim < RGB_DIM or img.shape[-1] != n_channels:
+            raise ValueError(
+                f'A lookup table with {n_channels} channels does not match an '
+                f'image with shape {img.shape}.'
+            )
+        shape = (-1, img.shape[-2], n_channels)
+        lut = np.reshape(lut, (1, PIXEL_MAX + 1, n_channels))
+        reshaped = img.ndim != RGB_DIM
+    else:
+        is_image = img.ndim == GREY_SCALE_DIM or (
+            img.ndim == RGB_DIM and img.shape[2] == RGB_CHANNELS
+        )
+        shape = img.shape if is_image else (len(img) if img.ndim else 1, -1)
+        reshaped = not is_image
+
+    # OpenCV takes images with contiguous rows, such as crops, as they are;
+    # anything that must be reshaped first has to be a single block.
+    layout = 'contiguous' if reshaped else 'rows'
+    if img.size == 0 or (out is not None and not _has_layout(out, layout)):
+        if lut.ndim == 1:
+            return np.take(lut, img, out=out, mode='clip')
+        if out is None:
+            out = np.empty_like(img)
+        out[...] = lut[0, img, np.arange(lut.shape[2])]
+        return out
+
+    img = as_contiguous(img, layout)
+    dst = None if out is None else np.reshape(out, shape)
+    result = cv2.LUT(np.reshape(img, shape), lut, dst=dst)
+    return np.reshape(result, img.shape) if out is None else out
+
+
+@beartype
+def compose_luts(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    """Compose two lookup tables into one that applies `first`, then `second`.
+
+    Args:
+        first (np.ndarray): Lookup table applied first, ``(256,)`` or
+            ``(256, C)``.
+        second (np.ndarray): Lookup table applied to the output of `first`,
+            ``(256,)`` or ``(256, C)``.
+
+    Returns:
+        np.ndarray: Lookup table equivalent to ``second[first[pixel]]``. It is
+            per-channel, ``(256, C)``, if either input is.
+
+    Raises:
+        ValueError: If both tables are per-channel with different channels.
+    """
+    if first.ndim == 1 and second.ndim == 1:
+        return np.take(second, first)
+
+    n_channels = {lut.shape[1] for lut in (first, second) if lut.ndim > 1}
+    if len(n_channels) > 1:
+        raise ValueError(
+            f'Cannot compose lookup tables with shapes {first.shape} and '
+            f'{second.shape}.'
+        )
+    shape = (PIXEL_MAX + 1, n_channels.pop())
+    first = np.broadcast_to(np.reshape(first, (PIXEL_MAX + 1, -1)), shape)
+    second = np.broadcast_to(np.reshape(second, (PIXEL_MAX + 1, -1)), shape)
+    return np.take_along_axis(second, first.astype(np.intp), axis=0)
+
+
+@beartype
+def point_lut(
+    func: Callable, args: dict, validation: ValidationLevel | None = None
+) -> np.ndarray:
+    """Build the lookup table of a point operation at a given validation level.
+
+    With ``"full"``, the table comes from `cached_lut`, so every pixel value
+    goes through the checked scalar function. With ``"boundary"`` or ``"off"``,
+    the operations of this module are computed by unchecked vectorized
+    kernels, with identical results. ``"boundary"`` checks the parameters once
+    beforehand.
+
+    Args:
+        func (Callable): Scalar point operation of this module. Other functions
+            are always evaluated as in ``"full"``.
+        args (dict): Keyword arguments of `func`, other than ``pixel``.
+        validation (ValidationLevel | None): Validation level. Defaults to None,
+            which uses `get_validation_level`.
+
+    Returns:
+        np.ndarray: Lookup table with shape ``(256,)`` and dtype ``uint8``.
+
+    Raises:
+        ValueError: If the parameters are invalid and `validation` is not
+            ``"off"``.
+    """
+    validation = validation or get_validation_level()
+    if validation == 'full' or func not in _KERNELS:
+        return cached_lut(func=func, args=args)
+
+    items = tuple(sorted((k, v) for k, v in args.items() if k != 'pixel'))
+    if validation == 'boundary':
+        check, _ = _KERNELS[func]
+        check(**dict(items))
+    return _kernel_lut(func, items)
+
+
+@beartype
+def channel_lut(
+    func: Callable,
+    args: dict,
+    n_channels: int | None,
+    validation: ValidationLevel | None = None,
+) -> np.ndarray:
+    """Build the lookup table of a point operation with per-channel parameters.
+
+    Each parameter is either a single value shared by all channels or a
+    sequence with one value per channel. The per-channel tables are stacked
+    into one ``(256, C)`` table, so the image is still mapped in a single
+    `apply_lut` pass.
+
+    Args:
+        func (Callable): Scalar point operation, as in `point_lut`.
+        args (dict): Keyword arguments of `func`; values are integers or
+            sequences of integers.
+        n_channels (int | None): Channels of the image the table is for, or
+            None for an image without a channel axis.
+        validation (ValidationLevel | None): Validation level, as in
+            `point_lut`. Defaults to None.
+
+    Returns:
+        np.ndarray: ``uint8`` lookup table with shape ``(256,)`` if every
+            parameter is a single value, otherwise ``(256, C)``.
+
+    Raises:
+        ValueError: If a sequence does not have one value per channel, or if
+            the parameters are invalid.
+    """
+    per_channel = {
+        name: value
+        for name, value in args.items()
+        if isinstance(value, Sequence | np.ndarray) and np.ndim(value) > 0
+    }
+    if not per_channel:
+        return point_lut(func=func, args=args, validation=validation)
+
+    for name, value in per_channel.items():
+        if n_channels is None or len(value) != n_channels:
+            raise ValueError(
+                f'Expected {name} to have one value per channel ({n_channels}), '
+                f'got {len(value)}.'
+            )
+    luts = [
+        point_lut(
+            func=func,
+            args={**args, **{k: int(v[c]) for k, v in per_channel.items()}},
+            validation=validation,
+        )
+        for c in range(n_channels)
+    ]
+    return np.stack(luts, axis=1)
+
+
+@beartype
+def apply_luma_lut(
+    img: np.ndarray,
+    lut: np.ndarray,
+    space: LumaSpace = 'ycrcb',
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """Apply a lookup table to the brightness of a color image only.
+
+    The image is converted once to `space`, the table is applied to the luma
+    plane while the chroma planes pass through unchanged, and the result is
+    converted back: two color conversions and one lookup pass in total.
+
+    Args:
+        img (np.ndarray): BGR image with shape ``(H, W, 3)`` and dtype
+            ``uint8``.
+        lut (np.ndarray): ``(256,)`` lookup table for the luma plane.
+        space (LumaSpace): ``"ycrcb"`` (luma Y) or ``"lab"`` (lightness L).
+            Defaults to ``"ycrcb"``.
+        out (np.ndarray | None): Optional preallocated ``uint8`` array with the
+            shape of `img` that receives the result. Defaults to None.
+
+    Returns:
+        np.ndarray: BGR image with the same shape as `img`; `out` when it is
+            given.
+
+    Raises:
+        ValueError: If `img` is not a 3-channel image, if `lut` is not a
+            ``(256,)`` table, or if `out` does not have the shape of `img`.
+    """
+    if lut.shape != (PIXEL_MAX + 1,):
+        raise ValueError(f'lut must have shape (256,), got {lut.shape}.')
+    return _luma_transform(img, lambda converted: lut, space, out)
+
+
+def _luma_space(luma: bool | LumaSpace) -> LumaSpace:
+    return 'ycrcb' if luma is True else luma
+
+
+def _luma_transform(
+    img: np.ndarray,
+    make_lut: Callable[[np.ndarray], np.ndarray],
+    space: LumaSpace,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """Map the luma plane through ``make_lut(converted_image)``."""
+    if img.ndim != RGB_DIM or img.shape[2] != RGB_CHANNELS:
+        raise ValueError(
+            f'Luma-only operations require an (H, W, 3) image, got {img.shape}.'
+        )
+    if out is not None and out.shape != img.shape:
+        raise ValueError(f'out must have shape {img.shape}, got {out.shape}.')
+
+    forward, inverse = _LUMA_CONVERSIONS[space]
+    converted = cv2.cvtColor(as_contiguous(img, 'rows'), forward)
+    identity = np.arange(PIXEL_MAX + 1, dtype=np.uint8)
+    lut = np.stack([make_lut(converted), identity, identity], axis=1)
+    cv2.LUT(converted, np.reshape(lut, (1, PIXEL_MAX + 1, RGB_CHANNELS)), dst=converted)
+
+    if out is None or not _has_layout(out, 'rows'):
+        result = cv2.cvtColor(converted, inverse)
+        if out is None:
+            return result
+        out[...] = result
+        return out
+    return cv2.cvtColor(converted, inverse, dst=out)
+
+
+@lru_cache(maxsize=1024)
+def _kernel_lut(func: Callable, items: tuple) -> np.ndarray:
+    _, kernel = _KERNELS[func]
+    lut = kernel(**dict(items))
+    lut.setflags(write=False)
+    return lut
+
+
+def _check_range(message: str, **values: int | np.integer) -> None:
+    for name, value in values.items():
+        if not isinstance(value, int | np.integer):
+            raise TypeError(f'{name} must be an integer, got {value!r}.')
+        if not (PIXEL_MIN <= value <= PIXEL_MAX):
+            raise ValueError(message.format(name=name, value=value))
+
+
+def _check_expansion(low_limit: int, high_limit: int) -> None:
+    _check_range(
+        'Expected {name} to be in the range 0 to 255, but received {value}',
+        low_limit=low_limit,
+        high_limit=high_limit,
+    )
+    if low_limit >= high_limit:
+        raise ValueError(
+            f'Lower limit must be strictly less than upper limit, '
+            f'but received low_limit={low_limit}, high_limit={high_limit}'
+        )
+
+
+def _check_thresholding(T: int, A: int) -> None:
+    _check_range('{name} must be in the range [0, 255], got {value}.', T=T, A=A)
+
+
+def _expansion_kernel(low_limit: int, high_limit: int) -> np.ndarray:
+    low, high = int(low_limit), int(high_limit)
+    pixels = np.arange(PIXEL_MAX + 1)
+    inside = (pixels > low) & (pixels < high)
+    scaled = 255 / (high - low) * (pixels - low)
+    return np.where(inside, scaled, pixels).astype(np.uint8)
+
+
+def _thresholding_kernel(T: int, A: int) -> np.ndarray:
+    pixels = np.arange(PIXEL_MAX + 1)
+    return np.where(pixels > int(T), int(A), pixels).astype(np.uint8)
+
+
+def _digital_negative_kernel() -> np.ndarray:
+    return (PIXEL_MAX - np.arange(PIXEL_MAX + 1)).astype(np.uint8)
+
+
+_KERNELS: dict[Callable, tuple[Callable, Callable]] = {
+    pixel_expansion: (_check_expansion, _expansion_kernel),
+    pixel_thresholding: (_check_thresholding, _thresholding_kernel),
+    pixel_digital_negative: (lambda: None, _digital_negative_kernel),
+}
@@ -0,0 +1,143 @@
+from collections import OrderedDict, deque
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import numpy as np
+
+from pictokit.constants import DEFAULT_HISTORY_BYTES, DEFAULT_HISTORY_STEPS
+
+
+@dataclass(eq=False)
+class Snapshot:
+    """Pixels of a state that no lookup table on the original image can express.
+
+    Attributes:
+        pixels (np.ndarray | None): Read-only pixels, or None once evicted.
+        rebuild (Callable[[], np.ndarray] | None): Recomputes the pixels after
+            eviction. Snapshots without it are never evicted.
+    """
+
+    pixels: np.ndarray | None
+    rebuild: Callable[[], np.ndarray] | None = None
+
+
+@dataclass(frozen=True, eq=False)
+class State:
+    """A transform, stored as a lookup table applied to a base image.
+
+    Attributes:
+        base (Snapshot | None): Image the lookup table is applied to. None is
+            the original image.
+        lut (np.ndarray | None): Composed lookup table, ``(256,)`` or
+            ``(256, C)``. None means the base itself.
+    """
+
+    base: Snapshot | None = None
+    lut: np.ndarray | None = None
+
+    @property
+    def is_initial(self) -> bool:
+        """Whether this is the state before any transform."""
+        return self.base is None and self.lut is None
+
+
+class TransformHistory:
+    """Bounded undo/redo stacks of transform states.
+
+    Chains of point operations are kept as one composed lookup table per
+    step, so a step costs at most a few hundred bytes. Snapshots, the full
+    pixels of the other operations, are held in a least recently used cache
+    limited to `max_bytes`; evicted snapshots are rebuilt when needed.
+
+    Args:
+        max_bytes (int): Byte budget for snapshot pixels. Defaults to
+            `DEFAULT_HISTORY_BYTES`.
+        max_steps (int): Maximum number of undo steps. Defaults to
+            `DEFAULT_HISTORY_STEPS`.
+
+    Raises:
+        ValueError: If `max_bytes` is negative or `max_steps` is not positive.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_HISTORY_BYTES,
+        max_steps: int = DEFAULT_HISTORY_STEPS,
+    ) -> None:
+        if max_bytes < 0 or max_steps < 1:
+            raise ValueError(
+                'max_bytes must be non-negative and max_steps positive, '
+                f'got max_bytes={max_bytes}, max_steps={max_steps}.'
+            )
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._undo: deque[State] = deque(maxlen=max_steps)
+        self._redo: list[State] = []
+        self._cached: OrderedDict[Snapshot, None] = OrderedDict()
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def push(self, previous: State) -> None:
+        """Record the state being left by a new operation; clears the redo stack."""
+        self._undo.append(previous)
+        self._redo.clear()
+
+    def undo(self, current: State) -> State | None:
+        """Return the previous state, or None, moving `current` to the redo stack."""
+        if not self._undo:
+            return None
+        self._redo.append(current)
+        return self._undo.pop()
+
+    def redo(self, current: State) -> State | None:
+        """Return the next undone state, or None, moving `current` to the undo stack."""
+        if not self._redo:
+            return None
+        self._undo.append(current)
+        return self._redo.pop()
+
+    def clear(self) -> None:
+        """Drop every step and every cached snapshot."""
+        self._undo.clear()
+        self._redo.clear()
+        for snapshot in self._cached:
+            snapshot.pixels = None
+        self._cached.clear()
+        self.nbytes = 0
+
+    def snapshot(
+        self, pixels: np.ndarray, rebuild: Callable[[], np.ndarray] | None = None
+    ) -> Snapshot:
+        """Create a snapshot of `pixels`, which become read-only."""
+        pixels.flags.writeable = False
+        snapshot = Snapshot(pixels=pixels, rebuild=rebuild)
+        if rebuild is not None:
+            self._cache(snapshot)
+        return snapshot
+
+    def pixels(self, snapshot: Snapshot) -> np.ndarray:
+        """Return the pixels of a snapshot, rebuilding them if they were evicted."""
+        pixels = snapshot.pixels
+        if pixels is None:
+            # Returned even if the budget is too small to keep it
+            pixels = snapshot.rebuild()
+            pixels.flags.writeable = False
+            snapshot.pixels = pixels
+            self._cache(snapshot)
+        elif snapshot in self._cached:
+            self._cached.move_to_end(snapshot)
+        return pixels
+
+    def _cache(self, snapshot: Snapshot) -> None:
+        self._cached[snapshot] = None
+        self.nbytes += snapshot.pixels.nbytes
+        while self.nbytes > self.max_bytes and self._cached:
+            evicted, _ = self._cached.popitem(last=False)
+            self.nbytes -= evicted.pixels.nbytes
+            evicted.pixels = None
@@ -0,0 +1,242 @@
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from functools import wraps
+from typing import Any, TypeVar
+
+import numpy as np
+from beartype import beartype
+
+F = TypeVar('F', bound=Callable[..., Any])
+
+_enabled = False
+_stats: dict[str, 'OperationStats'] = {}
+_callbacks: list[Callable[['OperationRecord'], None]] = []
+_lock = threading.Lock()
+_local = threading.local()
+
+
+@dataclass(frozen=True)
+class OperationRecord:
+    """Measurements of one instrumented call, as passed to callbacks.
+
+    Attributes:
+        name (str): Operation name, such as ``"load_image"`` or
+            ``"Image.equalize"``.
+        seconds (float): Wall time of the call, including nested operations.
+        pixels (int): Pixels of the image the operation worked on.
+        bytes_allocated (int): Bytes of the new image array it returned or
+            stored. Arrays that view an input, or are written into `out`, do
+            not count.
+        cache_hits (int): Lookups answered by a cache during the call.
+        cache_misses (int): Lookups that a cache could not answer.
+    """
+
+    name: str
+    seconds: float
+    pixels: int = 0
+    bytes_allocated: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+
+@dataclass(frozen=True)
+class OperationStats:
+    """Totals of an operation since metrics were enabled or reset.
+
+    Attributes:
+        calls (int): Number of calls.
+        seconds (float): Total wall time.
+        pixels (int): Total pixels processed.
+        bytes_allocated (int): Total bytes of new image arrays.
+        cache_hits (int): Total cache hits.
+        cache_misses (int): Total cache misses.
+    """
+
+    calls: int = 0
+    seconds: float = 0.0
+    pixels: int = 0
+    bytes_allocated: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+
+def enable() -> None:
+    """Start recording the instrumented operations.
+
+    While disabled, which is the default, an instrumented call costs one
+    extra function call and a flag check.
+    """
+    global _enabled  # noqa: PLW0603
+    _enabled = True
+
+
+def disable() -> None:
+    """Stop recording. Totals collected so far are kept."""
+    global _enabled  # noqa: PLW0603
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    """Return whether operations are being recorded."""
+    return _enabled
+
+
+def snapshot() -> dict[str, OperationStats]:
+    """Return the totals of every operation recorded so far.
+
+    Returns:
+        dict[str, OperationStats]: Immutable totals keyed by operation name.
+    """
+    with _lock:
+        return dict(_stats)
+
+
+def reset() -> None:
+    """Drop the totals returned by `snapshot`."""
+    with _lock:
+        _stats.clear()
+
+
+@beartype
+def add_callback(callback: Callable[[OperationRecord], None]) -> None:
+    """Call `callback` with the `OperationRecord` of every recorded call.
+
+    Callbacks run on the thread that made the call, right after it returns,
+    for example to update Prometheus counters. They should be fast, and an
+    exception they raise propagates to the caller.
+
+    Args:
+        callback (Callable[[OperationRecord], None]): Receives each record.
+    """
+    with _lock:
+        _callbacks.append(callback)
+
+
+@beartype
+def remove_callback(callback: Callable[[OperationRecord], None]) -> None:
+    """Stop calling a callback registered with `add_callback`.
+
+    Args:
+        callback (Callable[[OperationRecord], None]): Callback to remove.
+
+    Raises:
+        ValueError: If `callback` is not registered.
+    """
+    with _lock:
+        _callbacks.remove(callback)
+
+
+def note_cache(hit: bool) -> None:
+    """Count a cache lookup towards the operation running on this thread."""
+    if _enabled:
+        stack = getattr(_local, 'stack', None)
+        if stack:
+            stack[-1][0 if hit else 1] += 1
+
+
+def instrument(name: str) -> Callable[[F], F]:
+    """Record the calls of an image function.
+
+    The pixels are those of the first array argument, or of the returned
+    array. A returned array that does not view an argument counts as
+    allocated.
+    """
+
+    def decorator(func: F) -> F:
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _enabled:
+                return func(*args, **kwargs)
+            start, cache = _begin()
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                _local.stack.pop()
+            seconds = time.perf_counter() - start
+            inputs = [*args, *kwargs.values()]
+            image = next((a for a in inputs if isinstance(a, np.ndarray)), result)
+            pixels = _pixels(image) if isinstance(image, np.ndarray) else 0
+            allocated = 0
+            if isinstance(result, np.ndarray) and not any(
+                _shares(result, arg) for arg in inputs
+            ):
+                allocated = result.nbytes
+            _record(name, seconds, pixels, allocated, cache)
+            return result
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def instrument_method(name: str) -> Callable[[F], F]:
+    """Record the calls of an `Image` method that replaces its transform.
+
+    The pixels are those of the original image, and the allocated bytes those
+    of the new transform array, if one was created.
+    """
+
+    def decorator(func: F) -> F:
+        @wraps(func)
+        def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            if not _enabled:
+                return func(self, *args, **kwargs)
+            before = self._transform
+            start, cache = _begin()
+            try:
+                result = func(self, *args, **kwargs)
+            finally:
+                _local.stack.pop()
+            seconds = time.perf_counter() - start
+            after = self._transform
+            new = not (
+                after is kwargs.get('out')
+                or _shares(after, before)
+                or _shares(after, self.img)
+            )
+            allocated = after.nbytes if new else 0
+            _record(name, seconds, _pixels(self.img), allocated, cache)
+            return result
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def _begin() -> tuple[float, list[int]]:
+    cache = [0, 0]
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    stack.append(cache)
+    return time.perf_counter(), cache
+
+
+def _record(
+    name: str, seconds: float, pixels: int, allocated: int, cache: list[int]
+) -> None:
+    record = OperationRecord(name, seconds, pixels, allocated, *cache)
+    with _lock:
+        stats = _stats.get(name, OperationStats())
+        _stats[name] = replace(
+            stats,
+            calls=stats.calls + 1,
+            seconds=stats.seconds + seconds,
+            pixels=stats.pixels + pixels,
+            bytes_allocated=stats.bytes_allocated + allocated,
+            cache_hits=stats.cache_hits + record.cache_hits,
+            cache_misses=stats.cache_misses + record.cache_misses,
+        )
+        callbacks = list(_callbacks)
+    for callback in callbacks:
+        callback(record)
+
+
+def _pixels(img: np.ndarray) -> int:
+    return img.shape[0] * img.shape[1] if img.ndim > 1 else img.size
+
+
+def _shares(result: np.ndarray, other: object) -> bool:
+    return isinstance(other, np.ndarray) and np.may_share_memory(result, other)
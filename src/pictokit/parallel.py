@@ -0,0 +1,122 @@
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import TypeVar
+
+from beartype import beartype
+
+from pictokit.constants import DEFAULT_PARALLEL_PIXELS
+
+T = TypeVar('T')
+
+_threads = 1
+_min_pixels = DEFAULT_PARALLEL_PIXELS
+_pool: ThreadPoolExecutor | None = None
+_pool_size = 0
+_pool_lock = threading.Lock()
+
+
+@beartype
+def set_threads(threads: int = 1, min_pixels: int = DEFAULT_PARALLEL_PIXELS) -> None:
+    """Set the default number of threads used on a single large image.
+
+    Lookup tables and histograms of images with at least `min_pixels` pixels
+    are computed in row bands on a shared thread pool; OpenCV releases the GIL,
+    so the bands run in parallel. Smaller images stay on the calling thread,
+    where dispatching would cost more than it saves.
+
+    Args:
+        threads (int): Number of bands, and of threads working on them. 1
+            disables threading. Defaults to 1.
+        min_pixels (int): Smallest image, in pixels per channel, that is split.
+            Defaults to `DEFAULT_PARALLEL_PIXELS`.
+
+    Raises:
+        ValueError: If `threads` or `min_pixels` are not positive.
+    """
+    global _threads, _min_pixels  # noqa: PLW0603
+    _check(threads, min_pixels)
+    _threads, _min_pixels = threads, min_pixels
+
+
+def get_threads() -> tuple[int, int]:
+    """Return the defaults set by `set_threads`.
+
+    Returns:
+        tuple[int, int]: The number of threads, initially 1, and the pixel
+            threshold.
+    """
+    return _threads, _min_pixels
+
+
+def _check(threads: int, min_pixels: int) -> None:
+    if threads < 1 or min_pixels < 1:
+        raise ValueError(
+            'threads and min_pixels must be greater than 0, '
+            f'got threads={threads}, min_pixels={min_pixels}.'
+        )
+
+
+def band_count(rows: int, pixels: int, threads: int | None = None) -> int:
+    """Number of row bands to split an image into; 1 means no threading.
+
+    Args:
+        rows (int): Number of rows of the image.
+        pixels (int): Number of pixels of the image, per channel.
+        threads (int | None): Threads of this call. Defaults to None, which
+            uses `set_threads`.
+
+    Returns:
+        int: Between 1 and the number of threads, and at most one band per row.
+
+    Raises:
+        ValueError: If `threads` is not positive.
+    """
+    if threads is None:
+        threads = _threads
+    elif threads < 1:
+        raise ValueError(f'threads must be greater than 0, got {threads}.')
+    if threads == 1 or pixels < _min_pixels:
+        return 1
+    return max(1, min(threads, rows))
+
+
+def run_bands(func: Callable[[slice], T], rows: int, bands: int) -> list[T]:
+    """Call `func` on `bands` consecutive row ranges covering `rows` rows.
+
+    The first band runs on the calling thread and the others on the shared
+    pool, so `func` must not itself split work into bands.
+
+    Args:
+        func (Callable[[slice], T]): Work on one row range.
+        rows (int): Number of rows to cover.
+        bands (int): Number of row ranges, from `band_count`.
+
+    Returns:
+        list[T]: The results, in row order.
+    """
+    edges = [rows * i // bands for i in range(bands + 1)]
+    slices = [slice(start, stop) for start, stop in zip(edges, edges[1:])]
+    if bands == 1:
+        return [func(slices[0])]
+
+    with _pool_lock:
+        pool = _grow_pool(bands - 1)
+        futures = [pool.submit(func, band) for band in slices[1:]]
+    try:
+        first = func(slices[0])
+    finally:
+        # Never return, or raise, while another band may still be writing
+        wait(futures)
+    return [first, *(f.result() for f in futures)]
+
+
+def _grow_pool(workers: int) -> ThreadPoolExecutor:
+    global _pool, _pool_size  # noqa: PLW0603
+    if _pool is None or _pool_size < workers:
+        if _pool is not None:
+            # Work already queued on the old pool still runs
+            _pool.shutdown(wait=False)
+        _pool = ThreadPoolExecutor(workers, thread_name_prefix='pictokit')
+        _pool_size = workers
+    return _pool
@@ -0,0 +1,203 @@
+import glob
+import multiprocessing
+import os
+from collections import deque
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from functools import partial
+from typing import Literal, TypeVar
+
+import numpy as np
+from beartype import beartype
+
+from pictokit.constants import Mode
+from pictokit.controls import load_image, save_image
+
+Transform = Callable[[np.ndarray], np.ndarray]
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+@beartype
+def process_images(
+    paths: str | Sequence[str],
+    transforms: Sequence[Transform] = (),
+    output_dir: str | None = None,
+    mode: Mode = 'any',
+    workers: int | None = None,
+    max_in_flight: int | None = None,
+    ordered: bool = True,
+    executor: Literal['thread', 'process'] = 'thread',
+    keep_results: bool = True,
+) -> Iterator[tuple[str, np.ndarray | None]]:
+    """Load, transform and optionally write many images in parallel.
+
+    Every image is decoded with `load_image`, passed through `transforms` in
+    order and, if `output_dir` is given, written there. Images matched by a
+    glob pattern keep their path relative to the directory the pattern starts
+    from, so ``"data/**/*.png"`` mirrors the tree under ``data``; images given
+    as a sequence are written under their file name.
+
+    Results are yielded as soon as they are ready. At most `max_in_flight`
+    images are submitted but not yet consumed at any time, so memory stays
+    bounded however many paths are given.
+
+    A thread pool is used by default: OpenCV and NumPy release the GIL while
+    decoding and transforming. With ``executor="process"``, `transforms` must
+    be picklable (module-level functions or `functools.partial` objects).
+
+    Args:
+        paths (str | Sequence[str]): Glob pattern (``**`` is supported) or
+            sequence of image paths.
+        transforms (Sequence[Transform]): Functions that take and return an
+            image array, applied in order. Defaults to no transformation.
+        output_dir (str | None): Directory where results are written. It is
+            created if needed. Defaults to None (nothing is written).
+        mode (Mode): Mode passed to `load_image`. Defaults to ``"any"``.
+        workers (int | None): Number of workers. Defaults to `os.cpu_count()`.
+        max_in_flight (int | None): Maximum number of pending images. Defaults
+            to twice the number of workers.
+        ordered (bool): If True, results are yielded in input order; otherwise
+            in completion order. Defaults to True.
+        executor (Literal["thread", "process"]): Kind of worker pool.
+            Defaults to ``"thread"``.
+        keep_results (bool): If False, the transformed arrays are dropped and
+            None is yielded in their place, which avoids sending them back from
+            worker processes. Defaults to True.
+
+    Yields:
+        tuple[str, np.ndarray | None]: The input path and the transformed image.
+
+    Raises:
+        ValueError: If `workers` or `max_in_flight` are not positive, or if
+            two paths of a sequence have the same file name and `output_dir`
+            is given.
+        FileNotFoundError: If an image cannot be read.
+        OSError: If a result cannot be written.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if max_in_flight is None:
+        max_in_flight = 2 * workers
+    if workers < 1 or max_in_flight < 1:
+        raise ValueError(
+            'workers and max_in_flight must be greater than 0, '
+            f'got workers={workers}, max_in_flight={max_in_flight}.'
+        )
+
+    root = None
+    if isinstance(paths, str):
+        root = _glob_root(paths)
+        paths = sorted(glob.glob(paths, recursive=True))
+    if output_dir is not None:
+        if root is None:
+            _check_names(paths)
+        os.makedirs(output_dir, exist_ok=True)
+
+    pool = _pool(executor, workers)
+    job = partial(
+        _process_one,
+        transforms=tuple(transforms),
+        output_dir=output_dir,
+        mode=mode,
+        keep_results=keep_results,
+        root=root,
+    )
+    try:
+        yield from _run(pool, iter(paths), job, max_in_flight, ordered)
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _pool(kind: Literal['thread', 'process'], workers: int) -> Executor:
+    if kind == 'thread':
+        return ThreadPoolExecutor(max_workers=workers)
+    # Forking a process that runs other threads, such as the OpenCV or band
+    # pools, can copy a lock held by one of them and deadlock the child
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context(
+        'forkserver' if 'forkserver' in methods else 'spawn'
+    )
+    return ProcessPoolExecutor(max_workers=workers, mp_context=context)
+
+
+def _run(
+    pool: Executor,
+    items: Iterator[T],
+    job: Callable[[T], R],
+    max_in_flight: int,
+    ordered: bool,
+) -> Iterator[tuple[T, R]]:
+    """Run `job` on every item, with at most `max_in_flight` items pending."""
+    pending: deque[tuple[T, Future]] = deque()
+
+    def submit() -> bool:
+        item = next(items, None)
+        if item is None:
+            return False
+        pending.append((item, pool.submit(job, item)))
+        return True
+
+    while len(pending) < max_in_flight and submit():
+        pass
+
+    while pending:
+        if ordered:
+            item, future = pending.popleft()
+        else:
+            wait([f for _, f in pending], return_when=FIRST_COMPLETED)
+            item, future = next((i, f) for i, f in pending if f.done())
+            pending.remove((item, future))
+        result = future.result()
+        submit()
+        yield item, result
+
+
+def _glob_root(pattern: str) -> str:
+    """Directory a glob pattern starts from: its longest literal prefix."""
+    root = os.path.dirname(pattern)
+    while glob.has_magic(root):
+        root = os.path.dirname(root)
+    return root or os.curdir
+
+
+def _check_names(paths: Sequence[str]) -> None:
+    seen: dict[str, str] = {}
+    for path in paths:
+        _claim_name(seen, path)
+
+
+def _claim_name(seen: dict[str, str], path: str) -> None:
+    """Record the output file name of `path`, which must not be taken yet."""
+    name = os.path.basename(path)
+    if name in seen:
+        raise ValueError(f'{seen[name]} and {path} would both be written to {name}.')
+    seen[name] = path
+
+
+def _process_one(
+    path: str,
+    transforms: tuple[Transform, ...],
+    output_dir: str | None,
+    mode: Mode,
+    keep_results: bool,
+    root: str | None = None,
+) -> np.ndarray | None:
+    img = load_image(path=path, mode=mode)
+    for transform in transforms:
+        img = transform(img)
+
+    if output_dir is not None:
+        name = os.path.basename(path) if root is None else os.path.relpath(path, root)
+        dst = os.path.join(output_dir, name)
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        save_image(dst, img)
+
+    return img if keep_results else None
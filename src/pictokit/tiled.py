@@ -0,0 +1,171 @@
+from collections.abc import Callable, Iterator
+
+import numpy as np
+from beartype import beartype
+
+import pictokit.element_wise as elw
+from pictokit.common import validate_imgarray
+from pictokit.constants import DEFAULT_TILE_BYTES, PIXEL_MAX, Mode
+from pictokit.controls import calculate_histogram
+
+
+@beartype
+def open_memmap(
+    path: str,
+    shape: tuple[int, ...] | None = None,
+    mode: Mode = 'any',
+    write: bool = False,
+) -> np.ndarray:
+    """Open an image stored on disk as a memory-mapped array.
+
+    ``.npy`` files carry their own shape and dtype. Any other file is read as
+    raw ``uint8`` pixels in row-major order, and `shape` is required.
+
+    Args:
+        path (str): Path to a ``.npy`` file or a raw pixel file.
+        shape (tuple[int, ...] | None): Image shape, ``(H, W)`` or
+            ``(H, W, 3)``. Required for raw files, ignored for ``.npy`` files.
+        mode (Mode): Expected image type, as in `validate_imgarray`.
+            Defaults to ``"any"``.
+        write (bool): If True, the file is opened for reading and writing.
+            Defaults to False (read only).
+
+    Returns:
+        np.ndarray: Memory-mapped image; pixels are only read on access.
+
+    Raises:
+        ValueError: If `shape` is missing for a raw file, or if the stored image
+            has an invalid shape.
+        TypeError: If the stored dtype is not ``uint8``.
+    """
+    mmap_mode = 'r+' if write else 'r'
+    if path.endswith('.npy'):
+        img = np.load(path, mmap_mode=mmap_mode)
+    elif shape is None:
+        raise ValueError(f'shape is required to open the raw image file {path}.')
+    else:
+        img = np.memmap(path, dtype=np.uint8, mode=mmap_mode, shape=shape)
+
+    return validate_imgarray(img, mode=mode)
+
+
+@beartype
+def create_memmap(path: str, shape: tuple[int, ...]) -> np.ndarray:
+    """Create a memory-mapped ``uint8`` image on disk, ready to be written.
+
+    Args:
+        path (str): Destination path. A ``.npy`` suffix creates a NumPy file;
+            any other name creates a raw pixel file.
+        shape (tuple[int, ...]): Image shape, ``(H, W)`` or ``(H, W, 3)``.
+
+    Returns:
+        np.ndarray: Writable memory-mapped image.
+
+    Raises:
+        ValueError: If `shape` is not a valid image shape.
+    """
+    if path.endswith('.npy'):
+        img = np.lib.format.open_memmap(path, mode='w+', dtype=np.uint8, shape=shape)
+    else:
+        img = np.memmap(path, dtype=np.uint8, mode='w+', shape=shape)
+
+    return validate_imgarray(img)
+
+
+@beartype
+def iter_tiles(
+    img: np.ndarray, tile_bytes: int = DEFAULT_TILE_BYTES
+) -> Iterator[slice]:
+    """Split an image into bands of whole rows that fit in a byte budget.
+
+    Args:
+        img (np.ndarray): Image to split.
+        tile_bytes (int): Maximum size of a band in bytes. A band always holds
+            at least one row. Defaults to `DEFAULT_TILE_BYTES`.
+
+    Yields:
+        slice: Row range of each band, in order.
+
+    Raises:
+        ValueError: If `tile_bytes` is not positive.
+    """
+    if tile_bytes < 1:
+        raise ValueError(f'tile_bytes must be greater than 0, got {tile_bytes}.')
+
+    row_bytes = max(1, img[:1].nbytes)
+    rows = max(1, tile_bytes // row_bytes)
+    for start in range(0, img.shape[0], rows):
+        yield slice(start, start + rows)
+
+
+@beartype
+def transform_tiled(
+    src: np.ndarray,
+    dst: np.ndarray,
+    func: Callable,
+    args: dict,
+    tile_bytes: int = DEFAULT_TILE_BYTES,
+) -> np.ndarray:
+    """Apply a point operation to an image band by band.
+
+    The lookup table is built once; then each band of `src` is read, mapped and
+    written to `dst`. Only one band is held in memory at a time, so both
+    images can be memory-mapped files larger than RAM.
+
+    Args:
+        src (np.ndarray): Source image, typically from `open_memmap`.
+        dst (np.ndarray): Destination with the same shape as `src`, typically
+            from `create_memmap`. It may be `src` itself.
+        func (Callable): Scalar point operation from `pictokit.element_wise`.
+        args (dict): Arguments of `func`, other than ``pixel``.
+        tile_bytes (int): Maximum size of a band in bytes. Defaults to
+            `DEFAULT_TILE_BYTES`.
+
+    Returns:
+        np.ndarray: `dst`, flushed to disk if it is memory-mapped.
+
+    Raises:
+        ValueError: If the shapes differ or the arguments of `func` are invalid.
+    """
+    validate_imgarray(src)
+    validate_imgarray(dst)
+    if src.shape != dst.shape:
+        raise ValueError(
+            f'src and dst must have the same shape, got {src.shape} and {dst.shape}.'
+        )
+
+    lut = elw.point_lut(func=func, args=args)
+    for rows in iter_tiles(src, tile_bytes):
+        elw.apply_lut(src[rows], lut, out=dst[rows])
+
+    if isinstance(dst, np.memmap):
+        dst.flush()
+    return dst
+
+
+@beartype
+def histogram_tiled(
+    img: np.ndarray,
+    bins: int = PIXEL_MAX + 1,
+    channels: bool = False,
+    tile_bytes: int = DEFAULT_TILE_BYTES,
+) -> np.ndarray:
+    """Compute the histogram of an image band by band.
+
+    Args:
+        img (np.ndarray): Image, typically from `open_memmap`.
+        bins (int): Number of intensity values to count. Defaults to 256.
+        channels (bool): If True, returns one histogram per channel.
+            Defaults to False.
+        tile_bytes (int): Maximum size of a band in bytes. Defaults to
+            `DEFAULT_TILE_BYTES`.
+
+    Returns:
+        np.ndarray: Same result as `calculate_histogram` on the whole image.
+    """
+    hist = calculate_histogram(img[:0], bins=bins, channels=channels)
+    for rows in iter_tiles(img, tile_bytes):
+        calculate_histogram(
+            img[rows], bins=bins, channels=channels, out=hist, accumulate=True
+        )
+    return hist
@@ -0,0 +1,75 @@
+from types import ModuleType
+
+import numpy as np
+
+
+def _pyplot() -> ModuleType:
+    # matplotlib is only imported when something is actually plotted, so that
+    # importing pictokit and running transforms stays fast and headless.
+    import matplotlib.pyplot as plt  # noqa: PLC0415
+
+    return plt
+
+
+def show_image(img: np.ndarray, title: str | None = None) -> None:
+    """
+    Displays an image.
+
+    Args:
+        img (np.ndarray): Image to display.
+        title (str | None, optional): Title of the plot. Defaults to None.
+
+    Returns:
+        None
+    """
+    plt = _pyplot()
+    plt.imshow(img, cmap='gray')
+    if title is not None:
+        plt.title(title)
+    plt.show()
+
+
+def plot_histogram(values: np.ndarray) -> None:
+    """
+    Plots a histogram computed by `calculate_histogram`.
+
+    Args:
+        values (np.ndarray): Histogram with shape ``(bins,)``, plotted as bars,
+            or ``(3, bins)``, plotted as one B, G and R line per channel.
+
+    Returns:
+        None
+    """
+    plt = _pyplot()
+    plt.figure(figsize=(8, 6))
+    if values.ndim > 1:
+        for color, channel_values in zip('bgr', values):
+            plt.plot(range(len(channel_values)), channel_values, color=color)
+    else:
+        plt.bar(range(len(values)), values)
+    plt.show()
+
+
+def compare_images(original: np.ndarray, transform: np.ndarray) -> None:
+    """
+    Displays two images side by side to facilitate visual comparison.
+
+    Args:
+        original (np.ndarray): The original image, shown on the left.
+        transform (np.ndarray): The transformed image, shown on the right.
+
+    Returns:
+        None
+    """
+    plt = _pyplot()
+    _, axs = plt.subplots(1, 2, figsize=(10, 5))
+
+    axs[0].imshow(original, cmap='gray')
+    axs[0].set_title('Original')
+    axs[0].axis('off')
+
+    axs[1].imshow(transform, cmap='gray')
+    axs[1].set_title('Transform')
+    axs[1].axis('off')
+
+    plt.show()
@@ -0,0 +1,136 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
+from beartype import beartype
+
+from pictokit.controls import save_image
+
+
+class ImageWriter:
+    """Encode and write images on background threads.
+
+    `submit` returns as soon as the image is queued, so encoding overlaps with
+    the processing of the next image. At most `max_pending` images are queued
+    or being written; further calls to `submit` block until one finishes,
+    which bounds the memory held by the queue.
+
+    Errors are raised by `flush` and `close`, or by the future returned from
+    `submit`. Use the writer as a context manager to close it on exit::
+
+        with ImageWriter(quality=90) as writer:
+            for path in paths:
+                writer.submit(out_path(path), process(path))
+
+    Args:
+        workers (int): Number of encoding threads. Defaults to 2.
+        max_pending (int): Maximum number of images queued or being written.
+            Defaults to 8.
+        quality (int | None): JPEG or WebP quality passed to `save_image`.
+            Defaults to None.
+        compression (int | None): PNG compression level passed to
+            `save_image`. Defaults to None.
+
+    Raises:
+        ValueError: If `workers` or `max_pending` are not positive.
+    """
+
+    @beartype
+    def __init__(
+        self,
+        workers: int = 2,
+        max_pending: int = 8,
+        quality: int | None = None,
+        compression: int | None = None,
+    ) -> None:
+        if workers < 1 or max_pending < 1:
+            raise ValueError(
+                'workers and max_pending must be greater than 0, '
+                f'got workers={workers}, max_pending={max_pending}.'
+            )
+        self.quality = quality
+        self.compression = compression
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._pending: set[Future] = set()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @beartype
+    def submit(self, path: str, img: np.ndarray, copy: bool = True) -> Future:
+        """Queue an image to be written to `path`.
+
+        Blocks while `max_pending` images are already pending.
+
+        Args:
+            path (str): Destination path; the extension selects the format.
+            img (np.ndarray): Image to write.
+            copy (bool): If True, a writable `img` is copied so the caller can
+                reuse its buffer right away. Pass False when the array is not
+                modified until it is written. Defaults to True.
+
+        Returns:
+            Future: Completes when the file is written.
+
+        Raises:
+            RuntimeError: If the writer is closed.
+        """
+        if self._closed:
+            raise RuntimeError('Cannot submit to a closed ImageWriter.')
+        if copy and img.flags.writeable:
+            img = img.copy()
+
+        self._slots.acquire()
+        try:
+            future = self._pool.submit(
+                save_image, path, img, self.quality, self.compression
+            )
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._done)
+        return future
+
+    def flush(self) -> None:
+        """Wait until every queued image is written.
+
+        Raises:
+            Exception: The first error raised while writing, if any.
+        """
+        with self._lock:
+            pending = list(self._pending)
+        errors = [f.exception() for f in pending]
+        with self._lock:
+            self._pending.difference_update(pending)
+        error = next((e for e in errors if e is not None), None)
+        if error is not None:
+            raise error
+
+    def close(self) -> None:
+        """Write the queued images and stop the threads. Safe to call twice.
+
+        Raises:
+            Exception: The first error raised while writing, if any.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self.flush()
+        finally:
+            self._pool.shutdown(wait=True)
+
+    def __enter__(self) -> 'ImageWriter':
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _done(self, future: Future) -> None:
+        self._slots.release()
+        with self._lock:
+            # Failed futures are kept until flush reports them
+            if future.exception() is None:
+                self._pending.discard(future)
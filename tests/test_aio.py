@@ -0,0 +1,205 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import cv2
+import numpy as np
+import pytest
+
+from pictokit import aio
+from pictokit.controls import load_image
+
+
+def negative(img):
+    return 255 - img
+
+
+@pytest.fixture
+def image_paths(tmp_path):
+    rng = np.random.default_rng(0)
+    images = {}
+    for i in range(6):
+        path = str(tmp_path / f'img_{i}.png')
+        img = rng.integers(0, 256, size=(8, 10), dtype=np.uint8)
+        cv2.imwrite(path, img)
+        images[path] = img
+    return images
+
+
+async def collect(results):
+    return [item async for item in results]
+
+
+def test_async_load_image(image_paths):
+    path, img = next(iter(image_paths.items()))
+    out = asyncio.run(aio.load_image(path=path, mode='gray', scale=2))
+    assert np.array_equal(out, load_image(path=path, mode='gray', scale=2))
+    assert np.array_equal(asyncio.run(aio.load_image(img_arr=img)), img)
+    with open(path, 'rb') as f:
+        data = f.read()
+    assert np.array_equal(asyncio.run(aio.load_image(data=data)), img)
+
+
+def test_run_in_executor_does_not_block_loop():
+    ticks = []
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.01)
+
+    async def main():
+        tick = asyncio.ensure_future(ticker())
+        await aio.run_in_executor(time.sleep, 0.1)
+        await tick
+
+    asyncio.run(main())
+    assert len(ticks) == 5  # noqa: PLR2004
+
+
+def test_run_in_executor_timeout():
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(aio.run_in_executor(time.sleep, 0.1, timeout=0.01))
+
+
+@pytest.mark.parametrize('ordered', [True, False])
+def test_async_process_images(ordered, image_paths, tmp_path):
+    out_dir = str(tmp_path / 'out')
+    paths = list(image_paths)
+    results = asyncio.run(
+        collect(
+            aio.process_images(
+                paths, [negative], output_dir=out_dir, mode='gray', ordered=ordered
+            )
+        )
+    )
+
+    if ordered:
+        assert [path for path, _ in results] == paths
+    assert {path for path, _ in results} == set(paths)
+    for path, out in results:
+        assert np.array_equal(out, 255 - image_paths[path])
+        written = cv2.imread(os.path.join(out_dir, os.path.basename(path)), 0)
+        assert np.array_equal(written, out)
+
+
+def test_async_process_images_bounded_intake(image_paths):
+    taken = []
+
+    async def paths():
+        for path in image_paths:
+            taken.append(path)
+            yield path
+
+    async def main():
+        results = aio.process_images(paths(), max_in_flight=2)
+        await results.__anext__()
+        # two pending images plus the one just handed to the consumer
+        assert len(taken) <= 3  # noqa: PLR2004
+        await results.aclose()
+
+    asyncio.run(main())
+
+
+def test_async_process_images_timeout(image_paths):
+    slow = next(iter(image_paths))
+
+    def maybe_slow(img):
+        if np.array_equal(img, image_paths[slow]):
+            time.sleep(0.25)
+        return img
+
+    results = aio.process_images(image_paths, [maybe_slow], mode='gray', timeout=0.05)
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(collect(results))
+
+    results = aio.process_images(
+        image_paths, [maybe_slow], mode='gray', timeout=0.05, return_exceptions=True
+    )
+    outcome = dict(asyncio.run(collect(results)))
+    assert isinstance(outcome.pop(slow), asyncio.TimeoutError)
+    for path, out in outcome.items():
+        assert np.array_equal(out, image_paths[path])
+
+
+def test_timeout_excludes_time_queued_in_executor(image_paths):
+    def slow(img):
+        time.sleep(0.1)
+        return img
+
+    async def main():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            results = aio.process_images(
+                image_paths,
+                [slow],
+                mode='gray',
+                timeout=0.3,
+                max_in_flight=len(image_paths),
+                executor=executor,
+            )
+            return await collect(results)
+
+    # Six images queued behind a single worker, each well within its timeout
+    outcome = dict(asyncio.run(main()))
+    for path, out in outcome.items():
+        assert np.array_equal(out, image_paths[path])
+
+
+def test_run_in_executor_timeout_in_process_pool():
+    async def main():
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            calls = [
+                aio.run_in_executor(time.sleep, 0.3, executor=executor, timeout=1.0)
+                for _ in range(5)
+            ]
+            return await asyncio.gather(*calls)
+
+    # The pool queues one call ahead of the worker, so each timer starts at
+    # most one call early
+    assert asyncio.run(main()) == [None] * 5
+
+
+def test_async_process_images_close_cancels_pending(image_paths):
+    started = []
+    lock = threading.Lock()
+
+    def record(img):
+        with lock:
+            started.append(img)
+        time.sleep(0.05)
+        return img
+
+    async def main():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            results = aio.process_images(
+                image_paths, [record], max_in_flight=4, executor=executor
+            )
+            await results.__anext__()
+            await results.aclose()
+        return len(started)
+
+    # Images queued behind the busy worker never start
+    assert asyncio.run(main()) < len(image_paths)
+
+
+def test_async_process_images_rejects_same_file_name(image_paths, tmp_path):
+    first = next(iter(image_paths))
+    other = tmp_path / 'other'
+    other.mkdir()
+    duplicate = str(other / os.path.basename(first))
+    cv2.imwrite(duplicate, image_paths[first])
+
+    results = aio.process_images(
+        [*image_paths, duplicate], output_dir=str(tmp_path / 'out'), max_in_flight=2
+    )
+    with pytest.raises(ValueError, match='would both be written to img_0.png'):
+        asyncio.run(collect(results))
+
+
+def test_async_process_images_errors(tmp_path):
+    with pytest.raises(ValueError, match='must be greater than 0'):
+        asyncio.run(collect(aio.process_images([], max_in_flight=0)))
+    with pytest.raises(FileNotFoundError):
+        asyncio.run(collect(aio.process_images([str(tmp_path / 'missing.png')])))
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from pictokit import Image, batch
+
+
+def stack(shape, seed=0):
+    return np.random.default_rng(seed).integers(0, 256, size=shape, dtype=np.uint8)
+
+
+@pytest.mark.parametrize('shape', [(4, 10, 12), (3, 8, 9, 3)])
+@pytest.mark.parametrize(
+    ('name', 'kwargs'),
+    [
+        ('contrast_expansion', {'low_limit': 40, 'high_limit': 200}),
+        ('thresholding', {'T': 127, 'A': 255}),
+        ('digital_negative', {}),
+    ],
+)
+def test_batch_matches_image(shape, name, kwargs):
+    imgs = stack(shape)
+    out = getattr(batch, name)(imgs, **kwargs)
+
+    assert out.shape == imgs.shape
+    assert out.dtype == np.uint8
+    for img, result in zip(imgs, out, strict=True):
+        single = Image(img_arr=img)
+        getattr(single, name)(**kwargs)
+        assert np.array_equal(result, single.transform)
+
+
+def test_batch_per_image_params():
+    imgs = stack((3, 6, 7))
+    T = [10, 128, 250]
+    out = batch.thresholding(imgs, T=np.array(T), A=255)
+    for img, t, result in zip(imgs, T, out, strict=True):
+        expected = batch.thresholding(img[np.newaxis], T=t, A=255)[0]
+        assert np.array_equal(result, expected)
+
+
+def test_batch_accepts_list_of_images():
+    imgs = [stack((5, 5), seed) for seed in range(3)]
+    out = batch.digital_negative(imgs)
+    assert np.array_equal(out, 255 - np.stack(imgs))
+
+
+@pytest.mark.parametrize(
+    ('kwargs', 'error', 'msg'),
+    [
+        ({'T': [1, 2], 'A': 255}, ValueError, 'one value per image'),
+        ({'T': 1.5, 'A': 255}, Exception, ''),
+        ({'T': np.array([1.0, 2.0, 3.0]), 'A': 255}, TypeError, 'hold integers'),
+        ({'T': [1, 2, 300], 'A': 255}, ValueError, 'must be in the range'),
+    ],
+)
+def test_batch_param_errors(kwargs, error, msg):
+    with pytest.raises(error, match=msg):
+        batch.thresholding(stack((3, 4, 4)), **kwargs)
@@ -0,0 +1,44 @@
+import importlib.util
+import json
+import pathlib
+
+import pytest
+
+BENCH = pathlib.Path(__file__).parents[1] / 'benchmarks' / 'bench.py'
+
+
+@pytest.fixture(scope='module')
+def bench():
+    spec = importlib.util.spec_from_file_location('bench', BENCH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize(
+    ('results', 'baseline', 'regressed'),
+    [
+        ({'a': 100.0}, {'a': 100.0}, []),
+        ({'a': 71.0}, {'a': 100.0}, []),
+        ({'a': 69.0}, {'a': 100.0}, ['a']),
+        ({'a': 1.0, 'new': 1.0}, {'a': 1.0}, []),
+    ],
+)
+def test_compare(bench, results, baseline, regressed):
+    messages = bench.compare(results, baseline, threshold=0.3)
+    assert [m.split(':')[0] for m in messages] == regressed
+
+
+def test_main_save_and_compare(bench, tmp_path, monkeypatch):
+    monkeypatch.setattr(bench, 'MIN_SAMPLE', 0)
+    baseline = tmp_path / 'baseline.json'
+    args = ['--sizes', '16x24', '--repeat', '1', '--rounds', '1']
+    args += ['--baseline', str(baseline)]
+
+    assert bench.main([*args, '--save']) == 0
+    cases = json.loads(baseline.read_text())
+    assert 'digital_negative/color/16x24' in cases
+    assert 'load_image/gray/16x24' in cases
+
+    baseline.write_text(json.dumps(dict.fromkeys(cases, float('inf'))))
+    assert bench.main([*args, '--compare']) == 1
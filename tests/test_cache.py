@@ -0,0 +1,108 @@
+# ruff: noqa: PLR2004
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from pictokit.cache import ImageCache
+from pictokit.controls import load_image
+
+
+@pytest.fixture
+def png(tmp_path, gray_u8):
+    path = str(tmp_path / 'img.png')
+    cv2.imwrite(path, gray_u8)
+    return path
+
+
+def test_load_image_cache_hits_and_read_only(png, gray_u8):
+    cache = ImageCache()
+    first = load_image(path=png, cache=cache)
+    second = load_image(path=png, cache=cache)
+
+    assert second is first
+    assert np.array_equal(first, gray_u8)
+    assert not first.flags.writeable
+    assert (cache.hits, cache.misses, len(cache)) == (1, 1, 1)
+    assert cache.nbytes == gray_u8.nbytes
+
+
+def test_load_image_cache_keys_on_options(png):
+    cache = ImageCache()
+    gray = load_image(path=png, mode='gray', cache=cache)
+    color = load_image(path=png, mode='color', cache=cache)
+    assert color.shape == (*gray.shape, 3)
+    assert (cache.hits, cache.misses, len(cache)) == (0, 2, 2)
+
+
+def test_load_image_cache_reloads_modified_file(png, gray_u8):
+    cache = ImageCache()
+    load_image(path=png, cache=cache)
+
+    cv2.imwrite(png, 255 - gray_u8)
+    stat = os.stat(png)
+    os.utime(png, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert np.array_equal(load_image(path=png, cache=cache), 255 - gray_u8)
+    assert cache.misses == 2
+    assert len(cache) == 1
+
+
+def test_image_cache_evicts_least_recently_used(tmp_path, gray_u8):
+    paths = []
+    for i in range(3):
+        paths.append(str(tmp_path / f'{i}.png'))
+        cv2.imwrite(paths[-1], gray_u8)
+
+    cache = ImageCache(max_bytes=2 * gray_u8.nbytes)
+    load_image(path=paths[0], cache=cache)
+    load_image(path=paths[1], cache=cache)
+    load_image(path=paths[0], cache=cache)
+    load_image(path=paths[2], cache=cache)  # evicts paths[1]
+    assert len(cache) == 2
+
+    load_image(path=paths[0], cache=cache)
+    load_image(path=paths[1], cache=cache)
+    assert (cache.hits, cache.misses) == (2, 4)
+
+
+def test_image_cache_skips_images_over_the_cap(png):
+    cache = ImageCache(max_bytes=10)
+    load_image(path=png, cache=cache)
+    assert len(cache) == 0
+    assert cache.nbytes == 0
+
+
+def test_image_cache_invalidate(png, tmp_path, gray_u8):
+    other = str(tmp_path / 'other.png')
+    cv2.imwrite(other, gray_u8)
+    cache = ImageCache()
+    for mode in ('gray', 'color'):
+        load_image(path=png, mode=mode, cache=cache)
+    load_image(path=other, cache=cache)
+
+    assert cache.invalidate(png) == 2
+    assert len(cache) == 1
+    assert cache.invalidate() == 1
+    assert cache.nbytes == 0
+
+
+def test_load_image_default_cache(png, monkeypatch):
+    cache = ImageCache()
+    monkeypatch.setattr('pictokit.controls.default_cache', cache)
+    load_image(path=png, cache=True)
+    load_image(path=png, cache=True)
+    assert cache.hits == 1
+
+
+def test_load_image_cache_missing_file(tmp_path):
+    cache = ImageCache()
+    with pytest.raises(FileNotFoundError):
+        load_image(path=str(tmp_path / 'missing.png'), cache=cache)
+    assert len(cache) == 0
+
+
+def test_image_cache_value_error():
+    with pytest.raises(ValueError, match='max_bytes must be'):
+        ImageCache(max_bytes=-1)
@@ -0,0 +1,152 @@
+import subprocess
+import sys
+
+import cv2
+import numpy as np
+import pytest
+
+import pictokit.element_wise as elw
+from pictokit.cli import build_transforms, find_images, main_cli
+from pictokit.controls import equalize_histogram
+
+
+@pytest.fixture
+def tree(tmp_path, color_u8):
+    src = tmp_path / 'in'
+    (src / 'sub').mkdir(parents=True)
+    cv2.imwrite(str(src / 'a.png'), color_u8)
+    cv2.imwrite(str(src / 'sub' / 'b.png'), 255 - color_u8)
+    (src / 'notes.txt').write_text('not an image')
+    return src
+
+
+def test_build_transforms_composes_point_ops(color_u8):
+    ops = [
+        ('contrast', (30, 200)),
+        ('negative', ()),
+        ('equalize', ()),
+        ('negative', ()),
+    ]
+    transforms = build_transforms(ops)
+    assert len(transforms) == 3  # noqa: PLR2004
+
+    lut = elw.point_lut(elw.pixel_expansion, {'low_limit': 30, 'high_limit': 200})
+    expected = 255 - equalize_histogram(255 - elw.apply_lut(color_u8, lut))
+    result = color_u8
+    for transform in transforms:
+        result = transform(result)
+    np.testing.assert_array_equal(result, expected)
+
+
+def test_build_transforms_invalid():
+    with pytest.raises(ValueError, match='strictly less'):
+        build_transforms([('contrast', (200, 30))])
+
+
+def test_find_images_keeps_layout(tree, tmp_path):
+    out = str(tmp_path / 'out')
+    pairs = list(find_images([str(tree), str(tree / 'a.png')], out))
+    assert [dst for _, dst in pairs] == [
+        f'{out}/a.png',
+        f'{out}/sub/b.png',
+        f'{out}/a.png',
+    ]
+
+
+def test_find_images_skips_nested_output_dir(tree):
+    out = tree / 'sub' / 'out'
+    out.mkdir()
+    cv2.imwrite(str(out / 'b.png'), np.zeros((2, 2), np.uint8))
+    pairs = list(find_images([str(tree)], str(out)))
+    assert [src for src, _ in pairs] == [str(tree / 'a.png'), str(tree / 'sub/b.png')]
+
+    # Run twice: the first results must not be processed again
+    assert main_cli([str(tree), '-o', str(out), '--quiet']) == 0
+    assert main_cli([str(tree), '-o', str(out), '--quiet']) == 0
+    assert sorted(p.name for p in out.rglob('*.png')) == ['a.png', 'b.png', 'b.png']
+
+    (tree / 'link.png').symlink_to(out / 'a.png')
+    assert len(list(find_images([str(tree)], str(out)))) == 2  # noqa: PLR2004
+    assert len(list(find_images([str(out)], str(out)))) == 3  # noqa: PLR2004
+
+
+def test_main_cli_writes_chain(tree, tmp_path, color_u8, capsys):
+    out = tmp_path / 'out'
+    argv = [str(tree), '-o', str(out), '--threshold', '100', '255', '--negative']
+    assert main_cli([*argv, '-j', '2']) == 0
+
+    lut = elw.compose_luts(
+        elw.point_lut(elw.pixel_thresholding, {'T': 100, 'A': 255}),
+        elw.point_lut(elw.pixel_digital_negative, {}),
+    )
+    np.testing.assert_array_equal(
+        cv2.imread(str(out / 'a.png')), elw.apply_lut(color_u8, lut)
+    )
+    assert (out / 'sub' / 'b.png').exists()
+    assert '2 written, 0 skipped, 0 failed' in capsys.readouterr().err
+
+    assert main_cli([*argv, '--skip-existing']) == 0
+    assert '0 written, 2 skipped' in capsys.readouterr().err
+
+
+def test_main_cli_reports_failures(tree, tmp_path, capsys):
+    (tree / 'broken.png').write_bytes(b'not a png')
+    assert main_cli([str(tree), '-o', str(tmp_path / 'out'), '--quiet']) == 1
+    err = capsys.readouterr().err
+    assert 'broken.png' in err
+    assert 'written' not in err
+
+
+def test_main_cli_continues_after_unsupported_depth(tree, tmp_path, capsys):
+    cv2.imwrite(str(tree / 'deep.png'), np.full((4, 5), 1000, np.uint16))
+    out = tmp_path / 'out'
+    assert main_cli([str(tree), '-o', str(out), '--negative']) == 1
+    err = capsys.readouterr().err
+    assert 'error:' in err
+    assert 'deep.png' in err
+    assert '2 written, 0 skipped, 1 failed' in err
+    assert (out / 'sub' / 'b.png').exists()
+
+
+@pytest.mark.parametrize(
+    'argv',
+    [
+        ['missing_dir', '-o', 'out'],
+        ['.', '-o', 'out', '--jobs', '0'],
+        ['.', '-o', 'out', '--threshold', '300', '255'],
+    ],
+)
+def test_main_cli_usage_errors(argv):
+    with pytest.raises(SystemExit) as exc:
+        main_cli(argv)
+    assert exc.value.code == 2  # noqa: PLR2004
+
+
+def test_main_cli_rejects_colliding_outputs(tmp_path, gray_u8, capsys):
+    for name in ('a', 'b'):
+        (tmp_path / name).mkdir()
+        cv2.imwrite(str(tmp_path / name / 'x.png'), gray_u8)
+    out = tmp_path / 'out'
+    dirs = [str(tmp_path / 'a'), str(tmp_path / 'b')]
+    files = [str(tmp_path / name / 'x.png') for name in ('a', 'b')]
+    for inputs in (dirs, files):
+        with pytest.raises(SystemExit) as exc:
+            main_cli([*inputs, '-o', str(out), '--negative', '-j', '2'])
+        assert exc.value.code == 2  # noqa: PLR2004
+        assert 'would both be written to' in capsys.readouterr().err
+    assert not out.exists()
+
+    assert main_cli([files[0], files[0], '-o', str(out)]) == 0
+    assert '1 written' in capsys.readouterr().err
+
+
+def test_cli_is_headless(tree, tmp_path):
+    code = (
+        'import sys\n'
+        'from pictokit.cli import main_cli\n'
+        f'status = main_cli([{str(tree)!r}, "-o", {str(tmp_path / "out")!r}, '
+        '"--equalize", "-q"])\n'
+        'assert "matplotlib" not in sys.modules\n'
+        'sys.exit(status)\n'
+    )
+    subprocess.run([sys.executable, '-c', code], check=True)
@@ -2,7 +2,17 @@ import numpy as np
 import pytest
 from beartype.roar import BeartypeCallHintParamViolation
 
-from pictokit.common import validate_imgarray
+import pictokit.element_wise as elw
+from pictokit.common import (
+    as_contiguous,
+    describe_layout,
+    get_copy_stats,
+    get_validation_level,
+    reset_copy_stats,
+    set_validation_level,
+    validate_imgarray,
+    validate_imgbatch,
+)
 
 
 # -----------------------------
@@ -89,3 +99,118 @@ def test_validate_imgarray_type_error_param_img_arr(bad_img, mode):
 def test_validate_imgarray_type_error_param_mode(good_img, bad_mode):
     with pytest.raises(BeartypeCallHintParamViolation, match='violates type hint'):
         validate_imgarray(good_img, mode=bad_mode)
+
+
+@pytest.mark.parametrize(
+    ('batch', 'mode', 'shape'),
+    [
+        (np.zeros((2, 4, 5), dtype=np.uint8), 'gray', (2, 4, 5)),
+        (np.zeros((2, 4, 5, 3), dtype=np.uint8), 'color', (2, 4, 5, 3)),
+        ([gray(4, 5), gray(4, 5), gray(4, 5)], 'any', (3, 4, 5)),
+        ((color(2, 2), color(2, 2)), 'color', (2, 2, 2, 3)),
+    ],
+)
+def test_validate_imgbatch_accept(batch, mode, shape):
+    out = validate_imgbatch(batch, mode=mode)
+    assert out.shape == shape
+    if isinstance(batch, np.ndarray):
+        assert out is batch
+
+
+@pytest.mark.parametrize(
+    ('batch', 'mode', 'error', 'msg'),
+    [
+        ([], 'any', ValueError, 'at least one image'),
+        (np.zeros((0, 4, 4), dtype=np.uint8), 'any', ValueError, 'at least one'),
+        (gray(4, 4), 'any', ValueError, 'Invalid batch shape'),
+        ([gray(4, 4), gray(4, 5)], 'any', ValueError, 'same shape'),
+        (np.zeros((2, 4, 4), dtype=np.uint8), 'color', ValueError, 'Expected color'),
+        (np.zeros((2, 4, 4), dtype=np.int16), 'any', TypeError, 'dtype uint8'),
+    ],
+)
+def test_validate_imgbatch_errors(batch, mode, error, msg):
+    with pytest.raises(error, match=msg):
+        validate_imgbatch(batch, mode=mode)
+
+
+@pytest.mark.parametrize('level', ['full', 'boundary', 'off'])
+def test_set_validation_level(level, monkeypatch):
+    monkeypatch.setattr('pictokit.common._validation_level', 'full')
+    set_validation_level(level)
+    assert get_validation_level() == level
+
+
+def test_set_validation_level_type_error():
+    with pytest.raises(BeartypeCallHintParamViolation):
+        set_validation_level('none')
+
+
+# -----------------------------
+# Memory layout
+# -----------------------------
+@pytest.fixture
+def big():
+    return np.arange(20 * 30 * 3, dtype=np.uint8).reshape(20, 30, 3)
+
+
+@pytest.mark.parametrize(
+    ('view', 'contiguous', 'rows'),
+    [
+        (lambda a: a, True, True),
+        (lambda a: a[2:8, 5:15], False, True),
+        (lambda a: a[::2], False, True),
+        (lambda a: a[..., 0], False, False),
+        (lambda a: a.transpose(1, 0, 2), False, False),
+        (lambda a: a[:, ::-1], False, False),
+    ],
+)
+def test_describe_layout(big, view, contiguous, rows):
+    layout = describe_layout(view(big))
+    assert layout.contiguous is contiguous
+    assert layout.rows is rows
+
+
+def test_validate_imgarray_layout(big):
+    crop = big[2:8, 5:15]
+    assert validate_imgarray(crop, layout='rows') is crop
+    with pytest.raises(ValueError, match="'contiguous' layout"):
+        validate_imgarray(crop, layout='contiguous')
+    with pytest.raises(ValueError, match='as_contiguous'):
+        validate_imgarray(big[..., 0], layout='rows')
+
+
+def test_as_contiguous_counts_copies(big):
+    reset_copy_stats()
+    crop = big[2:8, 5:15]
+    assert as_contiguous(crop, 'rows') is crop
+    assert get_copy_stats() == {'copies': 0, 'bytes': 0}
+
+    out = as_contiguous(crop)
+    assert out.flags.c_contiguous
+    np.testing.assert_array_equal(out, crop)
+    assert get_copy_stats() == {'copies': 1, 'bytes': crop.nbytes}
+
+    reset_copy_stats()
+    assert get_copy_stats()['copies'] == 0
+
+
+def test_apply_lut_copies_only_strided_rows(big):
+    lut = 255 - np.arange(256, dtype=np.uint8)
+    reset_copy_stats()
+    crop = big[2:8, 5:15]
+    np.testing.assert_array_equal(elw.apply_lut(crop, lut), 255 - crop)
+    assert get_copy_stats()['copies'] == 0
+
+    channel = big[..., 1]
+    np.testing.assert_array_equal(elw.apply_lut(channel, lut), 255 - channel)
+    assert get_copy_stats()['copies'] == 1
+
+
+def test_apply_lut_into_crop(big):
+    lut = 255 - np.arange(256, dtype=np.uint8)
+    canvas = np.zeros_like(big)
+    src = big[:6, :10]
+    dst = canvas[2:8, 5:15]
+    assert elw.apply_lut(src, lut, out=dst) is dst
+    np.testing.assert_array_equal(canvas[2:8, 5:15], 255 - src)
+    assert not canvas[:2].any()
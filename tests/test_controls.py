@@ -1,10 +1,23 @@
 # ruff: noqa: PLR2004
+import os
+
 import cv2 as _cv2
 import numpy as np
 import pytest
 
 from pictokit.constants import GREY_SCALE_DIM, RGB_CHANNELS, RGB_DIM
-from pictokit.controls import calculate_histogram, load_image
+from pictokit.controls import (
+    auto_contrast,
+    auto_contrast_lut,
+    calculate_histogram,
+    encode_image,
+    equalization_lut,
+    equalize_adaptive,
+    equalize_histogram,
+    load_image,
+    percentile_limits,
+    save_image,
+)
 
 
 @pytest.mark.parametrize(
@@ -101,6 +114,11 @@ def test_load_image_accept(kwargs, check, monkeypatch, gray_u8, color_u8):
             'auto_convert': False,
         }),
         ({'img_arr': np.zeros((6, 6, 4), dtype=np.uint8), 'mode': 'color'}),
+        ({'data': b'not an image'}),
+        ({'data': b''}),
+        ({'data': bytes(10), 'shape': (3, 3)}),
+        ({'data': bytes(9), 'path': 'x.png'}),
+        ({'img_arr': np.zeros((3, 3), dtype=np.uint8), 'shape': (3, 3)}),
     ],
 )
 def test_load_image_value_error(kwargs):
@@ -211,3 +229,319 @@ def test_load_image_limits_on_dims(arr, mode, auto_convert, should_pass, monkeyp
 def test_calculate_histogram_accept(img, bins, expected_check):
     h = calculate_histogram(img, bins=bins)
     assert expected_check(h)
+
+
+def naive_histogram(img, bins=256):
+    return np.array([np.count_nonzero(img == px) for px in range(bins)])
+
+
+@pytest.mark.parametrize('fixture', ['gray_u8', 'color_u8', 'image_obj'])
+def test_calculate_histogram_matches_naive(fixture, request):
+    img = request.getfixturevalue(fixture)
+    h = calculate_histogram(img)
+    assert h.dtype == np.int64
+    assert np.array_equal(h, naive_histogram(img))
+
+
+@pytest.mark.parametrize(
+    'view', [np.s_[:, ::2], np.s_[::2], np.s_[..., ::-1], np.s_[:, :0]]
+)
+def test_calculate_histogram_color_views(view, color_u8):
+    img = color_u8[view]
+    assert np.array_equal(calculate_histogram(img), naive_histogram(img))
+
+
+@pytest.mark.parametrize('dtype', [np.uint8, np.int32, np.float64])
+def test_calculate_histogram_scalar(dtype):
+    h = calculate_histogram(np.array(5, dtype=dtype))
+    assert np.array_equal(h, np.eye(256, dtype=np.int64)[5])
+
+
+def test_calculate_histogram_channels(color_u8):
+    h = calculate_histogram(color_u8, channels=True)
+    assert h.shape == (3, 256)
+    for c in range(3):
+        assert np.array_equal(h[c], naive_histogram(color_u8[..., c]))
+
+
+@pytest.mark.parametrize('fixture', ['gray_u8', 'color_u8'])
+@pytest.mark.parametrize('mask_dtype', [bool, np.uint8, np.int32])
+def test_calculate_histogram_mask(fixture, mask_dtype, request):
+    img = request.getfixturevalue(fixture)
+    mask = np.zeros(img.shape[:2], dtype=mask_dtype)
+    mask[2:5, 3:7] = 1
+    h = calculate_histogram(img, mask=mask)
+    assert np.array_equal(h, naive_histogram(img[2:5, 3:7]))
+
+
+def test_calculate_histogram_out_and_accumulate(gray_u8):
+    out = np.full(256, 7, dtype=np.int64)
+    h = calculate_histogram(gray_u8, out=out)
+    assert h is out
+    assert np.array_equal(out, naive_histogram(gray_u8))
+
+    calculate_histogram(gray_u8, out=out, accumulate=True)
+    assert np.array_equal(out, 2 * naive_histogram(gray_u8))
+
+
+def test_calculate_histogram_bands(monkeypatch, gray_u8, color_u8):
+    monkeypatch.setattr('pictokit.controls.HIST_BAND_PIXELS', 7)
+    assert np.array_equal(calculate_histogram(gray_u8), naive_histogram(gray_u8))
+    h = calculate_histogram(color_u8, channels=True)
+    assert np.array_equal(h[1], naive_histogram(color_u8[..., 1]))
+
+
+@pytest.mark.parametrize(
+    ('kwargs', 'msg'),
+    [
+        ({'bins': 0}, 'bins must be greater'),
+        ({'channels': True}, 'Per-channel histograms require'),
+        ({'mask': np.ones((3, 3), dtype=bool)}, 'mask must have shape'),
+        ({'out': np.zeros(10, dtype=np.int64)}, 'out must have shape'),
+        ({'accumulate': True}, 'requires an'),
+    ],
+)
+def test_calculate_histogram_value_error(kwargs, msg, gray_u8):
+    with pytest.raises(ValueError, match=msg):
+        calculate_histogram(gray_u8, **kwargs)
+
+
+@pytest.fixture
+def low_contrast():
+    rng = np.random.default_rng(4)
+    return rng.normal(100, 15, size=(100, 130, 3)).clip(0, 255).astype(np.uint8)
+
+
+@pytest.mark.parametrize('shape', [(100, 130), (37, 201), (1, 1)])
+def test_equalize_histogram_matches_opencv(shape, low_contrast):
+    img = np.ascontiguousarray(np.resize(low_contrast[..., 0], shape))
+    assert np.array_equal(equalize_histogram(img), _cv2.equalizeHist(img))
+
+
+def test_equalize_histogram_color_is_per_channel(low_contrast):
+    out = equalize_histogram(low_contrast)
+    for c in range(3):
+        channel = np.ascontiguousarray(low_contrast[..., c])
+        assert np.array_equal(out[..., c], _cv2.equalizeHist(channel))
+
+
+@pytest.mark.parametrize(
+    ('luma', 'forward', 'inverse'),
+    [
+        (True, _cv2.COLOR_BGR2YCrCb, _cv2.COLOR_YCrCb2BGR),
+        ('lab', _cv2.COLOR_BGR2Lab, _cv2.COLOR_Lab2BGR),
+    ],
+)
+def test_equalize_histogram_luma(low_contrast, luma, forward, inverse):
+    converted = _cv2.cvtColor(low_contrast, forward)
+    converted[..., 0] = _cv2.equalizeHist(np.ascontiguousarray(converted[..., 0]))
+    expected = _cv2.cvtColor(converted, inverse)
+    assert np.array_equal(equalize_histogram(low_contrast, luma=luma), expected)
+
+
+def test_equalization_lut_constant_image_is_identity():
+    hist = calculate_histogram(np.full((4, 4), 77, dtype=np.uint8))
+    assert np.array_equal(equalization_lut(hist), np.arange(256))
+    assert equalization_lut(np.stack([hist, hist])).shape == (256, 2)
+
+
+@pytest.mark.parametrize(
+    ('tiles', 'clip_limit'),
+    [((8, 8), 2.0), ((3, 5), 1.0), ((4, 4), 0.01), ((1, 1), 40.0), ((7, 3), None)],
+)
+@pytest.mark.parametrize('channels', [1, 3])
+def test_equalize_adaptive_matches_opencv(tiles, clip_limit, channels, low_contrast):
+    img = low_contrast[..., 0] if channels == 1 else low_contrast
+    # OpenCV disables clipping with a non-positive limit
+    clahe = _cv2.createCLAHE(clip_limit or 0, (tiles[1], tiles[0]))
+    planes = [np.ascontiguousarray(p) for p in np.atleast_3d(img).transpose(2, 0, 1)]
+    expected = np.dstack([clahe.apply(p) for p in planes]).reshape(img.shape)
+
+    assert np.array_equal(
+        equalize_adaptive(img, tiles=tiles, clip_limit=clip_limit), expected
+    )
+
+
+@pytest.mark.parametrize(
+    ('kwargs', 'msg'),
+    [
+        ({'tiles': (0, 2)}, 'tiles must be positive'),
+        ({'tiles': (11, 2)}, 'tiles must be positive'),
+        ({'clip_limit': 0.0}, 'clip_limit must be greater'),
+    ],
+)
+def test_equalize_adaptive_value_error(kwargs, msg, gray_u8):
+    with pytest.raises(ValueError, match=msg):
+        equalize_adaptive(gray_u8, **kwargs)
+
+
+@pytest.mark.parametrize('percentiles', [(0, 100), (1, 99), (5, 50), (30, 30)])
+def test_percentile_limits_matches_numpy(percentiles, low_contrast):
+    img = low_contrast[..., 0]
+    low, high = percentile_limits(calculate_histogram(img), percentiles)
+    # The low limit is the first intensity with more than low% of the pixels
+    # at or below it
+    assert np.count_nonzero(img <= low) > percentiles[0] / 100 * img.size
+    assert np.count_nonzero(img < low) <= percentiles[0] / 100 * img.size
+    assert high == np.percentile(img, percentiles[1], method='inverted_cdf')
+
+
+def test_percentile_limits_min_max_per_channel(color_u8):
+    limits = percentile_limits(calculate_histogram(color_u8, channels=True), (0, 100))
+    assert limits.shape == (3, 2)
+    assert np.array_equal(limits[:, 0], color_u8.min(axis=(0, 1)))
+    assert np.array_equal(limits[:, 1], color_u8.max(axis=(0, 1)))
+
+
+@pytest.mark.parametrize(
+    ('hist', 'percentiles', 'msg'),
+    [
+        (np.ones(256, np.int64), (50, 10), 'percentiles must satisfy'),
+        (np.ones(256, np.int64), (-1, 10), 'percentiles must satisfy'),
+        (np.zeros(256, np.int64), (1, 99), 'empty histogram'),
+    ],
+)
+def test_percentile_limits_value_error(hist, percentiles, msg):
+    with pytest.raises(ValueError, match=msg):
+        percentile_limits(hist, percentiles)
+
+
+def test_auto_contrast_matches_explicit_limits(low_contrast):
+    img = low_contrast[..., 0]
+    low, high = np.percentile(img, [0, 100]).astype(int)
+    expected = np.where(
+        (img > low) & (img < high), 255 / (high - low) * (img - low), img
+    )
+    out = auto_contrast(img, percentiles=(0, 100))
+    assert np.array_equal(out, expected.astype(np.uint8))
+
+
+def test_auto_contrast_per_channel(low_contrast):
+    out = auto_contrast(low_contrast, channels=True)
+    for c in range(3):
+        channel = np.ascontiguousarray(low_contrast[..., c])
+        assert np.array_equal(out[..., c], auto_contrast(channel))
+
+
+def test_auto_contrast_luma(low_contrast):
+    converted = _cv2.cvtColor(low_contrast, _cv2.COLOR_BGR2YCrCb)
+    converted[..., 0] = auto_contrast(np.ascontiguousarray(converted[..., 0]))
+    expected = _cv2.cvtColor(converted, _cv2.COLOR_YCrCb2BGR)
+    assert np.array_equal(auto_contrast(low_contrast, luma=True), expected)
+
+
+@pytest.mark.parametrize(
+    ('func', 'kwargs', 'msg'),
+    [
+        (auto_contrast, {'luma': True, 'channels': True}, 'cannot be combined'),
+        (equalize_histogram, {'luma': 'lab'}, r'\(H, W, 3\)'),
+    ],
+)
+def test_luma_errors(low_contrast, func, kwargs, msg):
+    img = low_contrast if 'channels' in kwargs else low_contrast[..., 0].copy()
+    with pytest.raises(ValueError, match=msg):
+        func(img, **kwargs)
+
+
+def test_auto_contrast_lut_constant_image_is_identity():
+    hist = calculate_histogram(np.full((4, 4), 77, dtype=np.uint8))
+    assert np.array_equal(auto_contrast_lut(hist), np.arange(256))
+
+
+@pytest.mark.parametrize('scale', [2, 4, 8])
+@pytest.mark.parametrize(('mode', 'ndim'), [('gray', 2), ('color', 3), ('any', 3)])
+def test_load_image_scale(scale, mode, ndim, tmp_path, low_contrast):
+    path = str(tmp_path / 'img.jpg')
+    _cv2.imwrite(path, low_contrast)
+    height, width = low_contrast.shape[:2]
+
+    img = load_image(path=path, mode=mode, scale=scale)
+    assert img.ndim == ndim
+    assert img.shape[:2] == (-(-height // scale), -(-width // scale))
+    full = load_image(path=path, mode=mode)
+    small = _cv2.resize(full, img.shape[1::-1], interpolation=_cv2.INTER_AREA)
+    assert np.abs(img.astype(int) - small).mean() < 3
+
+
+def test_load_image_scale_array(low_contrast):
+    img = load_image(img_arr=low_contrast, scale=4)
+    assert img.shape == (25, 33, 3)
+    assert np.array_equal(
+        img, _cv2.resize(low_contrast, (33, 25), interpolation=_cv2.INTER_AREA)
+    )
+    assert load_image(img_arr=low_contrast, scale=1) is low_contrast
+
+
+def test_load_image_scale_uses_reduced_decode(monkeypatch):
+    flags = []
+    monkeypatch.setattr(
+        'pictokit.controls.cv2.imread',
+        lambda path, flag: flags.append(flag) or np.zeros((4, 4), np.uint8),
+    )
+    load_image(path='img.jpg', mode='gray', scale=4)
+    assert flags == [_cv2.IMREAD_REDUCED_GRAYSCALE_4]
+
+
+@pytest.mark.parametrize('fixture', ['gray_u8', 'color_u8'])
+@pytest.mark.parametrize('ext', ['.png', '.bmp'])
+def test_save_image_lossless_roundtrip(fixture, ext, tmp_path, request):
+    img = request.getfixturevalue(fixture)
+    path = str(tmp_path / f'img{ext}')
+    save_image(path, img)
+    assert np.array_equal(load_image(path=path), img)
+
+
+def test_save_image_options(tmp_path, low_contrast):
+    sizes = {}
+    for quality in (10, 95):
+        path = str(tmp_path / f'q{quality}.jpg')
+        save_image(path, low_contrast, quality=quality)
+        sizes[quality] = os.path.getsize(path)
+    assert sizes[10] < sizes[95]
+
+    fast = encode_image(low_contrast, '.png', compression=0)
+    small = encode_image(low_contrast, '.png', compression=9)
+    assert len(small) < len(fast)
+    decoded = _cv2.imdecode(np.frombuffer(small, np.uint8), _cv2.IMREAD_UNCHANGED)
+    assert np.array_equal(decoded, low_contrast)
+
+
+@pytest.mark.parametrize(
+    ('path', 'kwargs', 'msg'),
+    [
+        ('img.png', {'quality': 50}, 'quality applies to JPEG'),
+        ('img.jpg', {'compression': 3}, 'compression applies to PNG'),
+        ('img.jpg', {'quality': 101}, 'quality must be in the range'),
+        ('img.png', {'compression': 10}, 'compression must be in the range'),
+        ('img.unknown', {}, 'Cannot encode'),
+    ],
+)
+def test_save_image_value_error(path, kwargs, msg, tmp_path, gray_u8):
+    with pytest.raises(ValueError, match=msg):
+        save_image(str(tmp_path / path), gray_u8, **kwargs)
+
+
+def test_save_image_os_error(tmp_path, gray_u8):
+    with pytest.raises(OSError, match='Could not write'):
+        save_image(str(tmp_path / 'missing' / 'img.png'), gray_u8)
+
+
+@pytest.mark.parametrize('wrap', [bytes, bytearray, memoryview])
+@pytest.mark.parametrize('fixture', ['gray_u8', 'color_u8'])
+def test_load_image_from_encoded_data(wrap, fixture, request):
+    img = request.getfixturevalue(fixture)
+    data = wrap(encode_image(img))
+    assert np.array_equal(load_image(data=data), img)
+    assert load_image(data=data, mode='color').shape == (*img.shape[:2], 3)
+
+
+def test_load_image_from_raw_data_is_zero_copy(color_u8):
+    raw = bytearray(color_u8.tobytes())
+    img = load_image(data=raw, shape=color_u8.shape)
+    assert np.array_equal(img, color_u8)
+    assert np.shares_memory(img, np.frombuffer(raw, np.uint8))
+
+    # Any buffer-protocol object, through a memoryview
+    img = load_image(data=memoryview(color_u8), shape=color_u8.shape)
+    assert np.shares_memory(img, color_u8)
+    assert not load_image(data=bytes(raw), shape=color_u8.shape).flags.writeable
@@ -0,0 +1,136 @@
+import cv2
+import numpy as np
+import pytest
+
+from pictokit.controls import calculate_histogram
+from pictokit.dataset import DatasetHistogram, aggregate_histograms
+
+
+def images(n, shape=(12, 15, 3)):
+    rng = np.random.default_rng(7)
+    return [rng.integers(0, 256, size=shape, dtype=np.uint8) for _ in range(n)]
+
+
+def expected_hist(arrays):
+    return sum(calculate_histogram(a, channels=True) for a in arrays)
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    arrays = images(5)
+    for i, arr in enumerate(arrays):
+        cv2.imwrite(str(tmp_path / f'img_{i}.png'), arr)
+    return tmp_path, arrays
+
+
+def test_aggregate_paths_in_processes(dataset):
+    root, arrays = dataset
+    result = aggregate_histograms(str(root / '*.png'), workers=2)
+    assert result.images == len(arrays)
+    np.testing.assert_array_equal(result.hist, expected_hist(arrays))
+
+
+def test_aggregate_arrays_statistics():
+    arrays = images(4)
+    result = aggregate_histograms(iter(arrays), workers=2)
+    pixels = np.stack(arrays)
+
+    assert result.pixels == pixels[..., 0].size
+    assert result.mean() == pytest.approx(pixels.mean())
+    np.testing.assert_allclose(result.mean(channels=True), pixels.mean(axis=(0, 1, 2)))
+    q = [0, 1, 50, 99, 100]
+    np.testing.assert_array_equal(
+        result.percentile(q), np.percentile(pixels, q, method='inverted_cdf')
+    )
+    np.testing.assert_array_equal(
+        result.percentile(50, channels=True),
+        [np.percentile(pixels[..., c], 50, method='inverted_cdf') for c in range(3)],
+    )
+
+
+def test_aggregate_gray_dataset():
+    arrays = images(3, shape=(9, 10))
+    result = aggregate_histograms(arrays, workers=1)
+    assert result.hist.shape == (1, 256)
+    np.testing.assert_array_equal(
+        result.histogram(), sum(calculate_histogram(a) for a in arrays)
+    )
+
+
+def test_aggregate_resumes_from_checkpoint(tmp_path):
+    arrays = images(6)
+    checkpoint = str(tmp_path / 'progress.npz')
+
+    def interrupted():
+        yield from arrays[:4]
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        aggregate_histograms(interrupted(), workers=1, checkpoint=checkpoint)
+    partial = DatasetHistogram.load(checkpoint)
+    assert 0 < partial.images <= 4  # noqa: PLR2004
+
+    result = aggregate_histograms(arrays, workers=2, checkpoint=checkpoint)
+    assert result.images == len(arrays)
+    np.testing.assert_array_equal(result.hist, expected_hist(arrays))
+
+
+def test_aggregate_checkpoint_every(tmp_path, monkeypatch):
+    saved = []
+    monkeypatch.setattr(
+        DatasetHistogram, 'save', lambda self, path: saved.append(self.images)
+    )
+    aggregate_histograms(
+        images(5), workers=1, checkpoint=str(tmp_path / 'c.npz'), checkpoint_every=2
+    )
+    assert saved == [2, 4, 5]
+
+
+def test_aggregate_skip_errors(dataset):
+    root, arrays = dataset
+    (root / 'broken.png').write_bytes(b'not a png')
+    paths = sorted(str(p) for p in root.glob('*.png'))
+
+    with pytest.raises(FileNotFoundError):
+        aggregate_histograms(paths, workers=1, executor='thread')
+    result = aggregate_histograms(paths, workers=1, skip_errors=True)
+    assert (result.images, result.skipped) == (len(arrays), 1)
+    np.testing.assert_array_equal(result.hist, expected_hist(arrays))
+
+
+def test_aggregate_mixed_channels():
+    sources = [*images(1), *images(1, shape=(4, 4))]
+    with pytest.raises(ValueError, match="mode='gray'"):
+        aggregate_histograms(sources, workers=1)
+    result = aggregate_histograms(sources, mode='color', workers=1)
+    assert result.images == 2  # noqa: PLR2004
+
+
+def test_aggregate_empty():
+    result = aggregate_histograms([], workers=1)
+    assert result.images == 0
+    with pytest.raises(ValueError, match='empty histogram'):
+        result.mean()
+
+
+def test_merge_and_save(tmp_path):
+    a = aggregate_histograms(images(2), workers=1)
+    b = aggregate_histograms(images(3), workers=1)
+    merged = a.merge(b)
+    assert merged.images == 5  # noqa: PLR2004
+    np.testing.assert_array_equal(merged.hist, a.hist + b.hist)
+
+    path = str(tmp_path / 'hist.npz')
+    merged.save(path)
+    loaded = DatasetHistogram.load(path)
+    np.testing.assert_array_equal(loaded.hist, merged.hist)
+    assert (loaded.images, loaded.skipped) == (5, 0)
+
+    with pytest.raises(ValueError, match='Cannot merge'):
+        a.merge(DatasetHistogram(np.zeros((1, 256), np.int64)))
+
+
+@pytest.mark.parametrize('kwargs', [{'workers': 0}, {'checkpoint_every': 0}])
+def test_aggregate_invalid_arguments(kwargs):
+    with pytest.raises(ValueError, match='must be greater than 0'):
+        aggregate_histograms([], **kwargs)
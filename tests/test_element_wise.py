@@ -1,3 +1,4 @@
+import cv2
 import numpy as np
 import pytest
 from beartype.roar import BeartypeCallHintParamViolation
@@ -123,3 +124,222 @@ def test_pixel_digital_negative_raise_value_error(invalid_pixel):
     """Test that out-of-range values raise a ValueError."""
     with pytest.raises(ValueError, match='must be in the range'):
         elw.pixel_digital_negative(invalid_pixel)
+
+
+@pytest.mark.parametrize(
+    ('func', 'args'),
+    [
+        (elw.pixel_expansion, {'low_limit': 100, 'high_limit': 110}),
+        (elw.pixel_expansion, {'low_limit': 0, 'high_limit': 255}),
+        (elw.pixel_thresholding, {'T': 127, 'A': 200}),
+        (elw.pixel_digital_negative, {}),
+        (elw.pixel_digital_negative, {'pixel': None}),
+    ],
+)
+def test_build_lut_matches_scalar_function(func, args):
+    params = {k: v for k, v in args.items() if k != 'pixel'}
+    lut = elw.build_lut(func, args)
+    assert lut.shape == (256,)
+    assert lut.dtype == np.uint8
+    assert all(lut[px] == func(pixel=px, **params) for px in range(256))
+
+
+def test_build_lut_raise_value_error():
+    with pytest.raises(ValueError, match='must be strictly less'):
+        elw.build_lut(elw.pixel_expansion, {'low_limit': 10, 'high_limit': 10})
+
+
+@pytest.mark.parametrize('shape', [(0,), (10, 12), (8, 9, 3)])
+def test_apply_lut_accept(shape):
+    img = np.random.default_rng(0).integers(0, 256, size=shape, dtype=np.uint8)
+    lut = np.arange(255, -1, -1, dtype=np.uint8)
+    out = elw.apply_lut(img, lut)
+    assert out.shape == img.shape
+    assert out.dtype == np.uint8
+    assert np.array_equal(out, 255 - img)
+
+
+@pytest.mark.parametrize('shape', [(0,), (10, 12), (8, 9, 3), (2, 4, 5, 3)])
+def test_apply_lut_out(shape):
+    img = np.random.default_rng(0).integers(0, 256, size=shape, dtype=np.uint8)
+    lut = np.arange(255, -1, -1, dtype=np.uint8)
+
+    out = np.empty_like(img)
+    assert elw.apply_lut(img, lut, out=out) is out
+    assert np.array_equal(out, 255 - img)
+
+    inplace = img.copy()
+    assert elw.apply_lut(inplace, lut, out=inplace) is inplace
+    assert np.array_equal(inplace, 255 - img)
+
+
+def test_apply_lut_non_contiguous_out():
+    img = np.random.default_rng(0).integers(0, 256, size=(6, 8), dtype=np.uint8)
+    buffer = np.zeros((6, 16), dtype=np.uint8)
+    out = elw.apply_lut(img, np.arange(255, -1, -1, dtype=np.uint8), out=buffer[:, ::2])
+    assert np.shares_memory(out, buffer)
+    assert np.array_equal(buffer[:, ::2], 255 - img)
+
+
+@pytest.mark.parametrize(
+    ('out', 'error'),
+    [
+        (np.empty((3, 3), dtype=np.uint8), ValueError),
+        (np.empty((4, 4), dtype=np.int16), TypeError),
+    ],
+)
+def test_apply_lut_out_errors(out, error):
+    with pytest.raises(error, match='out must have'):
+        elw.apply_lut(np.zeros((4, 4), np.uint8), np.zeros(256, np.uint8), out=out)
+
+
+@pytest.mark.parametrize('shape', [(0, 4, 3), (8, 9, 3), (2, 4, 5, 3), (6, 7, 2)])
+@pytest.mark.parametrize('contiguous', [True, False])
+def test_apply_lut_per_channel(shape, contiguous):
+    img = np.random.default_rng(0).integers(0, 256, size=shape, dtype=np.uint8)
+    lut = np.random.default_rng(1).integers(0, 256, (256, shape[-1]), dtype=np.uint8)
+    expected = np.stack([lut[img[..., c], c] for c in range(shape[-1])], axis=-1)
+
+    buffer = np.zeros((*shape[:-1], 2 * shape[-1]), dtype=np.uint8)
+    out = buffer[..., : shape[-1]] if not contiguous else None
+    assert np.array_equal(elw.apply_lut(img, lut, out=out), expected)
+
+
+def test_apply_lut_per_channel_mismatch():
+    lut = np.zeros((256, 3), np.uint8)
+    with pytest.raises(ValueError, match='does not match'):
+        elw.apply_lut(np.zeros((4, 4), np.uint8), lut)
+
+
+def test_compose_luts_per_channel():
+    rng = np.random.default_rng(0)
+    gray = rng.integers(0, 256, 256, dtype=np.uint8)
+    color = rng.integers(0, 256, (256, 3), dtype=np.uint8)
+    img = rng.integers(0, 256, (5, 6, 3), dtype=np.uint8)
+
+    for first, second in [(gray, color), (color, gray), (color, color)]:
+        expected = elw.apply_lut(elw.apply_lut(img, first), second)
+        composed = elw.compose_luts(first, second)
+        assert composed.shape == (256, 3)
+        assert np.array_equal(elw.apply_lut(img, composed), expected)
+
+    with pytest.raises(ValueError, match='Cannot compose'):
+        elw.compose_luts(color, np.zeros((256, 2), np.uint8))
+
+
+def test_cached_lut_reuses_table():
+    args = {'T': 12, 'A': 99}
+    lut = elw.cached_lut(elw.pixel_thresholding, args)
+    assert elw.cached_lut(elw.pixel_thresholding, dict(args)) is lut
+    assert not lut.flags.writeable
+    assert np.array_equal(lut, elw.build_lut(elw.pixel_thresholding, args))
+
+
+@pytest.mark.parametrize('validation', ['boundary', 'off'])
+@pytest.mark.parametrize(
+    ('func', 'args'),
+    [
+        (elw.pixel_expansion, {'low_limit': 0, 'high_limit': 255}),
+        (elw.pixel_expansion, {'low_limit': 100, 'high_limit': 110}),
+        (elw.pixel_expansion, {'low_limit': np.uint8(3), 'high_limit': np.uint8(7)}),
+        (elw.pixel_expansion, {'low_limit': 254, 'high_limit': 255}),
+        (elw.pixel_thresholding, {'T': 0, 'A': 255}),
+        (elw.pixel_thresholding, {'T': np.uint8(127), 'A': 10}),
+        (elw.pixel_digital_negative, {}),
+    ],
+)
+def test_point_lut_kernels_match_scalar(validation, func, args):
+    lut = elw.point_lut(func, args, validation=validation)
+    assert lut.dtype == np.uint8
+    assert np.array_equal(lut, elw.build_lut(func, args))
+
+
+def test_point_lut_kernels_match_scalar_sampled():
+    rng = np.random.default_rng(0)
+    for low, high in np.sort(rng.choice(256, size=(20, 2), replace=False), axis=1):
+        args = {'low_limit': int(low), 'high_limit': int(high)}
+        assert np.array_equal(
+            elw.point_lut(elw.pixel_expansion, args, validation='off'),
+            elw.build_lut(elw.pixel_expansion, args),
+        )
+
+
+@pytest.mark.parametrize('validation', ['full', 'boundary'])
+@pytest.mark.parametrize(
+    ('func', 'args', 'error', 'msg'),
+    [
+        (elw.pixel_expansion, {'low_limit': -1, 'high_limit': 10}, ValueError, '-1'),
+        (elw.pixel_expansion, {'low_limit': 9, 'high_limit': 9}, ValueError, 'less'),
+        (elw.pixel_thresholding, {'T': 300, 'A': 1}, ValueError, 'must be in'),
+        (elw.pixel_thresholding, {'T': 1.5, 'A': 1}, Exception, ''),
+    ],
+)
+def test_point_lut_checks(validation, func, args, error, msg):
+    with pytest.raises(error, match=msg):
+        elw.point_lut(func, args, validation=validation)
+
+
+def test_point_lut_off_skips_checks():
+    lut = elw.point_lut(elw.pixel_thresholding, {'T': 300, 'A': 1}, validation='off')
+    assert np.array_equal(lut, np.arange(256))
+
+
+def test_point_lut_uses_global_level(monkeypatch):
+    monkeypatch.setattr('pictokit.common._validation_level', 'off')
+    lut = elw.point_lut(elw.pixel_thresholding, {'T': 300, 'A': 1})
+    assert np.array_equal(lut, np.arange(256))
+
+
+def test_channel_lut_per_channel():
+    args = {'low_limit': [10, 20, 30], 'high_limit': 200}
+    lut = elw.channel_lut(elw.pixel_expansion, args, n_channels=3)
+    assert lut.shape == (256, 3)
+    for c, low in enumerate([10, 20, 30]):
+        expected = elw.point_lut(
+            elw.pixel_expansion, {'low_limit': low, 'high_limit': 200}
+        )
+        np.testing.assert_array_equal(lut[:, c], expected)
+
+
+def test_channel_lut_shared():
+    lut = elw.channel_lut(elw.pixel_thresholding, {'T': 100, 'A': 255}, 3)
+    np.testing.assert_array_equal(
+        lut, elw.point_lut(elw.pixel_thresholding, {'T': 100, 'A': 255})
+    )
+
+
+@pytest.mark.parametrize('n_channels', [None, 4])
+def test_channel_lut_mismatch(n_channels):
+    with pytest.raises(ValueError, match='one value per channel'):
+        elw.channel_lut(elw.pixel_thresholding, {'T': (1, 2, 3), 'A': 255}, n_channels)
+
+
+@pytest.mark.parametrize(
+    ('space', 'forward', 'inverse'),
+    [
+        ('ycrcb', cv2.COLOR_BGR2YCrCb, cv2.COLOR_YCrCb2BGR),
+        ('lab', cv2.COLOR_BGR2Lab, cv2.COLOR_Lab2BGR),
+    ],
+)
+def test_apply_luma_lut_matches_split_planes(color_u8, space, forward, inverse):
+    lut = 255 - np.arange(256, dtype=np.uint8)
+    converted = cv2.cvtColor(color_u8, forward)
+    converted[..., 0] = lut[converted[..., 0]]
+    expected = cv2.cvtColor(converted, inverse)
+
+    np.testing.assert_array_equal(elw.apply_luma_lut(color_u8, lut, space), expected)
+    out = np.empty_like(color_u8)
+    assert elw.apply_luma_lut(color_u8, lut, space, out=out) is out
+    np.testing.assert_array_equal(out, expected)
+
+
+@pytest.mark.parametrize(
+    ('img', 'lut', 'msg'),
+    [
+        (np.zeros((4, 5), np.uint8), np.arange(256, dtype=np.uint8), r'\(H, W, 3\)'),
+        (np.zeros((4, 5, 3), np.uint8), np.zeros((256, 3), np.uint8), 'shape'),
+    ],
+)
+def test_apply_luma_lut_errors(img, lut, msg):
+    with pytest.raises(ValueError, match=msg):
+        elw.apply_luma_lut(img, lut)
@@ -0,0 +1,72 @@
+# ruff: noqa: PLR2004
+import numpy as np
+import pytest
+
+from pictokit.history import State, TransformHistory
+
+
+def test_history_undo_redo_order():
+    history = TransformHistory()
+    states = [State(lut=np.full(256, i, np.uint8)) for i in range(3)]
+    history.push(State())
+    history.push(states[0])
+    current = states[1]
+
+    assert history.undo(current) is states[0]
+    assert history.undo(states[0]).is_initial
+    assert history.undo(State()) is None
+    assert history.redo(State()) is states[0]
+    assert history.can_redo
+
+    history.push(states[0])
+    assert not history.can_redo
+
+
+def test_history_max_steps_drops_oldest():
+    history = TransformHistory(max_steps=2)
+    states = [State(lut=np.full(256, i, np.uint8)) for i in range(3)]
+    for state in states:
+        history.push(state)
+    assert history.undo(State()) is states[2]
+    assert history.undo(states[2]) is states[1]
+    assert not history.can_undo
+
+
+def test_history_snapshots_are_evicted_lru_and_rebuilt():
+    rebuilt = []
+
+    def rebuild(value):
+        def func():
+            rebuilt.append(value)
+            return np.full((10, 10), value, np.uint8)
+
+        return func
+
+    history = TransformHistory(max_bytes=250)
+    first = history.snapshot(np.full((10, 10), 1, np.uint8), rebuild(1))
+    second = history.snapshot(np.full((10, 10), 2, np.uint8), rebuild(2))
+    assert history.nbytes == 200
+    assert not first.pixels.flags.writeable
+
+    history.pixels(first)  # first becomes the most recently used
+    history.snapshot(np.full((10, 10), 3, np.uint8), rebuild(3))
+    assert second.pixels is None
+    assert first.pixels is not None
+    assert history.nbytes == 200
+
+    assert np.all(history.pixels(second) == 2)
+    assert rebuilt == [2]
+    assert not second.pixels.flags.writeable
+
+
+def test_history_snapshot_without_rebuild_is_kept():
+    history = TransformHistory(max_bytes=0)
+    snapshot = history.snapshot(np.zeros((4, 4), np.uint8))
+    assert history.pixels(snapshot) is snapshot.pixels
+    assert history.nbytes == 0
+
+
+@pytest.mark.parametrize(('max_bytes', 'max_steps'), [(-1, 10), (10, 0)])
+def test_history_value_error(max_bytes, max_steps):
+    with pytest.raises(ValueError, match='max_bytes must be'):
+        TransformHistory(max_bytes=max_bytes, max_steps=max_steps)
@@ -0,0 +1,524 @@
+import subprocess
+import sys
+
+import cv2
+import numpy as np
+import pytest
+
+import pictokit
+import pictokit.element_wise as elw
+from pictokit import Image
+from pictokit.controls import auto_contrast, equalize_adaptive, equalize_histogram
+
+
+def per_pixel(img, func, args):
+    """Reference implementation: the original per-pixel Python loop."""
+    out = [int(func(pixel=px, **args)) for px in np.reshape(img, -1)]
+    return np.reshape(np.array(out, dtype=np.uint8), img.shape)
+
+
+@pytest.mark.parametrize('fixture', ['gray_u8', 'color_u8'])
+@pytest.mark.parametrize(
+    ('method', 'kwargs', 'func'),
+    [
+        (
+            'contrast_expansion',
+            {'low_limit': 50, 'high_limit': 180},
+            elw.pixel_expansion,
+        ),
+        ('thresholding', {'T': 127, 'A': 200}, elw.pixel_thresholding),
+        ('digital_negative', {}, elw.pixel_digital_negative),
+    ],
+)
+def test_image_point_ops_match_per_pixel(fixture, method, kwargs, func, request):
+    arr = request.getfixturevalue(fixture)
+    img = Image(img_arr=arr)
+    getattr(img, method)(**kwargs)
+
+    assert img.transform.shape == arr.shape
+    assert img.transform.dtype == np.uint8
+    assert np.array_equal(img.transform, per_pixel(arr, func, kwargs))
+
+
+def test_image_point_ops_chain_and_reset(gray_u8):
+    img = Image(img_arr=gray_u8)
+    img.digital_negative()
+    img.thresholding(T=100, A=255)
+
+    expected = per_pixel(gray_u8, elw.pixel_digital_negative, {})
+    expected = per_pixel(expected, elw.pixel_thresholding, {'T': 100, 'A': 255})
+    assert np.array_equal(img.transform, expected)
+
+    img.digital_negative(reset=True)
+    assert np.array_equal(img.transform, 255 - gray_u8)
+    assert np.array_equal(img.img, gray_u8)
+
+
+@pytest.mark.parametrize(
+    ('fixture', 'channels'), [('gray_u8', False), ('color_u8', True)]
+)
+def test_image_histogram_plots(fixture, channels, monkeypatch, request):
+    shown = []
+    monkeypatch.setattr('matplotlib.pyplot.show', lambda: shown.append(True))
+    img = Image(img_arr=request.getfixturevalue(fixture))
+    img.histogram(channels=channels)
+    assert shown == [True]
+
+
+def test_image_lazy_pipeline_fuses_point_ops(gray_u8, monkeypatch):
+    calls = []
+    apply_lut = elw._apply_lut
+
+    def counting_apply_lut(img, lut, **kwargs):
+        calls.append(img)
+        return apply_lut(img, lut, **kwargs)
+
+    monkeypatch.setattr(elw, '_apply_lut', counting_apply_lut)
+
+    eager = Image(img_arr=gray_u8)
+    lazy = Image(img_arr=gray_u8, lazy=True)
+    for img in (eager, lazy):
+        img.contrast_expansion(low_limit=30, high_limit=220)
+        img.digital_negative()
+        img.thresholding(T=90, A=10)
+        img.digital_negative()
+
+    assert len(calls) == 4  # noqa: PLR2004
+    assert np.array_equal(lazy.transform, eager.transform)
+    assert len(calls) == 5  # noqa: PLR2004
+    assert calls[-1] is gray_u8
+
+    lazy.compute()
+    assert len(calls) == 5  # noqa: PLR2004
+
+
+def test_image_lazy_pipeline_reset_and_continue(color_u8):
+    img = Image(img_arr=color_u8, lazy=True)
+    img.thresholding(T=100, A=255)
+    img.digital_negative(reset=True)
+    assert np.array_equal(img.compute(), 255 - color_u8)
+
+    img.digital_negative()
+    assert np.array_equal(img.transform, color_u8)
+
+
+@pytest.mark.parametrize('fixture', ['gray_u8', 'color_u8'])
+def test_image_point_ops_out_and_inplace(fixture, request):
+    arr = request.getfixturevalue(fixture)
+    img = Image(img_arr=arr)
+    out = np.empty_like(arr)
+
+    img.digital_negative(out=out)
+    assert img.transform is out
+    assert np.array_equal(out, 255 - arr)
+
+    img.thresholding(T=100, A=0, inplace=True)
+    img.digital_negative(reset=True, inplace=True)
+    assert img.transform is out
+    assert np.array_equal(out, 255 - arr)
+    assert np.array_equal(img.img, arr)
+
+
+def test_image_lazy_out(gray_u8):
+    img = Image(img_arr=gray_u8, lazy=True)
+    out = np.empty_like(gray_u8)
+    img.digital_negative(out=out)
+    img.digital_negative()
+    assert img.compute() is out
+    assert np.array_equal(out, gray_u8)
+
+
+@pytest.mark.parametrize('fixture', ['gray_u8', 'color_u8'])
+def test_image_equalize(fixture, request):
+    arr = request.getfixturevalue(fixture)
+    img = Image(img_arr=arr)
+    img.equalize()
+    assert np.array_equal(img.transform, equalize_histogram(arr))
+
+    img.contrast_expansion(low_limit=40, high_limit=200, reset=True)
+    expanded = img.transform
+    img.equalize()
+    assert np.array_equal(img.transform, equalize_histogram(expanded))
+
+
+@pytest.mark.parametrize('fixture', ['gray_u8', 'color_u8'])
+def test_image_lazy_equalize_matches_eager(fixture, request, monkeypatch):
+    arr = request.getfixturevalue(fixture)
+    calls = []
+    apply_lut = elw._apply_lut
+
+    def counting_apply_lut(img, lut, **kwargs):
+        calls.append(img)
+        return apply_lut(img, lut, **kwargs)
+
+    eager = Image(img_arr=arr)
+    lazy = Image(img_arr=arr, lazy=True)
+    for img in (eager, lazy):
+        img.thresholding(T=120, A=200)
+        img.digital_negative()
+        if img is lazy:
+            monkeypatch.setattr(elw, '_apply_lut', counting_apply_lut)
+        img.equalize()
+
+    assert np.array_equal(lazy.transform, eager.transform)
+    assert calls == [arr]
+
+
+@pytest.mark.parametrize('channels', [False, True])
+def test_image_auto_contrast_expansion(channels, color_u8):
+    eager = Image(img_arr=color_u8)
+    eager.contrast_expansion(percentiles=(2, 98), channels=channels)
+    expected = auto_contrast(color_u8, percentiles=(2, 98), channels=channels)
+    assert np.array_equal(eager.transform, expected)
+
+    lazy = Image(img_arr=color_u8, lazy=True)
+    lazy.digital_negative()
+    lazy.contrast_expansion(channels=channels)
+    expected = auto_contrast(255 - color_u8, channels=channels)
+    assert np.array_equal(lazy.transform, expected)
+
+
+@pytest.mark.parametrize(
+    ('fixture', 'kwargs', 'msg'),
+    [
+        ('color_u8', {'luma': True}, 'channels and luma'),
+        ('gray_u8', {}, 'Per-channel histograms require'),
+    ],
+)
+def test_image_auto_contrast_channels_errors(fixture, kwargs, msg, request):
+    img = request.getfixturevalue(fixture)
+    with pytest.raises(ValueError, match=msg):
+        auto_contrast(img, channels=True, **kwargs)
+    with pytest.raises(ValueError, match=msg):
+        Image(img_arr=img).contrast_expansion(channels=True, **kwargs)
+
+
+def test_image_contrast_expansion_needs_both_limits(gray_u8):
+    with pytest.raises(ValueError, match='Provide both'):
+        Image(img_arr=gray_u8).contrast_expansion(low_limit=10)
+
+
+def test_image_histogram_data_is_cached(color_u8, monkeypatch):
+    calls = []
+    calculate = pictokit.calculate_histogram
+
+    def counting_histogram(img, **kwargs):
+        calls.append(img)
+        return calculate(img, **kwargs)
+
+    monkeypatch.setattr(pictokit, 'calculate_histogram', counting_histogram)
+    img = Image(img_arr=color_u8)
+
+    per_channel = img.histogram_data(channels=True)
+    total = img.histogram_data()
+    assert np.array_equal(per_channel, calculate(color_u8, channels=True))
+    assert np.array_equal(total, calculate(color_u8))
+    assert not total.flags.writeable
+    assert not per_channel.flags.writeable
+    assert len(calls) == 1
+
+    img.digital_negative()
+    assert np.array_equal(img.histogram_data('t'), calculate(255 - color_u8))
+    img.histogram_data('t', channels=True)
+    assert len(calls) == 2  # noqa: PLR2004
+
+    # Every operation that replaces the transform invalidates its histogram
+    img.thresholding(T=100, A=255, inplace=True)
+    expected = calculate(img.transform)
+    assert np.array_equal(img.histogram_data('t'), expected)
+    img.equalize(reset=True)
+    img.histogram_data('o')
+    assert len(calls) == 3  # noqa: PLR2004
+
+
+def test_image_histogram_data_channels_on_gray_raises(gray_u8):
+    with pytest.raises(ValueError, match='Per-channel histograms require'):
+        Image(img_arr=gray_u8).histogram_data(channels=True)
+
+
+def test_image_adaptive_equalize(color_u8):
+    img = Image(img_arr=color_u8, lazy=True)
+    img.digital_negative()
+    img.adaptive_equalize(tiles=(2, 3))
+    expected = equalize_adaptive(255 - color_u8, tiles=(2, 3))
+    assert np.array_equal(img.transform, expected)
+
+    img.adaptive_equalize(tiles=(2, 3), reset=True)
+    assert np.array_equal(img.transform, equalize_adaptive(color_u8, tiles=(2, 3)))
+
+
+@pytest.mark.parametrize('lazy', [False, True])
+def test_image_undo_redo_point_ops(lazy, color_u8):
+    img = Image(img_arr=color_u8, lazy=lazy)
+    assert not img.undo()
+
+    results = []
+    img.contrast_expansion(low_limit=30, high_limit=200)
+    results.append(img.transform.copy())
+    img.digital_negative()
+    results.append(img.transform.copy())
+    img.equalize()
+    results.append(img.transform.copy())
+    img.thresholding(T=100, A=255, reset=True)
+    results.append(img.transform.copy())
+
+    for expected in reversed(results[:-1]):
+        assert img.undo()
+        assert np.array_equal(img.transform, expected)
+    assert img.undo()
+    assert img.transform.size == 0
+    assert not img.undo()
+
+    for expected in results:
+        assert img.redo()
+        assert np.array_equal(img.transform, expected)
+    assert not img.redo()
+
+    img.undo()
+    img.digital_negative()
+    assert np.array_equal(img.transform, 255 - results[2])
+    assert not img.redo()
+
+
+def test_image_undo_restores_with_one_lut_pass(gray_u8, monkeypatch):
+    img = Image(img_arr=gray_u8)
+    for low in range(10, 60, 10):
+        img.contrast_expansion(low_limit=low, high_limit=200)
+    expected = img.transform.copy()
+    img.digital_negative()
+
+    calls = []
+    apply_lut = elw._apply_lut
+
+    def counting_apply_lut(img, lut, **kwargs):
+        calls.append(img)
+        return apply_lut(img, lut, **kwargs)
+
+    monkeypatch.setattr(elw, '_apply_lut', counting_apply_lut)
+    img.undo()
+    assert np.array_equal(img.transform, expected)
+    assert calls == [gray_u8]
+
+
+@pytest.mark.parametrize('history_bytes', [0, 1 << 20])
+def test_image_undo_adaptive_snapshot(history_bytes, gray_u8):
+    img = Image(img_arr=gray_u8, history_bytes=history_bytes)
+    img.digital_negative()
+    img.adaptive_equalize(tiles=(2, 2))
+    adaptive = img.transform.copy()
+    assert not img.transform.flags.writeable
+    img.thresholding(T=100, A=255, inplace=True)
+    thresholded = img.transform.copy()
+
+    assert img.history.nbytes == (adaptive.nbytes if history_bytes else 0)
+    assert img.undo()
+    assert np.array_equal(img.transform, adaptive)
+    assert img.undo()
+    assert np.array_equal(img.transform, 255 - gray_u8)
+    assert img.redo()
+    assert img.redo()
+    assert np.array_equal(img.transform, thresholded)
+
+
+def test_image_transform_assignment_starts_new_history(gray_u8):
+    img = Image(img_arr=gray_u8)
+    img.digital_negative()
+    img.transform = np.zeros_like(gray_u8)
+    assert not img.undo()
+
+    img.digital_negative()
+    assert np.all(img.transform == 255)  # noqa: PLR2004
+    assert img.undo()
+    assert np.all(img.transform == 0)
+
+
+@pytest.mark.parametrize(
+    ('fixture', 'flag'),
+    [
+        ('gray_u8', cv2.IMREAD_REDUCED_GRAYSCALE_2),
+        ('color_u8', cv2.IMREAD_REDUCED_COLOR_2),
+    ],
+)
+def test_image_preview(fixture, flag, request, tmp_path):
+    arr = request.getfixturevalue(fixture)
+    path = str(tmp_path / 'img.png')
+    cv2.imwrite(path, arr)
+
+    img = Image(path=path)
+    assert img.path == path
+    assert np.array_equal(img.preview(scale=2), cv2.imread(path, flag))
+
+    preview = Image(img_arr=arr).preview(scale=2)
+    assert preview.shape[:2] == (-(-arr.shape[0] // 2), -(-arr.shape[1] // 2))
+
+
+def test_image_save(tmp_path, color_u8):
+    img = Image(img_arr=color_u8)
+    with pytest.raises(ValueError, match='no transformed image'):
+        img.save(str(tmp_path / 'out.png'))
+
+    img.digital_negative()
+    img.save(str(tmp_path / 'out.png'), compression=1)
+    img.save(str(tmp_path / 'orig.png'), type='o')
+    assert np.array_equal(cv2.imread(str(tmp_path / 'out.png')), 255 - color_u8)
+    assert np.array_equal(cv2.imread(str(tmp_path / 'orig.png')), color_u8)
+
+
+def test_image_from_data(color_u8):
+    img = Image(data=cv2.imencode('.png', color_u8)[1].tobytes(), lazy=True)
+    assert img.path is None
+    assert np.array_equal(img.img, color_u8)
+
+    raw = Image(data=memoryview(color_u8), shape=color_u8.shape)
+    raw.digital_negative()
+    assert np.shares_memory(raw.img, color_u8)
+    assert np.array_equal(raw.transform, 255 - color_u8)
+
+
+def test_image_out_sharing_original_raises(gray_u8):
+    img = Image(img_arr=gray_u8)
+    with pytest.raises(ValueError, match='must not share memory'):
+        img.digital_negative(out=gray_u8)
+
+
+def test_import_is_headless():
+    code = (
+        'import sys, numpy as np; from pictokit import Image; '
+        'img = Image(img_arr=np.zeros((4, 4), dtype=np.uint8)); '
+        'img.digital_negative(); img.thresholding(T=1, A=2); '
+        "print('matplotlib' in sys.modules)"
+    )
+    run = subprocess.run(
+        [sys.executable, '-c', code], capture_output=True, text=True, check=True
+    )
+    assert run.stdout.strip() == 'False'
+
+
+def test_image_repr_does_not_plot(gray_u8, monkeypatch):
+    monkeypatch.setattr('matplotlib.pyplot.show', pytest.fail)
+    assert repr(Image(img_arr=gray_u8)) == '<Image: shape=(10, 12), dtype=uint8>'
+
+
+@pytest.mark.parametrize(
+    ('method', 'kwargs'),
+    [('show', {}), ('show', {'type': 't'}), ('compare_images', {})],
+)
+def test_image_plots(method, kwargs, gray_u8, monkeypatch):
+    shown = []
+    monkeypatch.setattr('matplotlib.pyplot.show', lambda: shown.append(True))
+    img = Image(img_arr=gray_u8)
+    img.digital_negative()
+    getattr(img, method)(**kwargs)
+    assert shown == [True]
+
+
+@pytest.mark.parametrize('validation', ['full', 'boundary', 'off'])
+def test_image_validation_levels(validation, color_u8):
+    img = Image(img_arr=color_u8)
+    img.contrast_expansion(low_limit=20, high_limit=230, validation=validation)
+    img.thresholding(T=128, A=7, validation=validation)
+    img.digital_negative(validation=validation)
+
+    expected = per_pixel(
+        color_u8, elw.pixel_expansion, {'low_limit': 20, 'high_limit': 230}
+    )
+    expected = per_pixel(expected, elw.pixel_thresholding, {'T': 128, 'A': 7})
+    assert np.array_equal(img.transform, 255 - expected)
+
+
+def test_image_validation_boundary_raises(gray_u8):
+    img = Image(img_arr=gray_u8)
+    with pytest.raises(ValueError, match='must be in the range'):
+        img.thresholding(T=256, A=0, validation='boundary')
+
+
+def test_image_layout_and_required_layout():
+    arr = np.zeros((10, 20, 3), dtype=np.uint8)
+    crop = arr[2:6, 4:12]
+    img = pictokit.Image(img_arr=crop, layout='rows')
+    assert img.layout.rows
+    assert not img.layout.contiguous
+    np.testing.assert_array_equal(img.img1d, crop.reshape(-1))
+    with pytest.raises(ValueError, match='layout'):
+        pictokit.Image(img_arr=crop, layout='contiguous')
+
+
+@pytest.mark.parametrize(
+    ('method', 'kwargs', 'func', 'per_channel'),
+    [
+        (
+            'contrast_expansion',
+            {'low_limit': [40, 60, 80], 'high_limit': 200},
+            elw.pixel_expansion,
+            [{'low_limit': low, 'high_limit': 200} for low in (40, 60, 80)],
+        ),
+        (
+            'thresholding',
+            {'T': (50, 100, 150), 'A': 255},
+            elw.pixel_thresholding,
+            [{'T': t, 'A': 255} for t in (50, 100, 150)],
+        ),
+    ],
+)
+def test_per_channel_parameters(color_u8, method, kwargs, func, per_channel):
+    img = Image(img_arr=color_u8)
+    getattr(img, method)(**kwargs)
+    for c, args in enumerate(per_channel):
+        channel = np.ascontiguousarray(color_u8[..., c])
+        expected = elw.apply_lut(channel, elw.point_lut(func, args))
+        np.testing.assert_array_equal(img.transform[..., c], expected)
+
+
+def test_per_channel_parameters_lazy_compose(color_u8):
+    img = Image(img_arr=color_u8, lazy=True)
+    img.thresholding(T=(50, 100, 150), A=255)
+    img.digital_negative()
+    eager = Image(img_arr=color_u8)
+    eager.thresholding(T=(50, 100, 150), A=255)
+    np.testing.assert_array_equal(img.transform, 255 - eager.transform)
+
+
+@pytest.mark.parametrize('method', ['equalize', 'contrast_expansion'])
+def test_luma_matches_functional(color_u8, method):
+    img = Image(img_arr=color_u8)
+    getattr(img, method)(luma=True)
+    func = equalize_histogram if method == 'equalize' else auto_contrast
+    np.testing.assert_array_equal(img.transform, func(color_u8, luma=True))
+
+    assert img.undo()
+    assert img.transform.size == 0
+    assert img.redo()
+    np.testing.assert_array_equal(img.transform, func(color_u8, luma=True))
+
+
+def test_luma_point_operation_after_lazy_chain(color_u8):
+    img = Image(img_arr=color_u8, lazy=True)
+    img.contrast_expansion(30, 220)
+    img.digital_negative(luma='lab')
+    lut = elw.point_lut(elw.pixel_expansion, {'low_limit': 30, 'high_limit': 220})
+    expected = elw.apply_luma_lut(
+        elw.apply_lut(color_u8, lut),
+        255 - np.arange(256, dtype=np.uint8),
+        'lab',
+    )
+    np.testing.assert_array_equal(img.transform, expected)
+
+
+@pytest.mark.parametrize(
+    ('kwargs', 'msg'),
+    [
+        ({'T': (1, 2, 3), 'A': 255, 'luma': True}, 'Per-channel'),
+        ({'T': 100, 'A': 255, 'luma': True, 'inplace': True}, 'inplace'),
+        ({'T': (1, 2), 'A': 255}, 'one value per channel'),
+    ],
+)
+def test_color_parameter_errors(color_u8, kwargs, msg):
+    img = Image(img_arr=color_u8)
+    with pytest.raises(ValueError, match=msg):
+        img.thresholding(**kwargs)
+    assert not img.history.can_undo
+
+
+def test_per_channel_parameters_gray_error(gray_u8):
+    with pytest.raises(ValueError, match='one value per channel'):
+        Image(img_arr=gray_u8).thresholding(T=(1, 2, 3), A=255)
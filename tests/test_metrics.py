@@ -0,0 +1,100 @@
+import cv2
+import pytest
+
+from pictokit import Image, metrics
+from pictokit.cache import ImageCache
+from pictokit.common import validate_imgarray
+from pictokit.controls import calculate_histogram, load_image
+
+
+@pytest.fixture
+def recording():
+    metrics.reset()
+    metrics.enable()
+    yield
+    metrics.disable()
+    metrics.reset()
+
+
+def test_disabled_records_nothing(color_u8):
+    metrics.reset()
+    assert not metrics.is_enabled()
+    calculate_histogram(color_u8)
+    assert metrics.snapshot() == {}
+
+
+def test_function_metrics(recording, color_u8):
+    validate_imgarray(color_u8)
+    calculate_histogram(color_u8)
+    stats = metrics.snapshot()
+
+    assert stats['validate_imgarray'].calls == 1
+    assert stats['validate_imgarray'].pixels == 8 * 9  # noqa: PLR2004
+    assert stats['validate_imgarray'].bytes_allocated == 0
+    assert stats['calculate_histogram'].bytes_allocated == 256 * 8  # noqa: PLR2004
+    assert stats['calculate_histogram'].seconds > 0
+
+
+def test_load_image_cache_hits(recording, tmp_path, color_u8):
+    path = str(tmp_path / 'img.png')
+    cv2.imwrite(path, color_u8)
+    cache = ImageCache()
+    load_image(path=path, cache=cache)
+    load_image(path=path, cache=cache)
+
+    stats = metrics.snapshot()['load_image']
+    assert (stats.calls, stats.cache_hits, stats.cache_misses) == (2, 1, 1)
+    assert stats.pixels == 2 * 8 * 9  # noqa: PLR2004
+
+
+def test_image_metrics(recording, color_u8):
+    img = Image(img_arr=color_u8)
+    img.contrast_expansion()
+    img.digital_negative(inplace=True)
+    img.undo()
+
+    stats = metrics.snapshot()
+    # Automatic limits read the original histogram: computed once, then cached
+    assert stats['Image.contrast_expansion'].cache_misses == 1
+    assert stats['Image.contrast_expansion'].bytes_allocated == color_u8.nbytes
+    assert stats['Image.digital_negative'].bytes_allocated == 0
+    assert stats['Image.undo'].calls == 1
+    assert stats['calculate_histogram'].calls == 1
+
+
+def test_lazy_compute_is_recorded_once(recording, color_u8):
+    img = Image(img_arr=color_u8, lazy=True)
+    img.thresholding(100, 255)
+    img.digital_negative()
+    for _ in range(3):
+        _ = img.transform
+
+    stats = metrics.snapshot()
+    assert stats['Image.thresholding'].bytes_allocated == 0
+    assert stats['Image.compute'].calls == 1
+    assert stats['Image.compute'].bytes_allocated == color_u8.nbytes
+
+
+def test_callbacks(recording, gray_u8):
+    records = []
+    metrics.add_callback(records.append)
+    try:
+        validate_imgarray(gray_u8)
+    finally:
+        metrics.remove_callback(records.append)
+    validate_imgarray(gray_u8)
+
+    assert [r.name for r in records] == ['validate_imgarray']
+    assert records[0].pixels == gray_u8.size
+
+
+def test_failed_call_is_not_recorded(recording, gray_f32):
+    with pytest.raises(TypeError):
+        validate_imgarray(gray_f32)
+    assert metrics.snapshot() == {}
+    metrics.note_cache(hit=True)  # no operation running: ignored
+
+
+def test_remove_unknown_callback():
+    with pytest.raises(ValueError):  # noqa: PT011
+        metrics.remove_callback(print)
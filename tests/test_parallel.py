@@ -0,0 +1,103 @@
+import threading
+
+import numpy as np
+import pytest
+
+import pictokit.element_wise as elw
+from pictokit import Image, parallel
+from pictokit.controls import calculate_histogram
+from pictokit.parallel import band_count, get_threads, run_bands, set_threads
+
+
+@pytest.fixture
+def split_everything(monkeypatch):
+    """Split every image, whatever its size, into bands."""
+    monkeypatch.setattr(parallel, '_threads', 1)
+    monkeypatch.setattr(parallel, '_min_pixels', 1)
+
+
+@pytest.fixture
+def big_color():
+    return np.random.default_rng(3).integers(0, 256, size=(37, 41, 3), dtype=np.uint8)
+
+
+def test_set_threads(monkeypatch):
+    monkeypatch.setattr(parallel, '_threads', 1)
+    monkeypatch.setattr(parallel, '_min_pixels', parallel.DEFAULT_PARALLEL_PIXELS)
+    set_threads(4, min_pixels=100)
+    assert get_threads() == (4, 100)
+    assert band_count(rows=50, pixels=100) == 4  # noqa: PLR2004
+    assert band_count(rows=50, pixels=99) == 1
+    assert band_count(rows=50, pixels=100, threads=1) == 1
+    assert band_count(rows=2, pixels=100) == 2  # noqa: PLR2004
+
+
+@pytest.mark.parametrize(('threads', 'min_pixels'), [(0, 1), (2, 0)])
+def test_set_threads_errors(threads, min_pixels):
+    with pytest.raises(ValueError, match='must be greater than 0'):
+        set_threads(threads, min_pixels)
+
+
+def test_run_bands_covers_rows_in_order():
+    names = set()
+
+    def work(rows):
+        names.add(threading.current_thread().name)
+        return rows
+
+    bands = run_bands(work, rows=10, bands=3)
+    assert [(b.start, b.stop) for b in bands] == [(0, 3), (3, 6), (6, 10)]
+    assert len(names) > 1
+
+
+def test_run_bands_raises_band_error():
+    def work(rows):
+        if rows.start:
+            raise RuntimeError('band failed')
+        return rows
+
+    with pytest.raises(RuntimeError, match='band failed'):
+        run_bands(work, rows=10, bands=3)
+
+
+@pytest.mark.parametrize('threads', [2, 3, 8])
+@pytest.mark.parametrize('per_channel', [False, True])
+def test_apply_lut_threads_match(split_everything, big_color, threads, per_channel):
+    lut = 255 - np.arange(256, dtype=np.uint8)
+    if per_channel:
+        lut = np.stack([lut, np.arange(256, dtype=np.uint8), lut // 2], axis=1)
+    expected = elw.apply_lut(big_color, lut, threads=1)
+
+    np.testing.assert_array_equal(
+        elw.apply_lut(big_color, lut, threads=threads), expected
+    )
+    out = np.zeros_like(big_color)
+    assert elw.apply_lut(big_color, lut, out=out, threads=threads) is out
+    np.testing.assert_array_equal(out, expected)
+
+
+@pytest.mark.parametrize('channels', [False, True])
+def test_calculate_histogram_threads_match(split_everything, big_color, channels):
+    mask = np.random.default_rng(5).random(big_color.shape[:2]) > 0.5  # noqa: PLR2004
+    for kwargs in ({}, {'mask': mask}):
+        expected = calculate_histogram(
+            big_color, channels=channels, threads=1, **kwargs
+        )
+        result = calculate_histogram(big_color, channels=channels, threads=4, **kwargs)
+        np.testing.assert_array_equal(result, expected)
+
+
+def test_calculate_histogram_threads_accumulate(split_everything, big_color):
+    out = calculate_histogram(big_color)
+    calculate_histogram(big_color, out=out, accumulate=True, threads=3)
+    np.testing.assert_array_equal(out, 2 * calculate_histogram(big_color))
+
+
+def test_image_threads(split_everything, big_color):
+    img = Image(img_arr=big_color, threads=4)
+    single = Image(img_arr=big_color, threads=1)
+    for image in (img, single):
+        image.contrast_expansion(40, 200)
+        image.equalize()
+    np.testing.assert_array_equal(img.transform, single.transform)
+    np.testing.assert_array_equal(img.histogram_data('t'), single.histogram_data('t'))
@@ -0,0 +1,105 @@
+import os
+import threading
+
+import cv2
+import numpy as np
+import pytest
+
+from pictokit.runner import process_images
+
+
+def negative(img):
+    return 255 - img
+
+
+@pytest.fixture
+def image_dir(tmp_path):
+    rng = np.random.default_rng(0)
+    images = {}
+    for i in range(6):
+        path = str(tmp_path / f'img_{i}.png')
+        img = rng.integers(0, 256, size=(8, 10), dtype=np.uint8)
+        cv2.imwrite(path, img)
+        images[path] = img
+    return tmp_path, images
+
+
+def test_process_images_ordered(image_dir):
+    _, images = image_dir
+    paths = list(images)
+    results = list(process_images(paths, [negative], mode='gray', workers=3))
+
+    assert [path for path, _ in results] == paths
+    for path, out in results:
+        assert np.array_equal(out, 255 - images[path])
+
+
+def test_process_images_unordered_glob_and_output(image_dir, tmp_path):
+    src_dir, images = image_dir
+    out_dir = str(tmp_path / 'out')
+    results = dict(
+        process_images(
+            str(src_dir / '*.png'),
+            [negative, negative],
+            output_dir=out_dir,
+            mode='gray',
+            ordered=False,
+            keep_results=False,
+        )
+    )
+
+    assert set(results) == set(images)
+    assert all(out is None for out in results.values())
+    for path, img in images.items():
+        written = cv2.imread(os.path.join(out_dir, os.path.basename(path)), 0)
+        assert np.array_equal(written, img)
+
+
+def test_process_images_keeps_glob_layout(tmp_path, gray_u8):
+    for name in ('a', 'b'):
+        (tmp_path / 'in' / name).mkdir(parents=True)
+        cv2.imwrite(str(tmp_path / 'in' / name / 'x.png'), gray_u8 + ord(name))
+    out_dir = tmp_path / 'out'
+    pattern = str(tmp_path / 'in' / '**' / '*.png')
+    list(process_images(pattern, output_dir=str(out_dir), mode='gray'))
+
+    for name in ('a', 'b'):
+        written = cv2.imread(str(out_dir / name / 'x.png'), 0)
+        assert np.array_equal(written, gray_u8 + ord(name))
+
+    paths = [str(tmp_path / 'in' / name / 'x.png') for name in ('a', 'b')]
+    with pytest.raises(ValueError, match='would both be written to x.png'):
+        next(process_images(paths, output_dir=str(out_dir)))
+
+
+def test_process_images_bounded_in_flight(image_dir):
+    _, images = image_dir
+    started = []
+    lock = threading.Lock()
+
+    def record(img):
+        with lock:
+            started.append(img)
+        return img
+
+    results = process_images(list(images), [record], workers=2, max_in_flight=2)
+    next(results)
+    # two pending images plus the one just handed to the consumer
+    assert len(started) <= 3  # noqa: PLR2004
+    results.close()
+
+
+def test_process_images_process_pool(image_dir):
+    _, images = image_dir
+    results = dict(
+        process_images(list(images), [negative], mode='gray', executor='process')
+    )
+    for path, img in images.items():
+        assert np.array_equal(results[path], 255 - img)
+
+
+def test_process_images_errors(tmp_path):
+    with pytest.raises(ValueError, match='must be greater than 0'):
+        next(process_images([], workers=0))
+    with pytest.raises(FileNotFoundError):
+        next(process_images([str(tmp_path / 'missing.png')]))
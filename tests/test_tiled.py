@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+import pictokit.element_wise as elw
+from pictokit.controls import calculate_histogram
+from pictokit.tiled import (
+    create_memmap,
+    histogram_tiled,
+    iter_tiles,
+    open_memmap,
+    transform_tiled,
+)
+
+
+@pytest.fixture(params=['npy', 'raw'])
+def stored_image(request, tmp_path, color_u8):
+    if request.param == 'npy':
+        path = str(tmp_path / 'img.npy')
+        np.save(path, color_u8)
+    else:
+        path = str(tmp_path / 'img.raw')
+        color_u8.tofile(path)
+    return path, color_u8
+
+
+def test_open_memmap(stored_image):
+    path, img = stored_image
+    mapped = open_memmap(path, shape=img.shape)
+    assert isinstance(mapped, np.memmap)
+    assert np.array_equal(mapped, img)
+
+
+def test_open_memmap_raw_requires_shape(tmp_path):
+    with pytest.raises(ValueError, match='shape is required'):
+        open_memmap(str(tmp_path / 'img.raw'))
+
+
+@pytest.mark.parametrize(
+    ('tile_bytes', 'expected'),
+    [(1, 8), (27, 8), (54, 4), (100, 3), (10**9, 1)],
+)
+def test_iter_tiles(tile_bytes, expected, color_u8):
+    tiles = list(iter_tiles(color_u8, tile_bytes))
+    assert len(tiles) == expected
+    assert np.array_equal(np.concatenate([color_u8[t] for t in tiles]), color_u8)
+
+
+@pytest.mark.parametrize('suffix', ['npy', 'raw'])
+def test_transform_tiled(stored_image, tmp_path, suffix):
+    path, img = stored_image
+    src = open_memmap(path, shape=img.shape)
+    dst = create_memmap(str(tmp_path / f'out.{suffix}'), img.shape)
+
+    args = {'low_limit': 30, 'high_limit': 200}
+    out = transform_tiled(src, dst, elw.pixel_expansion, args, tile_bytes=60)
+
+    expected = elw.apply_lut(img, elw.build_lut(elw.pixel_expansion, args))
+    assert out is dst
+    assert np.array_equal(open_memmap(dst.filename, shape=img.shape), expected)
+
+
+def test_transform_tiled_shape_mismatch(color_u8):
+    with pytest.raises(ValueError, match='same shape'):
+        transform_tiled(color_u8, color_u8[1:], elw.pixel_digital_negative, {})
+
+
+@pytest.mark.parametrize('channels', [False, True])
+def test_histogram_tiled(stored_image, channels):
+    path, img = stored_image
+    mapped = open_memmap(path, shape=img.shape)
+    hist = histogram_tiled(mapped, channels=channels, tile_bytes=30)
+    assert np.array_equal(hist, calculate_histogram(img, channels=channels))
@@ -0,0 +1,65 @@
+import threading
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+import pictokit.writer
+from pictokit.writer import ImageWriter
+
+
+def test_image_writer_writes_copies(tmp_path, gray_u8):
+    buffer = gray_u8.copy()
+    with ImageWriter(workers=2, compression=1) as writer:
+        futures = []
+        for i in range(5):
+            buffer[...] = gray_u8 + i
+            futures.append(writer.submit(str(tmp_path / f'{i}.png'), buffer))
+        writer.flush()
+        assert all(f.done() for f in futures)
+
+    for i in range(5):
+        written = cv2.imread(str(tmp_path / f'{i}.png'), cv2.IMREAD_UNCHANGED)
+        assert np.array_equal(written, gray_u8 + i)
+
+
+def test_image_writer_bounds_pending(tmp_path, gray_u8, monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(pictokit.writer, 'save_image', lambda *args: release.wait())
+
+    writer = ImageWriter(workers=1, max_pending=2)
+    writer.submit(str(tmp_path / '0.png'), gray_u8)
+    writer.submit(str(tmp_path / '1.png'), gray_u8)
+
+    blocked = threading.Thread(
+        target=writer.submit, args=(str(tmp_path / '2.png'), gray_u8)
+    )
+    blocked.start()
+    time.sleep(0.05)
+    assert blocked.is_alive()
+
+    release.set()
+    blocked.join(timeout=5)
+    assert not blocked.is_alive()
+    writer.close()
+
+
+def test_image_writer_reports_errors(tmp_path, gray_u8):
+    writer = ImageWriter()
+    writer.submit(str(tmp_path / 'missing' / 'img.png'), gray_u8)
+    writer.submit(str(tmp_path / 'ok.png'), gray_u8)
+    with pytest.raises(OSError, match='Could not write'):
+        writer.flush()
+    writer.flush()  # errors are reported once
+    writer.close()
+    writer.close()
+
+    assert (tmp_path / 'ok.png').exists()
+    with pytest.raises(RuntimeError, match='closed'):
+        writer.submit(str(tmp_path / 'late.png'), gray_u8)
+
+
+def test_image_writer_value_error():
+    with pytest.raises(ValueError, match='must be greater than 0'):
+        ImageWriter(max_pending=0)
@@ -1,7 +1,7 @@
 from pictokit import Image
 
 img = Image(path='./img_test/digital_negative.png')
-print(img)
+img.show()
 # Apply contrast expansion with low and high limits and show histogram
 img.histogram()
 img.digital_negative(hist=True)